@@ -0,0 +1,253 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+"""
+Rough timings of the performance-sensitive operations of wwt_data_formats.
+
+Run ``python benchmarks/bench.py --help`` for usage. Each benchmark builds a
+synthetic folder of Places, each with a foreground ImageSet, and prints the
+best of several repetitions. Absolute numbers depend heavily on the machine
+and the Python version; to compare two versions of the library, run this
+script in a checkout of each.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import copy
+import os.path
+import pickle
+import shutil
+import tempfile
+import time
+
+from wwt_data_formats import folder, imageset, place
+from wwt_data_formats.enums import DataSetType, ProjectionType
+
+
+def make_place(i):
+    imgset = imageset.ImageSet(
+        name=f"Image {i}",
+        url=f"https://example.com/data/{i}/{{1}}/{{3}}/{{3}}_{{2}}.png",
+        thumbnail_url="https://example.com/thumbnails/shared.jpg",
+        credits="Image courtesy of an example observatory",
+        credits_url="https://example.com/credits",
+        data_set_type=DataSetType.SKY,
+        projection=ProjectionType.TAN,
+        file_type=".png",
+        center_x=(i * 0.07) % 360,
+        center_y=((i * 0.013) % 180) - 90,
+        base_degrees_per_tile=0.3,
+        width_factor=2,
+        tile_levels=4,
+    )
+
+    pl = place.Place(
+        name=f"Place {i}",
+        data_set_type=DataSetType.SKY,
+        ra_hr=imgset.center_x / 15,
+        dec_deg=imgset.center_y,
+        zoom_level=1.2,
+        thumbnail=imgset.thumbnail_url,
+    )
+    pl.foreground_image_set = imgset
+    return pl
+
+
+def make_folder(n_items):
+    f = folder.Folder(name="Benchmark")
+    f.children = [make_place(i) for i in range(n_items)]
+    return f
+
+
+def best_time(func, repeat):
+    """Return the best wall-clock time of *func()* over *repeat* runs, and its
+    last result."""
+    best = None
+
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - t0
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best, result
+
+
+def per_item(seconds, n_items):
+    return f"{seconds / n_items * 1e6:.0f} us/item"
+
+
+def bench_xml(settings):
+    """Parsing and serializing XML."""
+
+    n = settings.items
+    text = make_folder(n).to_xml_string()
+
+    t, _ = best_time(lambda: folder.Folder.from_text(text), settings.repeat)
+    print(f"parse:               {per_item(t, n)}")
+
+    t, f = best_time(
+        lambda: folder.Folder.from_text(text, trusted=True), settings.repeat
+    )
+    print(f"parse, trusted:      {per_item(t, n)}")
+
+    t, _ = best_time(f.to_xml_string, settings.repeat)
+    print(f"serialize:           {per_item(t, n)}")
+
+
+def bench_clone(settings):
+    """Deep copies of a tree and of a single item."""
+
+    f = make_folder(settings.items)
+    pl = make_place(0)
+
+    def round_trip(obj):
+        return lambda: type(obj).from_text(obj.to_xml_string())
+
+    def seconds(t):
+        return f"{t:.2f} s"
+
+    def microseconds(t):
+        return f"{t * 1e6:.0f} us"
+
+    for label, obj, fmt in (
+        (f"{settings.items}-item folder", f, seconds),
+        ("single Place", pl, microseconds),
+    ):
+        print(f"{label}:")
+
+        for method, func in (
+            ("clone", obj.clone),
+            ("copy.deepcopy", lambda: copy.deepcopy(obj)),
+            ("XML round trip", round_trip(obj)),
+        ):
+            t, _ = best_time(func, settings.repeat)
+            print(f"  {method + ':':16s} {fmt(t)}")
+
+
+def bench_snapshot(settings, workdir):
+    """Loading snapshots compared to parsing XML."""
+
+    for n in (settings.items, 4 * settings.items):
+        f = make_folder(n)
+        xml_path = os.path.join(workdir, f"tree{n}.wtml")
+        snap_path = os.path.join(workdir, f"tree{n}.bin")
+
+        with open(xml_path, "wt", encoding="utf-8") as stream:
+            f.write_xml(stream)
+
+        f.save_snapshot(snap_path)
+
+        t_xml, _ = best_time(lambda: folder.Folder.from_file(xml_path), settings.repeat)
+        t_snap, _ = best_time(
+            lambda: folder.Folder.load_snapshot(snap_path), settings.repeat
+        )
+        mb_xml = os.path.getsize(xml_path) / 1e6
+        mb_snap = os.path.getsize(snap_path) / 1e6
+
+        print(
+            f"{n}-item tree: from_file {t_xml:.2f} s, load_snapshot {t_snap:.2f} s "
+            f"({t_xml / t_snap:.1f}x); {mb_xml:.1f} MB -> {mb_snap:.1f} MB"
+        )
+
+
+def bench_bulk(settings, workdir):
+    """Pickling and multi-process parsing."""
+
+    from wwt_data_formats.bulk import parse_files
+
+    f = make_folder(200)
+    data = pickle.dumps(f)
+
+    t_dumps, _ = best_time(lambda: pickle.dumps(f), settings.repeat)
+    t_loads, _ = best_time(lambda: pickle.loads(data), settings.repeat)
+    text = f.to_xml_string()
+    t_parse, _ = best_time(lambda: folder.Folder.from_text(text), settings.repeat)
+    print(
+        f"200-child folder: pickle {len(data) / 1000:.0f} kB, "
+        f"dumps {t_dumps * 1e3:.1f} ms, loads {t_loads * 1e3:.1f} ms, "
+        f"parse {t_parse * 1e3:.1f} ms"
+    )
+
+    paths = []
+
+    for i in range(settings.files):
+        path = os.path.join(workdir, f"bulk{i}.wtml")
+
+        with open(path, "wt", encoding="utf-8") as stream:
+            stream.write(text)
+
+        paths.append(path)
+
+    print(f"parse_files over {len(paths)} files ({os.cpu_count()} CPUs):")
+
+    for workers in (1, 2, 4):
+        t, _ = best_time(lambda: sum(1 for _ in parse_files(paths, workers=workers)), 1)
+        print(f"  workers={workers}: {t:.1f} s")
+
+
+BENCHMARKS = {
+    "xml": (bench_xml, False),
+    "clone": (bench_clone, False),
+    "snapshot": (bench_snapshot, True),
+    "bulk": (bench_bulk, True),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--items",
+        type=int,
+        default=5000,
+        help="The number of items in the synthetic folders (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="The number of times to repeat each timing (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=200,
+        help="The number of files for the bulk benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="BENCHMARK",
+        help=f"The benchmarks to run: {', '.join(BENCHMARKS)} (default: all)",
+    )
+    settings = parser.parse_args()
+
+    names = settings.names or list(BENCHMARKS)
+
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error(f"unrecognized benchmark {name!r}")
+
+    workdir = tempfile.mkdtemp(prefix="wwtbench")
+
+    try:
+        for name in names:
+            func, needs_workdir = BENCHMARKS[name]
+            print(f"# {name}: {func.__doc__.strip()}")
+
+            if needs_workdir:
+                func(settings, workdir)
+            else:
+                func(settings)
+
+            print()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
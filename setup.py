@@ -70,6 +70,12 @@ setup_args = dict(
         "traitlets",
     ],
     extras_require={
+        "async": [
+            "aiohttp",
+        ],
+        "lxml": [
+            "lxml>=4.5",
+        ],
         "test": [
             "beautifulsoup4",
             "mock",
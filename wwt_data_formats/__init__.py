@@ -5,10 +5,14 @@
 from __future__ import absolute_import, division, print_function
 
 __all__ = """
+get_xml_backend
 indent_xml
 LockedDownTraits
 LockedXmlTraits
 MetaLockedDownTraits
+open_async_session
+open_session
+set_xml_backend
 stringify_xml_doc
 write_xml_doc
 XmlSer
@@ -16,7 +20,15 @@ XmlSer
 
 from abc import ABCMeta
 from argparse import Namespace
+from collections.abc import MutableSequence
+import codecs
+from contextlib import contextmanager
+from copy import deepcopy
 from enum import Enum
+import hashlib
+import re
+import struct
+import threading
 from traitlets import (
     Bool,
     Float,
@@ -32,80 +44,268 @@ from traitlets import (
 )
 from xml.etree import ElementTree as etree
 
+from . import instrument as _instrument
 
-class MetaLockedDownTraits(ABCMeta, MetaHasTraits):
-    """A metaclass to help with the LockedDownTraits class. When a class using
-    this metaclass is created, a frozenset of all of the traitlets attached to
-    the class definition (including those defined by its base classes) is
-    created for fast checks during __setattr__ calls. The other setup done by
-    traitlet's MetaHasTraits metaclass is also performed.
+
+# XML library backends. Parsing and the construction of new XML trees can be
+# done with either the standard library's ElementTree or, if it is available,
+# lxml. Code that operates on existing trees relies only on the API common to
+# the two.
+
+_lxml_etree = None
+_lxml_parser = None
+
+
+def get_xml_backend():
+    """Get the name of the XML library used to parse and build XML trees.
+
+    Returns
+    -------
+    ``"lxml"`` or ``"stdlib"``.
 
     """
+    return "stdlib" if _lxml_etree is None else "lxml"
+
+
+def set_xml_backend(name):
+    """Set the XML library used to parse and build XML trees.
+
+    Parameters
+    ----------
+    name : string
+        One of ``"lxml"``, ``"stdlib"``, or ``"auto"``. The ``"auto"`` mode
+        selects lxml if it can be imported, and the standard library's
+        :mod:`xml.etree.ElementTree` otherwise.
+
+    Returns
+    -------
+    The name of the selected backend, as returned by :func:`get_xml_backend`.
+
+    Notes
+    -----
+    The default mode is ``"auto"``. The lxml backend is faster, and the XML
+    documents produced with either backend are identical. With the lxml
+    backend, however, methods like
+    :meth:`~LockedXmlTraits.to_xml` return :class:`lxml.etree._Element`
+    objects rather than :class:`xml.etree.ElementTree.Element` objects.
+    Comments and processing instructions in input documents are discarded by
+    both backends. Before Python 3.9, the standard library writes carriage
+    returns in attribute values as newlines; lxml preserves them.
 
-    def __init__(cls, name, bases, classdict):
-        super(MetaLockedDownTraits, cls).__init__(name, bases, classdict)
+    """
+    global _lxml_etree, _lxml_parser
 
-        # This list hardcode attributes that are manipulated by the traitlets
-        # machinery.
-        settable_attr_names = set(
-            (
-                "_cross_validation_lock",
-                "_trait_notifiers",
-                "_trait_validators",
-                "_trait_values",
-                "notify_change",
+    if name == "stdlib":
+        _lxml_etree = _lxml_parser = None
+    elif name in ("auto", "lxml"):
+        try:
+            from lxml import etree as lxml_etree
+        except ImportError:
+            if name == "lxml":
+                raise
+            _lxml_etree = _lxml_parser = None
+        else:
+            _lxml_etree = lxml_etree
+            _lxml_parser = lxml_etree.XMLParser(
+                encoding="utf-8",
+                huge_tree=True,
+                remove_comments=True,
+                remove_pis=True,
             )
-        )
+    else:
+        raise ValueError(f"unrecognized XML backend {name!r}")
 
-        for c in cls.mro():
-            for attr_name, attr_value in c.__dict__.items():
-                if isinstance(attr_value, TraitType):
-                    settable_attr_names.add(attr_name)
+    return get_xml_backend()
 
-        cls._settable_attr_names = frozenset(settable_attr_names)
 
+# Asynchronous HTTP. This is built on aiohttp, which is an optional
+# dependency that is only imported when needed.
 
-class LockedDownTraits(HasTraits, metaclass=MetaLockedDownTraits):
-    """A base class for HasTraits objects where we do not allow callers to add
-    additional attributes to class instances. We do not allow them to delete
-    attributes either.
+DEFAULT_ASYNC_CONNECTION_LIMIT = 100
+DEFAULT_ASYNC_CONNECTION_LIMIT_PER_HOST = 8
 
-    The general motivation is that there are some kinds of classes that
-    contain a pretty fixed set of fields where it's much more likely that
-    someone is going to make a typo in a variable assignment than it will be
-    legitimately useful for them to add new attributes.
 
-    There's an escape hatch, however, the ``rmeta`` attribute (for "runtime
-    metadata") is a namespace object to which one can attach whichever
-    metadata one wants.
+def open_async_session(
+    limit=DEFAULT_ASYNC_CONNECTION_LIMIT,
+    limit_per_host=DEFAULT_ASYNC_CONNECTION_LIMIT_PER_HOST,
+):
+    """Create an asynchronous HTTP session with a bounded connection pool.
+
+    Parameters
+    ----------
+    limit : optional int, default 100
+        The maximum number of simultaneous connections.
+    limit_per_host : optional int, default 8
+        The maximum number of simultaneous connections to any one host.
+
+    Returns
+    -------
+    An :class:`aiohttp.ClientSession`.
+
+    Notes
+    -----
+    This requires the optional `aiohttp`_ package. The session must be
+    created inside a running event loop, and should be closed when it is no
+    longer needed, most easily by using it as an asynchronous context
+    manager::
+
+        async with open_async_session() as session:
+            folder = await Folder.from_url_async(url, session=session)
+
+    Connections are kept alive and reused across requests, so a session
+    should be shared by all of the requests made by a task. If more requests
+    are in flight than the limits allow, the excess requests wait for a
+    connection to become available.
+
+    .. _aiohttp: https://docs.aiohttp.org/
 
     """
+    import aiohttp
 
-    rmeta = Instance(
-        Namespace,
-        args=(),
-        help="Runtime metadata - a namespace object for attaching arbitrary extra information",
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host)
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def _fetch_text_async(session, url, **kwargs):
+    """Download a document with an aiohttp session, returning it as text."""
+
+    async with session.get(url, **kwargs) as resp:
+        data = await resp.read()
+
+    # As in LockedXmlTraits.from_url(), ignore any Unicode Byte Order Marker.
+    return data.decode("utf-8-sig")
+
+
+# Threaded HTTP, for fetching many documents at once with ``requests``.
+
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 8
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+
+
+def open_session(
+    limit_per_host=DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    retries=DEFAULT_RETRIES,
+    backoff=DEFAULT_RETRY_BACKOFF,
+):
+    """Create an HTTP session suitable for downloading many documents from
+    multiple threads.
+
+    Parameters
+    ----------
+    limit_per_host : optional int, default 8
+        The number of connections to each host to keep open for reuse.
+    retries : optional int, default 3
+        The number of times to retry a request that fails because of a
+        connection error or a response with status 429, 500, 502, 503, or
+        504.
+    backoff : optional float, default 0.5
+        The backoff factor for retries: the delay before the *n*'th retry is
+        about ``backoff * 2**(n - 1)`` seconds.
+
+    Returns
+    -------
+    A :class:`requests.Session`.
+
+    Notes
+    -----
+    Connections are kept alive and reused across requests, so a session
+    should be shared by all of the requests made by a task. Sessions can be
+    used from multiple threads at once. Close the session when it is no
+    longer needed, most easily by using it as a context manager.
+
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
     )
+    adapter = HTTPAdapter(pool_maxsize=limit_per_host, max_retries=retry)
 
-    def __setattr__(self, name, value):
-        if name not in self._settable_attr_names:
-            raise AttributeError(
-                f"not allowed to set attribute {name!r} on this instance (typo?)"
-            )
-        super(LockedDownTraits, self).__setattr__(name, value)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-    def __delattr__(self, name):
-        if name != "notify_change":  # sigh, traitlets
-            raise AttributeError(
-                f"not allowed to delete attribute {name!r} from this instance"
-            )
-        super(LockedDownTraits, self).__delattr__(name)
 
-    def __repr__(self):
-        # This gets a bit beyond the nominal bailiwick of this class, but it's
-        # pretty universally useful.
-        s = ", ".join("{}={!r}".format(a, getattr(self, a)) for a in self.trait_names())
-        return f"{self.__class__.__name__}({s})"
+def _parse_xml_text(text):
+    """Parse XML text into an element with the current backend."""
+
+    if _lxml_etree is None:
+        return etree.fromstring(text)
+
+    # lxml refuses Unicode input with an encoding declaration, so encode it
+    # ourselves; the parser is set up to ignore the declared encoding, just as
+    # ElementTree does with string input.
+    return _lxml_etree.fromstring(text.encode("utf-8"), _lxml_parser)
+
+
+def _parse_xml_bytes(data):
+    """Parse UTF-8 XML data into an element with the current backend.
+
+    A leading Unicode Byte Order Marker is ignored, as is the encoding declared
+    in the document, so that the result is the same as that of decoding the
+    data with the ``utf-8-sig`` codec and calling :func:`_parse_xml_text`.
+    """
+
+    if _lxml_etree is None:
+        parser = etree.XMLParser(encoding="utf-8")
+        parser.feed(data)
+        return parser.close()
+
+    return _lxml_etree.fromstring(data, _lxml_parser)
+
+
+def _is_utf8_codec(encoding):
+    """Whether bytes in the named text encoding can be handed directly to
+    :func:`_parse_xml_bytes` or :func:`_parse_xml_stream`."""
+
+    return codecs.lookup(encoding).name in ("utf-8", "utf-8-sig")
+
+
+def _parse_xml_stream(stream):
+    """Parse UTF-8 XML data from a binary stream into an element with the
+    current backend; see :func:`_parse_xml_bytes`."""
+
+    if _lxml_etree is None:
+        return etree.parse(stream, etree.XMLParser(encoding="utf-8")).getroot()
+
+    return _lxml_etree.parse(stream, _lxml_parser).getroot()
+
+
+def _iterparse_xml(source, events):
+    """Incrementally parse XML from a bytes stream with the current backend."""
+
+    if _lxml_etree is None:
+        return etree.iterparse(source, events=events)
+
+    return _lxml_etree.iterparse(
+        source,
+        events=events,
+        huge_tree=True,
+        remove_comments=True,
+        remove_pis=True,
+    )
+
+
+def _new_xml_element(tag):
+    """Create a new, parentless XML element with the current backend."""
+
+    if _lxml_etree is None:
+        return etree.Element(tag)
+
+    return _lxml_etree.Element(tag)
+
+
+def _is_lxml_element(elem):
+    return type(elem).__module__ == "lxml.etree"
+
+
+set_xml_backend("auto")
 
 
 class XmlSer(Enum):
@@ -151,51 +351,1214 @@ class XmlSer(Enum):
         return (cls.WRAPPED_INNER_LIST, tag)
 
 
-def _stringify_trait(trait_spec, value):
-    if isinstance(trait_spec, UseEnum):
-        return str(value.value)
+def _parse_bool(text):
+    try:
+        return bool(int(text))
+    except ValueError:
+        pass
+
+    if text.lower() == "false":
+        return False
+
+    if text.lower() == "true":
+        return True
+
+    raise ValueError(f"cannot interpret text {text!r} as a boolean")
+
+
+# Large collections repeat the same strings many times -- credits, file
+# types, URLs of shared thumbnails, and so on. While a document is being
+# deserialized, its strings are deduplicated through a table, so that all of
+# the objects deserialized from it share a single copy of each. The table is
+# discarded once the document is done, unlike with sys.intern(), which can
+# keep strings alive forever.
+#
+# The state of the deserialization also records whether its input is trusted.
+# The values that we parse out of XML always have the types that their traits
+# expect, so for trusted input we install them directly, without going
+# through traitlets validation and change notification. Otherwise, every
+# value is assigned normally. The state is per-thread, so that concurrent
+# parses don't interfere.
+
+_parse_state = threading.local()
+
+
+@contextmanager
+def _parse_context(trusted=False):
+    """Deserialize XML within this context, unless an enclosing context is
+    already doing so."""
+
+    if getattr(_parse_state, "strings", None) is not None:
+        yield
+        return
+
+    _parse_state.strings = {}
+    _parse_state.trusted = trusted
+
+    try:
+        yield
+    finally:
+        _parse_state.strings = None
+        _parse_state.trusted = False
+
+
+def _parse_unicode(text):
+    if text is None:
+        return None
 
-    if trait_spec.metadata.get("xml_omit_zero") and value == 0:
-        return ""
+    strings = getattr(_parse_state, "strings", None)
 
-    text = str(value)
+    if strings is None:
+        return text
 
-    if isinstance(value, float) and text.endswith(".0"):
-        text = text[:-2]
+    return strings.setdefault(text, text)
 
-    return text
 
+def _make_trait_parser(trait_spec):
+    """Return a function that parses XML text into a value for the trait."""
 
-def _parse_trait(trait_spec, text):
     if isinstance(trait_spec, Float):
-        return float(text)
+        return float
 
     if isinstance(trait_spec, Int):
-        return int(text)
+        return int
 
     if isinstance(trait_spec, Unicode):
-        return text
+        return _parse_unicode
 
     if isinstance(trait_spec, Bool):
-        try:
-            return bool(int(text))
-        except ValueError:
-            pass
+        return _parse_bool
 
-        if text.lower() == "false":
-            return False
+    if isinstance(trait_spec, UseEnum):
+        from_text = trait_spec.enum_class.from_text
 
-        if text.lower() == "true":
-            return True
+        def parse_enum(text):
+            if text is None:
+                text = ""
+            return from_text(text)
+
+        return parse_enum
+
+    def parse_unimplemented(text):
+        raise ValueError(
+            f"internal error: unimplemented parse for trait type {trait_spec}"
+        )
+
+    return parse_unimplemented
+
+
+def _stringify_enum(value):
+    return str(value.value)
 
-        raise ValueError(f"cannot interpret text {text!r} as a boolean")
+
+def _make_trait_stringifier(trait_spec):
+    """Return a function that converts a value of the trait into XML text."""
 
     if isinstance(trait_spec, UseEnum):
-        if text is None:
-            text = ""
-        return trait_spec.enum_class.from_text(text)
+        return _stringify_enum
+
+    omit_zero = bool(trait_spec.metadata.get("xml_omit_zero"))
+
+    def stringify(value):
+        if omit_zero and value == 0:
+            return ""
+
+        text = str(value)
+
+        if isinstance(value, float) and text.endswith(".0"):
+            text = text[:-2]
+
+        return text
+
+    return stringify
+
+
+# Reading and writing implementations for the different XmlSer modes. The
+# readers return None if the XML doesn't provide a value for the trait.
+
+
+def _xml_read_attribute(step, elem):
+    text = elem.attrib.get(step.key)
+    if text is None:
+        return None
+    return step.parse(text)
+
+
+def _xml_read_text_elem(step, elem):
+    sub = elem.find(step.key)
+    if sub is None:
+        return None
+    return step.parse(sub.text)
+
+
+def _xml_read_inner(step, elem):
+    klass = step.spec.klass
+
+    for sub in elem:
+        value = klass._maybe_from_xml(sub)
+        if value is not None:
+            return value
+
+    return None
+
+
+def _xml_read_wrapped_inner(step, elem):
+    wrapper = elem.find(step.key)
+    if wrapper is None:
+        return None
+    return _xml_read_inner(step, wrapper)
+
+
+def _xml_read_ns_to_attr(step, elem):
+    prefix = step.key
+    n = len(prefix)
+    value = step.spec.klass()
+
+    for aname, avalue in elem.attrib.items():
+        if aname.startswith(prefix):
+            setattr(value, aname[n:], _parse_unicode(avalue))
+
+    return value
+
+
+def _xml_read_inner_list(step, elem):
+    klasses = step.item_classes()
+    value = []
+
+    for sub in elem:
+        for klass in klasses:
+            v = klass._maybe_from_xml(sub)
+            if v is not None:
+                value.append(v)
+                break
+
+    return value
+
+
+def _xml_read_wrapped_inner_list(step, elem):
+    wrapper = elem.find(step.key)
+    if wrapper is None:
+        return []
+    return _xml_read_inner_list(step, wrapper)
+
+
+def _xml_read_inner_list_lazy(step, elem):
+    protos = step.item_prototypes()
+    items = []
+
+    for sub in elem:
+        for proto in protos:
+            if proto._check_elem_is_this_type(sub):
+                items.append(_LazyXmlItem(proto.__class__, sub))
+                break
+
+    return _LazyXmlList(items, trusted=getattr(_parse_state, "trusted", False))
+
+
+def _xml_read_wrapped_inner_list_lazy(step, elem):
+    wrapper = elem.find(step.key)
+    if wrapper is None:
+        return []
+    return _xml_read_inner_list_lazy(step, wrapper)
+
+
+class _LazyXmlItem(object):
+    """A placeholder for a list item that hasn't been deserialized yet."""
+
+    __slots__ = ("klass", "elem")
+
+    def __init__(self, klass, elem):
+        self.klass = klass
+        self.elem = elem
+
+
+class _LazyXmlList(MutableSequence):
+    """A list whose items are deserialized from XML the first time that they
+    are accessed.
+
+    Instances of this class are used as the values of list traits of objects
+    deserialized with ``lazy=True``. Each item is either a placeholder holding
+    the XML element that it came from, or a deserialized object. Placeholders
+    are replaced with objects on access, and objects are cached. Items that
+    are never accessed are serialized by copying their original XML verbatim.
+
+    This is not a :class:`list`, but it can be extended in place with ``+=``,
+    concatenated with ``+``, and assigned to list traits, which converts it to
+    a list.
+
+    """
+
+    __slots__ = ("_items", "_trusted", "_owner", "_name")
+
+    def __init__(self, items, trusted=False):
+        self._items = items
+
+        # Whether the items come from trusted input; see _parse_context().
+        self._trusted = trusted
+
+        # If change tracking is enabled, the object and trait that this list
+        # belongs to.
+        self._owner = None
+        self._name = None
+
+    def _get(self, index):
+        item = self._items[index]
+
+        if isinstance(item, _LazyXmlItem):
+            elem = item.elem
+
+            with _parse_context(trusted=self._trusted):
+                item = item.klass._maybe_from_xml(elem, lazy=True)
+
+            self._items[index] = item
+
+            if self._owner is not None:
+                if self._owner._xml_state is not None:
+                    _track_xml_source(item, elem, self._owner)
+
+                # Items loaded after the owner was serialized must still
+                # invalidate its cache when they're modified.
+                if self._owner._xml_cache is not None:
+                    _ensure_xml_cache(item, self._owner)
+                    _watch_xml_subtree(item)
+
+        return item
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._items)))]
+        return self._get(index)
+
+    def __setitem__(self, index, value):
+        _mark_xml_dirty(self._owner, self._name)
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        _mark_xml_dirty(self._owner, self._name)
+        del self._items[index]
+
+    def __iter__(self):
+        for i in range(len(self._items)):
+            yield self._get(i)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, _LazyXmlList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def insert(self, index, value):
+        _mark_xml_dirty(self._owner, self._name)
+        self._items.insert(index, value)
+
+    def is_loaded(self, index):
+        """Return whether the specified item has been deserialized."""
+        return not isinstance(self._items[index], _LazyXmlItem)
+
+
+# Change tracking. An object deserialized with ``from_xml(...,
+# track_changes=True)`` remembers the element that it came from, the object
+# that contains it, and which of its traits have been modified. When it is
+# applied back to its source element, only the modified traits are rewritten,
+# and unmodified subtrees are skipped entirely.
+#
+# Assignments to traits are caught through traitlets change notification. The
+# contents of list and namespace traits can be modified in-place, though, so
+# those values are replaced with the tracking versions defined here.
+
+_TRACKED_MODES = frozenset(
+    (
+        XmlSer.NS_TO_ATTR,
+        XmlSer.INNER,
+        XmlSer.WRAPPED_INNER,
+        XmlSer.INNER_LIST,
+        XmlSer.WRAPPED_INNER_LIST,
+    )
+)
+
+_NESTED_MODES = _TRACKED_MODES - frozenset((XmlSer.NS_TO_ATTR,))
+
+_CONTAINER_MODES = frozenset(
+    (XmlSer.NS_TO_ATTR, XmlSer.INNER_LIST, XmlSer.WRAPPED_INNER_LIST)
+)
+
+
+class _XmlSourceState(object):
+    """The change-tracking state of an object deserialized from XML."""
+
+    __slots__ = ("elem", "parent", "dirty", "subtree_dirty", "pinned")
+
+    def __init__(self, elem, parent):
+        self.elem = elem
+        self.parent = parent
+        self.dirty = set()
+        self.subtree_dirty = False
+
+        # If something in this subtree can't be tracked, it must always be
+        # visited.
+        self.pinned = False
+
+
+def _mark_xml_dirty(obj, name, pin=False):
+    """Record that a trait of an object has changed, and that the subtrees of
+    all of its ancestors have therefore changed too."""
+
+    if obj is None:
+        return
+
+    if obj._xml_cache is not None:
+        _invalidate_xml_cache(obj)
+
+    st = obj._xml_state
+    if st is None:
+        return
+
+    if name is not None:
+        st.dirty.add(name)
+
+    while st is not None and (pin or not st.subtree_dirty):
+        st.subtree_dirty = True
+        st.pinned = st.pinned or pin
+        parent = st.parent
+        st = None if parent is None else parent._xml_state
+
+
+class _XmlTrackedList(list):
+    """A list that notifies its owner when it is modified."""
+
+    __slots__ = ("_owner", "_name")
+
+    def __init__(self, owner, name, items):
+        super(_XmlTrackedList, self).__init__(items)
+        self._owner = owner
+        self._name = name
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self),))
+
+
+def _make_tracking_method(base):
+    def method(self, *args, **kwargs):
+        _mark_xml_dirty(self._owner, self._name)
+        return base(self, *args, **kwargs)
+
+    method.__name__ = base.__name__
+    return method
+
+
+for _method_name in (
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "__setitem__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+):
+    setattr(
+        _XmlTrackedList,
+        _method_name,
+        _make_tracking_method(getattr(list, _method_name)),
+    )
+
+del _method_name
+
+
+class _XmlTrackedNamespace(Namespace):
+    """A namespace that notifies its owner when it is modified."""
+
+    __slots__ = ("_owner", "_name")
+
+    def __init__(self, owner, name, items):
+        object.__setattr__(self, "_owner", owner)
+        object.__setattr__(self, "_name", name)
+        self.__dict__.update(items)
+
+    def __setattr__(self, name, value):
+        _mark_xml_dirty(self._owner, self._name)
+        super(_XmlTrackedNamespace, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        _mark_xml_dirty(self._owner, self._name)
+        super(_XmlTrackedNamespace, self).__delattr__(name)
+
+    def __repr__(self):
+        return repr(Namespace(**self.__dict__))
+
+    def __reduce_ex__(self, protocol):
+        return (Namespace, (), dict(self.__dict__))
+
+
+def _wrap_xml_container(obj, step, value):
+    """Make sure that the list or namespace value of a trait reports in-place
+    modifications to its owner, returning the possibly-new value."""
+
+    if isinstance(value, _LazyXmlList):
+        if value._owner is None:
+            value._owner = obj
+            value._name = step.name
+        return value
+
+    if isinstance(value, (_XmlTrackedList, _XmlTrackedNamespace)):
+        if value._owner is obj:
+            return value
+
+    if step.mode == XmlSer.NS_TO_ATTR:
+        value = _XmlTrackedNamespace(obj, step.name, value.__dict__)
+    else:
+        value = _XmlTrackedList(obj, step.name, value)
+
+    # The values were already validated.
+    obj._trait_values[step.name] = value
+    return value
+
 
-    raise ValueError(f"internal error: unimplemented parse for trait type {trait_spec}")
+# Serialization caching. If caching is enabled on an object, the UTF-8 bytes
+# of its serialization, and those of all of its descendants, are saved. Each
+# cached object knows the objects that contain it, and changes to an object
+# invalidate its cache and those of its ancestors, using the same hooks as the
+# change tracking above. Folders are assembled from the cached serializations
+# of their children, so after a change only the affected objects need to be
+# reserialized.
+
+_XML_DECLARATION = b"<?xml version='1.0' encoding='UTF-8'?>\n"
+
+
+class _XmlCacheState(object):
+    """The serialization cache of an object."""
+
+    __slots__ = ("entries", "parents", "stale", "serialize")
+
+    def __init__(self):
+        # Maps (indent, level) to (data, has_subelements), and
+        # _FINGERPRINT_KEY to the object's content digest.
+        self.entries = {}
+        self.parents = []
+
+        # Whether serializations of this object should use the cache. Content
+        # fingerprints are always cached.
+        self.serialize = False
+
+        # Whether this object has been modified since the last time that it
+        # or one of its ancestors was serialized.
+        self.stale = False
+
+
+def _ensure_xml_cache(obj, parent):
+    cache = obj._xml_cache
+
+    if cache is None:
+        cache = obj._xml_cache = _XmlCacheState()
+
+    if parent is not None and not any(p is parent for p in cache.parents):
+        cache.parents.append(parent)
+
+    return cache
+
+
+def _invalidate_xml_cache(obj):
+    todo = [obj]
+
+    while todo:
+        cache = todo.pop()._xml_cache
+
+        # If an object is already stale, so are its ancestors.
+        if cache is not None and not cache.stale:
+            cache.stale = True
+            cache.entries.clear()
+            todo.extend(cache.parents)
+
+
+def _cached_xml_fragment(obj, indent, level):
+    """Get the serialization of an object as it would appear at the specified
+    level of an XML document, using and filling in the cache.
+
+    Returns a tuple ``(data, has_subelements)``, where *data* is the UTF-8
+    encoding of the element without any tail text.
+
+    """
+    cache = _ensure_xml_cache(obj, None)
+    cache.serialize = True
+    key = (indent, level)
+    result = cache.entries.get(key)
+
+    if result is None:
+        result = cache.entries[key] = _compose_xml_fragment(obj, indent, level)
+        cache.stale = False
+
+    return result
+
+
+def _watch_xml_subtree(obj, skip=None):
+    """Make sure that modifications to anything contained in an object, except
+    for the contents of the trait *skip*, invalidate its cache."""
+
+    for step in obj._xml_tracked_steps:
+        if step is skip:
+            continue
+
+        value = getattr(obj, step.name)
+
+        if value is None:
+            continue
+
+        if step.mode in (XmlSer.INNER, XmlSer.WRAPPED_INNER):
+            children = (value,)
+        else:
+            value = _wrap_xml_container(obj, step, value)
+
+            if step.mode == XmlSer.NS_TO_ATTR:
+                continue
+
+            if isinstance(value, _LazyXmlList):
+                children = [v for v in value._items if not isinstance(v, _LazyXmlItem)]
+            else:
+                children = value
+
+        for child in children:
+            _ensure_xml_cache(child, obj).stale = False
+            _watch_xml_subtree(child)
+
+
+def _compose_xml_fragment(obj, indent, level):
+    splice_step = None
+
+    for step in obj._xml_tracked_steps:
+        if step.mode == XmlSer.INNER_LIST:
+            splice_step = step
+            break
+
+    if splice_step is not None:
+        # Serialize everything except the list items. If there's nothing else
+        # inside the element, we can splice in the cached serializations of
+        # the items; otherwise, we just serialize everything normally.
+        shell = _new_xml_element(obj._tag_name())
+        obj._write_xml_steps(shell, [s for s in obj._xml_plan if s is not splice_step])
+
+        if not len(shell) and not shell.text:
+            _watch_xml_subtree(obj, skip=splice_step)
+            items = _wrap_xml_container(
+                obj, splice_step, getattr(obj, splice_step.name)
+            )
+            if isinstance(items, _LazyXmlList):
+                items = items._items
+
+            data = _stringify_xml_fragment(shell, indent=False)
+
+            if not len(items):
+                return (data, False)
+
+            sep = (b"\n" + b"  " * (level + 1)) if indent else b""
+            parts = [data[:-3], b">"]
+
+            for item in items:
+                parts.append(sep)
+
+                if isinstance(item, _LazyXmlItem):
+                    parts.append(
+                        _stringify_xml_fragment(
+                            deepcopy(item.elem), indent=indent, level=level + 1
+                        )
+                    )
+                else:
+                    _ensure_xml_cache(item, obj)
+                    parts.append(_cached_xml_fragment(item, indent, level + 1)[0])
+
+            if indent:
+                parts.append(b"\n" + b"  " * level)
+
+            parts += [b"</", shell.tag.encode("utf-8"), b">"]
+            return (b"".join(parts), True)
+
+    _watch_xml_subtree(obj)
+    elem = obj._serialize_xml(None)
+    has_subelements = len(elem) > 0
+    return (
+        _stringify_xml_fragment(elem, indent=indent, level=level),
+        has_subelements,
+    )
+
+
+# Content fingerprints. A fingerprint is a digest of the values of an object's
+# XML-serialized traits, independent of how they would be formatted as XML.
+# Digests are saved in the serialization cache state, so that modifications
+# invalidate them in the same way as cached serializations.
+
+_FINGERPRINT_KEY = "fingerprint"
+_FINGERPRINT_FIELDS = {}
+_FP_U32 = struct.Struct("<I")
+_FP_F64 = struct.Struct("<d")
+
+
+def _fingerprint_str(parts, tag, s):
+    b = s.encode("utf-8")
+    parts += (tag, _FP_U32.pack(len(b)), b)
+
+
+def _fingerprint_value(parts, owner, value):
+    if value is None:
+        parts.append(b"-")
+    elif isinstance(value, str):
+        _fingerprint_str(parts, b"s", value)
+    elif isinstance(value, bool):
+        parts.append(b"T" if value else b"F")
+    elif isinstance(value, int):
+        _fingerprint_str(parts, b"i", str(value))
+    elif isinstance(value, float):
+        parts += (b"d", _FP_F64.pack(value))
+    elif isinstance(value, Enum):
+        _fingerprint_str(parts, b"e", value.name)
+    elif isinstance(value, LockedXmlTraits):
+        parts += (b"o", _fingerprint_digest(value, owner))
+    elif isinstance(value, Namespace):
+        items = sorted((k, str(v)) for k, v in value.__dict__.items())
+        parts += (b"n", _FP_U32.pack(len(items)))
+
+        for k, v in items:
+            _fingerprint_str(parts, b"s", k)
+            _fingerprint_str(parts, b"s", v)
+    else:
+        parts += (b"l", _FP_U32.pack(len(value)))
+
+        for item in value:
+            _fingerprint_value(parts, owner, item)
+
+
+def _fingerprint_fields(cls):
+    """Get a list of ``(step, default, is_container)`` for a class."""
+
+    fields = _FINGERPRINT_FIELDS.get(cls)
+
+    if fields is None:
+        proto = cls()
+        fields = _FINGERPRINT_FIELDS[cls] = [
+            (step, getattr(proto, step.name), step.mode in _CONTAINER_MODES)
+            for step in cls._xml_plan
+        ]
+
+    return fields
+
+
+def _fingerprint_digest(obj, parent=None):
+    """Get the content digest of an object, using and filling in the cache."""
+
+    cache = _ensure_xml_cache(obj, parent)
+    digest = cache.entries.get(_FINGERPRINT_KEY)
+
+    if digest is not None:
+        return digest
+
+    cls = obj.__class__
+    trait_values = obj._trait_values
+    parts = []
+    _fingerprint_str(parts, b"c", f"{cls.__module__}.{cls.__qualname__}")
+
+    for step, default, is_container in _fingerprint_fields(cls):
+        value = trait_values.get(step.name, _NOT_SET)
+
+        if value is _NOT_SET:
+            # An unset scalar has its default value. Containers must be
+            # instantiated so that they can report in-place modifications.
+            if not is_container:
+                continue
+            value = getattr(obj, step.name)
+
+        if is_container and value is not None:
+            value = _wrap_xml_container(obj, step, value)
+
+        # Traits with default values are skipped so that adding a new trait
+        # to a class does not change the fingerprints of existing data.
+        if value == default:
+            continue
+
+        _fingerprint_str(parts, b"t", step.name)
+        _fingerprint_value(parts, obj, value)
+
+    digest = hashlib.blake2b(b"".join(parts), digest_size=16).digest()
+    cache.entries[_FINGERPRINT_KEY] = digest
+    cache.stale = False
+    return digest
+
+
+def _xml_clear_step(step, elem):
+    """Remove the XML associated with a plan step from an element."""
+
+    if step.mode == XmlSer.ATTRIBUTE:
+        elem.attrib.pop(step.key, None)
+    elif step.mode == XmlSer.NS_TO_ATTR:
+        for aname in [a for a in elem.attrib if a.startswith(step.key)]:
+            del elem.attrib[aname]
+    elif step.mode != XmlSer.INNER_LIST:
+        sub = elem.find(step.key)
+        if sub is not None:
+            elem.remove(sub)
+
+
+def _track_xml_source(obj, elem, parent):
+    """Start tracking changes to an object deserialized from *elem*."""
+
+    st = obj._xml_state = _XmlSourceState(elem, parent)
+
+    for step in obj._xml_tracked_steps:
+        _track_xml_step(obj, st, step)
+
+
+def _track_xml_step(obj, st, step):
+    """Set up change tracking for one nested-value trait of an object.
+
+    The nested objects are associated with the elements that the XML writers
+    will serialize them into. If that can't be done, the object is pinned so
+    that it is always fully visited.
+
+    """
+    value = getattr(obj, step.name)
+    if value is None:
+        return
+
+    mode = step.mode
+
+    if mode == XmlSer.NS_TO_ATTR:
+        _wrap_xml_container(obj, step, value)
+        return
+
+    if mode == XmlSer.INNER:
+        sub = st.elem.find(step.key)
+    elif mode == XmlSer.WRAPPED_INNER:
+        wrapper = st.elem.find(step.key)
+        sub = wrapper[0] if wrapper is not None and len(wrapper) else None
+    else:
+        if mode == XmlSer.INNER_LIST:
+            container = st.elem
+        else:
+            container = st.elem.find(step.key)
+
+            if container is None and not len(value):
+                return
+
+        if container is None or len(container) != len(value):
+            _mark_xml_dirty(obj, None, pin=True)
+            return
+
+        value = _wrap_xml_container(obj, step, value)
+        items = value._items if isinstance(value, _LazyXmlList) else value
+
+        for item, sub in zip(items, container):
+            if not isinstance(item, _LazyXmlItem):
+                _track_xml_source(item, sub, obj)
+
+        return
+
+    if sub is None:
+        _mark_xml_dirty(obj, None, pin=True)
+    else:
+        _track_xml_source(value, sub, obj)
+
+
+def _xml_subelement(parent, tag):
+    # Use makeelement() so that the new element matches the type of its
+    # parent, which might come from either XML backend.
+    sub = parent.makeelement(tag, {})
+    parent.append(sub)
+    return sub
+
+
+def _xml_append_new(parent, value):
+    value._serialize_xml(_xml_subelement(parent, value._tag_name()))
+
+
+def _xml_write_attribute(step, elem, value):
+    text = step.stringify(value)
+    if not text and not step.even_if_empty:
+        return
+
+    elem.set(step.key, text)
+
+
+def _xml_write_text_elem(step, elem, value):
+    text = step.stringify(value)
+    if not text and not step.even_if_empty:
+        return
+
+    sub = elem.find(step.key)
+    if sub is None:
+        sub = _xml_subelement(elem, step.key)
+
+    # Empty text is stored as None, which is what parsers produce for empty
+    # elements, so that all backends will serialize it in the same way.
+    sub.text = text or None
+
+
+def _xml_write_inner(step, elem, value):
+    cur_sub = elem.find(step.key)
+    if cur_sub is None:
+        _xml_append_new(elem, value)
+    else:
+        value._serialize_xml(cur_sub)
+
+
+def _xml_write_wrapped_inner(step, elem, value):
+    wrapper = elem.find(step.key)
+    if wrapper is None:
+        wrapper = _xml_subelement(elem, step.key)
+
+    if len(wrapper):
+        value._serialize_xml(wrapper[0])
+    else:
+        _xml_append_new(wrapper, value)
+
+
+def _xml_write_ns_to_attr(step, elem, value):
+    for ns_name, ns_value in value.__dict__.items():
+        elem.set(step.key + ns_name, str(ns_value))
+
+
+def _xml_write_list_items(parent, preexisting, value):
+    # This is gross. If the list of children gets mutated, in the current
+    # framework we basically have no way to know what pre-existing XML
+    # elements map to our children. The best I can come up with is that we
+    # try to enforce the invariant that the list of children cannot get
+    # mutated.
+    if preexisting and len(parent) != len(value):
+        raise RuntimeError(
+            "serializing flexible list to existing XML data, "
+            "but it looks like something changed beneath us"
+        )
+
+    if isinstance(value, _LazyXmlList):
+        value = value._items
+
+    # Indexing into an lxml element is linear in the index, so get the
+    # children up front.
+    subs = list(parent) if preexisting else None
+
+    for idx, child in enumerate(value):
+        if isinstance(child, _LazyXmlItem):
+            # An item that was never deserialized, and so can't have changed:
+            # emit its original XML.
+            if not preexisting:
+                parent.append(deepcopy(child.elem))
+            elif subs[idx] is not child.elem:
+                if subs[idx].tag != child.elem.tag:
+                    raise RuntimeError(
+                        "serializing flexible list to existing XML data, "
+                        f"but it looks like child #{idx} changed"
+                    )
+                parent[idx] = deepcopy(child.elem)
+        elif preexisting:
+            sub = subs[idx]
+
+            if sub.tag != child._tag_name():
+                raise RuntimeError(
+                    "serializing flexible list to existing XML data, "
+                    f"but it looks like child #{idx} changed"
+                )
+            child._serialize_xml(sub)
+        else:
+            _xml_append_new(parent, child)
+
+
+def _xml_write_inner_list(step, elem, value):
+    _xml_write_list_items(elem, bool(len(elem)), value)
+
+
+def _xml_write_wrapped_inner_list(step, elem, value):
+    wrapper = elem.find(step.key)
+
+    if wrapper is None:
+        wrapper = _xml_subelement(elem, step.key)
+        _xml_write_list_items(wrapper, False, value)
+    else:
+        _xml_write_list_items(wrapper, True, value)
+
+
+_XML_MODE_IMPLS = {
+    XmlSer.ATTRIBUTE: (_xml_read_attribute, _xml_write_attribute),
+    XmlSer.TEXT_ELEM: (_xml_read_text_elem, _xml_write_text_elem),
+    XmlSer.INNER: (_xml_read_inner, _xml_write_inner),
+    XmlSer.WRAPPED_INNER: (_xml_read_wrapped_inner, _xml_write_wrapped_inner),
+    XmlSer.NS_TO_ATTR: (_xml_read_ns_to_attr, _xml_write_ns_to_attr),
+    XmlSer.INNER_LIST: (_xml_read_inner_list, _xml_write_inner_list),
+    XmlSer.WRAPPED_INNER_LIST: (
+        _xml_read_wrapped_inner_list,
+        _xml_write_wrapped_inner_list,
+    ),
+}
+
+# Readers used instead of the standard ones when deserializing lazily.
+
+_XML_LAZY_READERS = {
+    XmlSer.INNER_LIST: _xml_read_inner_list_lazy,
+    XmlSer.WRAPPED_INNER_LIST: _xml_read_wrapped_inner_list_lazy,
+}
+
+
+class _XmlPlanStep(object):
+    """One step in the precompiled XML serialization plan of a class.
+
+    Each step corresponds to one XML-serialized trait. Everything that can be
+    determined from the trait declaration -- the serialization mode, the
+    tag/attribute name, the text parser and stringifier, and the various
+    ``xml_*`` metadata flags -- is computed once, when the class is created,
+    so that per-object (de)serialization doesn't have to redo that work.
+
+    """
+
+    __slots__ = (
+        "name",
+        "spec",
+        "mode",
+        "key",
+        "parse",
+        "stringify",
+        "even_if_empty",
+        "sky_type_filter",
+        "read",
+        "read_lazy",
+        "write",
+        "_item_classes",
+        "_item_prototypes",
+    )
+
+    def __init__(self, name, spec):
+        mode, *xml_data = spec.metadata["xml"]
+
+        impls = _XML_MODE_IMPLS.get(mode)
+        if impls is None:
+            raise RuntimeError(f"unhandled XML serialization mode {mode}")
+
+        if mode in (XmlSer.INNER, XmlSer.WRAPPED_INNER, XmlSer.NS_TO_ATTR):
+            if not isinstance(spec, Instance):
+                raise RuntimeError(
+                    f"an XML element serialized as {mode.name} must be of Instance type"
+                )
+        elif mode in (XmlSer.INNER_LIST, XmlSer.WRAPPED_INNER_LIST):
+            if not isinstance(spec, List):
+                raise RuntimeError(
+                    f"XML elements serialized as {mode.name} must be of List type"
+                )
+
+            # total hackiness specific for the Folder use case, plus encapsulation breakage:
+            if not isinstance(spec._trait, Union):
+                raise RuntimeError(
+                    f"XML elements serialized as {mode.name} must be of List(Union) type"
+                )
+
+        self.name = name
+        self.spec = spec
+        self.mode = mode
+        self.key = xml_data[0] if xml_data else None
+        self.parse = _make_trait_parser(spec)
+        self.stringify = _make_trait_stringifier(spec)
+        self.even_if_empty = spec.metadata.get("xml_even_if_empty", False)
+        self.sky_type_filter = spec.metadata.get("xml_if_sky_type_is")
+        self.read, self.write = impls
+        self.read_lazy = _XML_LAZY_READERS.get(mode, self.read)
+        self._item_classes = None
+        self._item_prototypes = None
+
+    def item_classes(self):
+        """Get the classes that may appear in a List(Union) trait.
+
+        The union members may be declared with class names that can't be
+        resolved until an instance of the owning class has been created, so
+        this is evaluated lazily.
+
+        """
+        if self._item_classes is None:
+            self._item_classes = tuple(t.klass for t in self.spec._trait.trait_types)
+        return self._item_classes
+
+    def item_prototypes(self):
+        """Get default instances of the classes that may appear in a
+        List(Union) trait, used to check element types without deserializing
+        them."""
+        if self._item_prototypes is None:
+            self._item_prototypes = tuple(k() for k in self.item_classes())
+        return self._item_prototypes
+
+
+_NOT_SET = object()
+
+
+def _unpickle_xml_traits(cls, values, rmeta):
+    """Recreate a LockedXmlTraits instance from the state generated by its
+    ``__reduce__`` method."""
+    inst = cls()
+    trait_values = inst._trait_values
+
+    # The values were validated when the pickled object was created, so we
+    # don't need to pass them through traitlets again.
+    for step, value in zip(cls._xml_plan, values):
+        trait_values[step.name] = value
+
+    if rmeta is not None:
+        trait_values["rmeta"] = rmeta
+
+    return inst
+
+
+# Trait values of these types can be shared between clones.
+_IMMUTABLE_TYPES = (str, int, float, bytes, Enum)
+
+
+def _clone_value(value):
+    """Copy a trait value for :meth:`LockedXmlTraits.clone`."""
+
+    if value is None or isinstance(value, _IMMUTABLE_TYPES):
+        return value
+
+    if isinstance(value, LockedXmlTraits):
+        return value.clone()
+
+    if isinstance(value, _LazyXmlList):
+        # Unloaded items can share their XML elements, which are only read --
+        # unless the list belongs to a tracked tree, since applying its
+        # changes rewrites the elements in place.
+        owner = value._owner
+        share = owner is None or owner._xml_state is None
+        items = []
+
+        for item in value._items:
+            if not isinstance(item, _LazyXmlItem):
+                item = item.clone()
+            elif not share:
+                item = _LazyXmlItem(item.klass, deepcopy(item.elem))
+
+            items.append(item)
+
+        return _LazyXmlList(items, trusted=value._trusted)
+
+    if isinstance(value, list):
+        return [_clone_value(item) for item in value]
+
+    if isinstance(value, Namespace):
+        return Namespace(**dict((k, _clone_value(v)) for k, v in vars(value).items()))
+
+    return deepcopy(value)
+
+
+def _compile_xml_plan(trait_specs):
+    """Compute the XML serialization plan for a set of traits.
+
+    The plan is a tuple of :class:`_XmlPlanStep` objects, one for each trait
+    with ``xml`` metadata, sorted by trait name. This matches the ordering of
+    ``HasTraits.traits()``, which gives us XML output with a deterministic
+    ordering of child elements.
+
+    """
+    return tuple(
+        _XmlPlanStep(name, spec)
+        for name, spec in sorted(trait_specs.items())
+        if spec.metadata.get("xml") is not None
+    )
+
+
+class MetaLockedDownTraits(ABCMeta, MetaHasTraits):
+    """A metaclass to help with the LockedDownTraits class. When a class using
+    this metaclass is created, a frozenset of all of the traitlets attached to
+    the class definition (including those defined by its base classes) is
+    created for fast checks during __setattr__ calls. The other setup done by
+    traitlet's MetaHasTraits metaclass is also performed.
+
+    The metaclass also compiles the class's XML serialization plan: an ordered
+    sequence of steps, one for each trait with ``xml`` metadata, that is
+    stored as ``_xml_plan`` and drives the (de)serialization implemented in
+    :class:`LockedXmlTraits`.
+
+    """
+
+    def __init__(cls, name, bases, classdict):
+        super(MetaLockedDownTraits, cls).__init__(name, bases, classdict)
+
+        # This list hardcode attributes that are manipulated by the traitlets
+        # machinery.
+        settable_attr_names = set(
+            (
+                "_cross_validation_lock",
+                "_trait_notifiers",
+                "_trait_validators",
+                "_trait_values",
+                "_xml_cache",
+                "_xml_state",
+                "notify_change",
+            )
+        )
+
+        trait_specs = {}
+
+        for c in cls.mro():
+            for attr_name, attr_value in c.__dict__.items():
+                if isinstance(attr_value, TraitType):
+                    settable_attr_names.add(attr_name)
+                    trait_specs.setdefault(attr_name, attr_value)
+
+        cls._settable_attr_names = frozenset(settable_attr_names)
+        cls._xml_plan = _compile_xml_plan(trait_specs)
+        cls._xml_tracked_steps = tuple(
+            step for step in cls._xml_plan if step.mode in _TRACKED_MODES
+        )
+        cls._xml_container_steps = dict(
+            (step.name, step) for step in cls._xml_plan if step.mode in _CONTAINER_MODES
+        )
+
+
+class LockedDownTraits(HasTraits, metaclass=MetaLockedDownTraits):
+    """A base class for HasTraits objects where we do not allow callers to add
+    additional attributes to class instances. We do not allow them to delete
+    attributes either.
+
+    The general motivation is that there are some kinds of classes that
+    contain a pretty fixed set of fields where it's much more likely that
+    someone is going to make a typo in a variable assignment than it will be
+    legitimately useful for them to add new attributes.
+
+    There's an escape hatch, however, the ``rmeta`` attribute (for "runtime
+    metadata") is a namespace object to which one can attach whichever
+    metadata one wants.
+
+    """
+
+    rmeta = Instance(
+        Namespace,
+        args=(),
+        help="Runtime metadata - a namespace object for attaching arbitrary extra information",
+    )
+
+    def __setattr__(self, name, value):
+        if name not in self._settable_attr_names:
+            raise AttributeError(
+                f"not allowed to set attribute {name!r} on this instance (typo?)"
+            )
+        super(LockedDownTraits, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if name != "notify_change":  # sigh, traitlets
+            raise AttributeError(
+                f"not allowed to delete attribute {name!r} from this instance"
+            )
+        super(LockedDownTraits, self).__delattr__(name)
+
+    def __repr__(self):
+        # This gets a bit beyond the nominal bailiwick of this class, but it's
+        # pretty universally useful.
+        s = ", ".join("{}={!r}".format(a, getattr(self, a)) for a in self.trait_names())
+        return f"{self.__class__.__name__}({s})"
 
 
 class LockedXmlTraits(LockedDownTraits):
@@ -207,10 +1570,49 @@ class LockedXmlTraits(LockedDownTraits):
 
     """
 
+    _xml_state = None
+    "Change-tracking state, if this object was deserialized with tracking."
+
+    _xml_cache = None
+    "Serialization cache and content fingerprint, if either has been computed."
+
     def _tag_name(self):
         """Return the XML tag name associated with the serialization of this object."""
         raise NotImplementedError()
 
+    def __setattr__(self, name, value):
+        step = self._xml_container_steps.get(name)
+
+        if step is None:
+            super(LockedXmlTraits, self).__setattr__(name, value)
+            return
+
+        if isinstance(value, _LazyXmlList):
+            # `obj.children += [...]` modifies the lazy list in place and then
+            # assigns it back. Otherwise, convert it to a list, which the
+            # trait requires.
+            if value is self._trait_values.get(name):
+                return
+            value = list(value)
+
+        super(LockedXmlTraits, self).__setattr__(name, value)
+
+        # traitlets doesn't send a change notification if the new value is
+        # equal to the old one, but the new container still replaces the one
+        # that reported in-place modifications.
+        if self._xml_state is not None or self._xml_cache is not None:
+            _mark_xml_dirty(self, name)
+            value = getattr(self, name)
+
+            if value is not None:
+                _wrap_xml_container(self, step, value)
+
+    def notify_change(self, change):
+        if self._xml_state is not None or self._xml_cache is not None:
+            _mark_xml_dirty(self, change["name"])
+
+        super(LockedXmlTraits, self).notify_change(change)
+
     def _check_elem_is_this_type(self, elem):
         """Return whether the XML element represents an instance of this class.
 
@@ -224,13 +1626,15 @@ class LockedXmlTraits(LockedDownTraits):
         return elem.tag == self._tag_name()
 
     @classmethod
-    def _maybe_from_xml(cls, elem):
+    def _maybe_from_xml(cls, elem, lazy=False):
         """Possibly deserialize an instance of this class from an XML fragment.
 
         Parameters
         ----------
         elem : :class:`xml.etree.ElementTree.Element`
           An XML element.
+        lazy : optional bool, default False
+          If true, defer deserialization of list items. See :meth:`from_xml`.
 
         Returns
         -------
@@ -251,148 +1655,173 @@ class LockedXmlTraits(LockedDownTraits):
         if not inst._check_elem_is_this_type(elem):
             return None
 
-        for tname, tspec in inst.traits(xml=lambda a: a is not None).items():
-            xml_spec, *xml_data = tspec.metadata["xml"]
-            value = None
-
-            if xml_spec == XmlSer.ATTRIBUTE:
-                text = elem.attrib.get(xml_data[0])
-                if text is not None:
-                    value = _parse_trait(tspec, text)
-            elif xml_spec == XmlSer.TEXT_ELEM:
-                sub = elem.find(xml_data[0])
-                if sub is not None:
-                    value = _parse_trait(tspec, sub.text)
-            elif xml_spec == XmlSer.INNER:
-                if not isinstance(tspec, Instance):
-                    raise RuntimeError(
-                        "an XML element serialized as INNER must be of Instance type"
-                    )
-
-                for sub in elem:
-                    value = tspec.klass._maybe_from_xml(sub)
-                    if value is not None:
-                        break
-            elif xml_spec == XmlSer.WRAPPED_INNER:
-                if not isinstance(tspec, Instance):
-                    raise RuntimeError(
-                        "an XML element serialized as WRAPPED_INNER must be of Instance type"
-                    )
-
-                wrapper = elem.find(xml_data[0])
-                if wrapper is not None:
-                    for sub in wrapper:
-                        value = tspec.klass._maybe_from_xml(sub)
-                        if value is not None:
-                            break
-            elif xml_spec == XmlSer.NS_TO_ATTR:
-                if not isinstance(tspec, Instance):
-                    raise RuntimeError(
-                        "an XML element serialized as NS_TO_ATTR must be of Instance type"
-                    )
-
-                value = tspec.klass()
-                for aname, avalue in elem.attrib.items():
-                    if aname.startswith(xml_data[0]):
-                        setattr(value, aname[len(xml_data[0]) :], avalue)
-            elif xml_spec == XmlSer.INNER_LIST:
-                if not isinstance(tspec, List):
-                    raise RuntimeError(
-                        "XML elements serialized as INNER_LIST must be of List type"
-                    )
-
-                # total hackiness specific for the Folder use case, plus encapsulation breakage:
-                un_spec = tspec._trait
-                if not isinstance(un_spec, Union):
-                    raise RuntimeError(
-                        "XML elements serialized as INNER_LIST must be of List(Union) type"
-                    )
-
-                klasses = [t.klass for t in un_spec.trait_types]
-                # end hackiness, maybe.
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
 
-                value = []
+        trait_values = inst._trait_values
+        trusted = getattr(_parse_state, "trusted", False)
 
-                for sub in elem:
-                    for klass in klasses:
-                        v = klass._maybe_from_xml(sub)
-                        if v is not None:
-                            value.append(v)
-                            break
-            elif xml_spec == XmlSer.WRAPPED_INNER_LIST:
-                # Repeat the INNER_LIST hackiness
-                if not isinstance(tspec, List):
-                    raise RuntimeError(
-                        "XML elements serialized as WRAPPED_INNER_LIST must be of List type"
-                    )
-
-                un_spec = tspec._trait
-                if not isinstance(un_spec, Union):
-                    raise RuntimeError(
-                        "XML elements serialized as WRAPPED_INNER_LIST must be of List(Union) type"
-                    )
+        for step in cls._xml_plan:
+            if lazy:
+                value = step.read_lazy(step, elem)
 
-                klasses = [t.klass for t in un_spec.trait_types]
-                # end hackiness, maybe.
+                if isinstance(value, _LazyXmlList):
+                    # Validation would force every item to be loaded, so
+                    # install the list directly.
+                    trait_values[step.name] = value
+                    continue
+            else:
+                value = step.read(step, elem)
 
-                value = []
+            if value is None:
+                continue
 
-                wrapper = elem.find(xml_data[0])
-                if wrapper is not None:
-                    for sub in wrapper:
-                        for klass in klasses:
-                            v = klass._maybe_from_xml(sub)
-                            if v is not None:
-                                value.append(v)
-                                break
+            if trusted:
+                # See _parse_context().
+                trait_values[step.name] = value
             else:
-                raise RuntimeError(f"unhandled XML serialization mode {xml_spec}")
+                setattr(inst, step.name, value)
 
-            if value is not None:
-                setattr(inst, tname, value)
+        if collector is not None:
+            collector._end(token, "parse", cls.__name__, "lazy" if lazy else "eager")
 
         return inst
 
     @classmethod
-    def from_xml(cls, elem):
+    def from_xml(cls, elem, lazy=False, track_changes=False, trusted=False):
         """Deserialize an instance of this class from XML.
 
         Parameters
         ----------
         elem : xml.etree.ElementTree.Element
           An XML element serializing the object.
+        lazy : optional bool, default False
+          If true, the items of list-valued fields, such as the
+          :attr:`~wwt_data_formats.folder.Folder.children` of a folder, are
+          only deserialized when they are first accessed. The XML elements of
+          items that are never accessed are retained and emitted verbatim if
+          the object is reserialized. This makes it much cheaper to open a
+          large folder and only look at a few of its children.
+        track_changes : optional bool, default False
+          If true, the returned object and its descendants remember the XML
+          elements that they came from and keep track of which of their data
+          are modified. Calling :meth:`apply_to_xml` with *elem* will then
+          only update the parts of the tree that have changed, so that small
+          edits to large documents are cheap. The XML tree is kept alive as
+          long as the object is.
+        trusted : optional bool, default False
+          If true, the XML is assumed to come from a trustworthy source, such
+          as a file that you wrote yourself. The values parsed from it are
+          then stored directly, rather than being assigned through the usual
+          traitlets machinery with its validation and change notification.
+          Because the parsers always produce values of the correct types, the
+          results are the same for well-formed data, but deserialization is
+          substantially faster. Don't use this with input that could have
+          been tampered with, or if a subclass adds validators or observers
+          that must see deserialized values.
 
         Returns
         -------
         An instance of the class, initialized with data from the XML.
 
         """
-        inst = cls._maybe_from_xml(elem)
+        with _parse_context(trusted=trusted):
+            inst = cls._maybe_from_xml(elem, lazy=lazy)
+
         if inst is None:
             raise ValueError(
                 f"expected to get a {cls} instance from <{elem.tag}>, but didn't"
             )
+
+        if track_changes:
+            _track_xml_source(inst, elem, None)
+
         return inst
 
     @classmethod
-    def from_text(cls, text):
+    def from_text(cls, text, lazy=False, trusted=False):
         """Deserialize an instance of this class from XML-formatted text.
 
         Parameters
         ----------
         text : string
           The XML text.
+        lazy : optional bool, default False
+          Whether to defer deserialization of list items; see :meth:`from_xml`.
+        trusted : optional bool, default False
+          Whether to skip validation of the deserialized data; see
+          :meth:`from_xml`.
+
+        Returns
+        -------
+        An instance of the class, initialized with data from the XML.
+
+        """
+        elem = _parse_xml_text(text)
+        return cls.from_xml(elem, lazy=lazy, trusted=trusted)
+
+    @classmethod
+    def from_bytes(cls, data, lazy=False, trusted=False):
+        """Deserialize an instance of this class from UTF-8 XML data.
+
+        Parameters
+        ----------
+        data : bytes
+          The XML data. A leading Unicode Byte Order Marker (BOM) is ignored.
+        lazy : optional bool, default False
+          Whether to defer deserialization of list items; see :meth:`from_xml`.
+        trusted : optional bool, default False
+          Whether to skip validation of the deserialized data; see
+          :meth:`from_xml`.
+
+        Returns
+        -------
+        An instance of the class, initialized with data from the XML.
+
+        Notes
+        -----
+        The data are handed directly to the XML parser, which is more efficient
+        than decoding them to text and using :meth:`from_text`. As with
+        :meth:`from_text`, any encoding declared in the XML is ignored: some
+        WWT data files declare an encoding of UTF-16 while actually being
+        encoded in UTF-8.
+
+        """
+        elem = _parse_xml_bytes(data)
+        return cls.from_xml(elem, lazy=lazy, trusted=trusted)
+
+    @classmethod
+    def from_stream(cls, stream, lazy=False, trusted=False):
+        """Deserialize an instance of this class from a stream of UTF-8 XML
+        data.
+
+        Parameters
+        ----------
+        stream : readable binary file-like object
+          The source of the XML data. A leading Unicode Byte Order Marker
+          (BOM) is ignored.
+        lazy : optional bool, default False
+          Whether to defer deserialization of list items; see :meth:`from_xml`.
+        trusted : optional bool, default False
+          Whether to skip validation of the deserialized data; see
+          :meth:`from_xml`.
 
         Returns
         -------
         An instance of the class, initialized with data from the XML.
 
+        Notes
+        -----
+        The parser reads the stream in chunks, so the full document text never
+        needs to be held in memory. See also :meth:`from_bytes`.
+
         """
-        elem = etree.fromstring(text)
-        return cls.from_xml(elem)
+        elem = _parse_xml_stream(stream)
+        return cls.from_xml(elem, lazy=lazy, trusted=trusted)
 
     @classmethod
-    def from_file(cls, path, encoding="utf-8-sig"):
+    def from_file(cls, path, encoding="utf-8-sig", lazy=False, trusted=False):
         """Deserialize an instance of this class from an XML file on local disk.
 
         Parameters
@@ -402,19 +1831,33 @@ class LockedXmlTraits(LockedDownTraits):
         encoding : optional string, default "utf-8-sig"
             The encoding of the file text. The default value is basically UTF-8 but
             will ignore Windows Byte Order Markers (BOMs) if present.
+        lazy : optional bool, default False
+            Whether to defer deserialization of list items; see :meth:`from_xml`.
+        trusted : optional bool, default False
+            Whether to skip validation of the deserialized data; see
+            :meth:`from_xml`.
 
         Returns
         -------
         An instance of the class, initialized with data from the XML.
 
+        Notes
+        -----
+        UTF-8 files are parsed directly with :meth:`from_stream`, without
+        decoding them to text first.
+
         """
+        if _is_utf8_codec(encoding):
+            with open(path, "rb") as f:
+                return cls.from_stream(f, lazy=lazy, trusted=trusted)
+
         with open(path, "rt", encoding=encoding) as f:
             text = f.read()
 
-        return cls.from_text(text)
+        return cls.from_text(text, lazy=lazy, trusted=trusted)
 
     @classmethod
-    def from_url(cls, url, session=None, **kwargs):
+    def from_url(cls, url, session=None, lazy=False, cache=None, **kwargs):
         """Deserialize an instance of this class from XML downloaded from the
         specified URL.
 
@@ -424,6 +1867,12 @@ class LockedXmlTraits(LockedDownTraits):
             The URL from which to download the XML.
         session : ``requests`` session or None (the default)
             The HTTP communications session to use.
+        lazy : optional bool, default False
+            Whether to defer deserialization of list items; see :meth:`from_xml`.
+        cache : optional :class:`~wwt_data_formats.httpcache.HttpCache`
+            If specified, a cache of previously downloaded documents. The
+            document is only downloaded if it has changed since it was
+            cached.
         kwargs
             Extra arguments to pass to ``requests.get``.
 
@@ -432,6 +1881,18 @@ class LockedXmlTraits(LockedDownTraits):
         An instance of the class, initialized with data from the XML.
 
         """
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
+
+        if cache is not None:
+            obj = cache.load(cls, url, session=session, lazy=lazy, **kwargs)
+
+            if collector is not None:
+                collector._end(token, "from_url", cls.__name__, "cache")
+
+            return obj
+
         if session is None:
             import requests
 
@@ -439,13 +1900,84 @@ class LockedXmlTraits(LockedDownTraits):
 
         resp = session.get(url, **kwargs)
 
-        # We have to set this to get requests/Python to ignore the Unicode
-        # Byte Order Marker (BOM) that is present in some WWT data files due
-        # to their Windows origin, when we decode the response into text.
-        resp.encoding = "utf-8-sig"
+        # Some WWT data files start with a Unicode Byte Order Marker (BOM) due
+        # to their Windows origin; from_bytes() takes care of that.
+        data = resp.content
+        obj = cls.from_bytes(data, lazy=lazy)
+
+        if collector is not None:
+            collector._end(
+                token,
+                "from_url",
+                cls.__name__,
+                "download",
+                bytes_read=len(data),
+            )
+
+        return obj
+
+    @classmethod
+    async def from_url_async(cls, url, session=None, lazy=False, **kwargs):
+        """Asynchronously deserialize an instance of this class from XML
+        downloaded from the specified URL.
+
+        Parameters
+        ----------
+        url : string
+            The URL from which to download the XML.
+        session : :class:`aiohttp.ClientSession` or None (the default)
+            The HTTP communications session to use. If None, a temporary
+            session is created with :func:`open_async_session`.
+        lazy : optional bool, default False
+            Whether to defer deserialization of list items; see :meth:`from_xml`.
+        kwargs
+            Extra arguments to pass to :meth:`aiohttp.ClientSession.get`.
+
+        Returns
+        -------
+        An instance of the class, initialized with data from the XML.
+
+        Notes
+        -----
+        This is a coroutine and requires the optional ``aiohttp`` package.
+        When fetching many documents, pass a shared session so that
+        connections are pooled and reused.
+
+        """
+        if session is None:
+            async with open_async_session() as session:
+                return await cls.from_url_async(
+                    url, session=session, lazy=lazy, **kwargs
+                )
+
+        async with session.get(url, **kwargs) as resp:
+            data = await resp.read()
+
+        return cls.from_bytes(data, lazy=lazy)
+
+    def __reduce__(self):
+        # The default HasTraits pickling stores the whole instance dictionary,
+        # including the traitlets bookkeeping. We only need the values of the
+        # XML-serialized traits, in plan order, plus the runtime metadata.
+        trait_values = self._trait_values
+        values = []
+
+        for step in self._xml_plan:
+            # Avoid the traitlets descriptor machinery if we can.
+            value = trait_values.get(step.name, _NOT_SET)
+            if value is _NOT_SET:
+                value = getattr(self, step.name)
+
+            if isinstance(value, _LazyXmlList):
+                value = list(value)
+
+            values.append(value)
+
+        rmeta = self.rmeta
+        if not rmeta.__dict__:
+            rmeta = None
 
-        elem = etree.fromstring(resp.text)
-        return cls.from_xml(elem)
+        return (_unpickle_xml_traits, (self.__class__, tuple(values), rmeta))
 
     def _serialize_xml(self, elem):
         """Do the work of serializing this thing to XML.
@@ -476,119 +2008,111 @@ class LockedXmlTraits(LockedDownTraits):
         XML serialization.
 
         """
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
+
         if elem is None:
-            elem = etree.Element(self._tag_name())
+            elem = _new_xml_element(self._tag_name())
+        else:
+            st = self._xml_state
 
-        # Note that self.traits() generates the traits in alphabetical order,
-        # which is helpful because that means when we serialize to XML the
-        # child elements are created in a deterministic order, which makes it
-        # easier to test the output.
+            if st is not None and elem is st.elem:
+                if st.subtree_dirty:
+                    self._apply_xml_changes(st)
 
-        for tname, tspec in self.traits(xml=lambda a: a is not None).items():
-            xml_spec, *xml_data = tspec.metadata["xml"]
-            even_if_empty = tspec.metadata.get("xml_even_if_empty", False)
-            value = getattr(self, tname)
+                if collector is not None:
+                    collector._end(
+                        token, "serialize", self.__class__.__name__, "incremental"
+                    )
 
-            if value is None:
-                continue
+                return elem
 
-            sky_type_filter = tspec.metadata.get("xml_if_sky_type_is")
-            if sky_type_filter is not None:
-                from .enums import DataSetType
+        # Note that the serialization plan is sorted by trait name, which is
+        # helpful because that means when we serialize to XML the child
+        # elements are created in a deterministic order, which makes it easier
+        # to test the output.
+        self._write_xml_steps(elem, self._xml_plan)
 
-                cmp = self.data_set_type == DataSetType.SKY
-                if sky_type_filter != cmp:
-                    continue
+        if collector is not None:
+            collector._end(token, "serialize", self.__class__.__name__, "full")
 
-            if xml_spec == XmlSer.ATTRIBUTE:
-                text = _stringify_trait(tspec, value)
-                if not text and not even_if_empty:
-                    continue
+        return elem
 
-                elem.set(xml_data[0], text)
-            elif xml_spec == XmlSer.TEXT_ELEM:
-                text = _stringify_trait(tspec, value)
-                if not text and not even_if_empty:
-                    continue
+    def _apply_xml_changes(self, st):
+        """Update the source element of a change-tracked object, touching only
+        the traits that have been modified and the subtrees that contain
+        modifications."""
 
-                sub = elem.find(xml_data[0])
-                if sub is None:
-                    sub = etree.SubElement(elem, xml_data[0])
-
-                sub.text = text
-            elif xml_spec == XmlSer.INNER:
-                cur_sub = elem.find(xml_data[0])
-                new_sub = value._serialize_xml(cur_sub)
-                if cur_sub is None:
-                    elem.append(new_sub)
-            elif xml_spec == XmlSer.WRAPPED_INNER:
-                wrapper = elem.find(xml_data[0])
-                if wrapper is None:
-                    wrapper = etree.SubElement(elem, xml_data[0])
-
-                if len(wrapper):
-                    value._serialize_xml(wrapper[0])
-                else:
-                    new_sub = value._serialize_xml(None)
-                    wrapper.append(new_sub)
-            elif xml_spec == XmlSer.NS_TO_ATTR:
-                for ns_name, ns_value in value.__dict__.items():
-                    elem.set(xml_data[0] + ns_name, str(ns_value))
-            elif xml_spec == XmlSer.INNER_LIST:
-                # This is gross. If the list of children gets mutated, in the
-                # current framework we basically have no way to know what
-                # pre-existing XML elements map to our children. The best I
-                # can come up with is that we try to enforce the invariant
-                # that the list of children cannot get mutated.
-                preexisting = bool(len(elem))
-
-                if preexisting and len(elem) != len(value):
-                    raise RuntimeError(
-                        "serializing flexible list to existing XML data, "
-                        "but it looks like something changed beneath us"
-                    )
+        dirty = st.dirty
 
-                for idx, child in enumerate(value):
-                    if preexisting:
-                        if elem[idx].tag != child._tag_name():
-                            raise RuntimeError(
-                                "serializing flexible list to existing XML data, "
-                                f"but it looks like child #{idx} changed"
-                            )
-                        child._serialize_xml(elem[idx])
-                    else:
-                        new_sub = child._serialize_xml(None)
-                        elem.append(new_sub)
-            elif xml_spec == XmlSer.WRAPPED_INNER_LIST:
-                wrapper = elem.find(xml_data[0])
-
-                if wrapper is None:
-                    preexisting = False
-                    wrapper = etree.SubElement(elem, xml_data[0])
-                else:
-                    preexisting = True
+        # If the data set type changes, traits filtered with
+        # `xml_if_sky_type_is` may switch on or off.
+        if "data_set_type" in dirty:
+            steps = self._xml_plan
+            dirty.update(
+                step.name for step in steps if step.sky_type_filter is not None
+            )
+        else:
+            steps = [
+                step
+                for step in self._xml_plan
+                if step.name in dirty or step.mode in _NESTED_MODES
+            ]
 
-                    if len(wrapper) != len(value):
-                        raise RuntimeError(
-                            "serializing flexible list to existing XML data, "
-                            "but it looks like something changed beneath us"
-                        )
+        self._write_xml_steps(st.elem, steps, dirty)
 
-                for idx, child in enumerate(value):
-                    if preexisting:
-                        if wrapper[idx].tag != child._tag_name():
-                            raise RuntimeError(
-                                "serializing flexible list to existing XML data, "
-                                f"but it looks like child #{idx} changed"
-                            )
-                        child._serialize_xml(wrapper[idx])
-                    else:
-                        new_sub = child._serialize_xml(None)
-                        wrapper.append(new_sub)
-            else:
-                raise RuntimeError(f"unhandled XML serialization mode {xml_spec}")
+        # Modified nested values may contain new objects and elements.
+        for step in steps:
+            if step.name in dirty and step.mode in _TRACKED_MODES:
+                _track_xml_step(self, st, step)
 
-        return elem
+        dirty.clear()
+        st.subtree_dirty = st.pinned
+
+    def _write_xml_steps(self, elem, steps, dirty=None):
+        """Write the XML for some of the steps of the serialization plan.
+
+        If *dirty* is not None, it is a set of the names of traits that have
+        been modified since *elem* was last updated. If any of those traits
+        should now be omitted from the serialization, their existing XML is
+        removed.
+
+        """
+        is_sky = None
+
+        for step in steps:
+            value = getattr(self, step.name)
+            clear = dirty is not None and step.name in dirty
+
+            if value is None:
+                if clear:
+                    _xml_clear_step(step, elem)
+                continue
+
+            if step.sky_type_filter is not None:
+                if is_sky is None:
+                    from .enums import DataSetType
+
+                    is_sky = self.data_set_type == DataSetType.SKY
+
+                if step.sky_type_filter != is_sky:
+                    if clear:
+                        _xml_clear_step(step, elem)
+                    continue
+
+            if clear:
+                if step.mode == XmlSer.NS_TO_ATTR:
+                    _xml_clear_step(step, elem)
+                elif (
+                    step.mode in (XmlSer.ATTRIBUTE, XmlSer.TEXT_ELEM)
+                    and not step.even_if_empty
+                    and not step.stringify(value)
+                ):
+                    _xml_clear_step(step, elem)
+                    continue
+
+            step.write(step, elem, value)
 
     def apply_to_xml(self, elem):
         """Serialize the data of this object to an existing XML tree
@@ -609,6 +2133,11 @@ class LockedXmlTraits(LockedDownTraits):
         additional contents not defined in the WWT specification -- by
         modifying the existing tree, we can preserve those data.
 
+        If this object was created with ``from_xml(elem, track_changes=True)``,
+        and *elem* is the element that it was created from, only the parts of
+        the tree corresponding to data that have been modified since
+        deserialization (or the previous call to this method) are updated.
+
         """
         self._serialize_xml(elem)
         return self
@@ -644,6 +2173,20 @@ class LockedXmlTraits(LockedDownTraits):
         None
 
         """
+        cache = self._xml_cache
+
+        if cache is not None and cache.serialize:
+            if dest_stream is None:
+                import sys
+
+                dest_stream = sys.stdout
+
+            if not dest_wants_bytes:
+                dest_stream = dest_stream.buffer
+
+            dest_stream.write(self._cached_xml_doc(indent))
+            return
+
         write_xml_doc(
             self.to_xml(),
             dest_stream=dest_stream,
@@ -665,8 +2208,193 @@ class LockedXmlTraits(LockedDownTraits):
           A textual serialization of the object as XML.
 
         """
+        cache = self._xml_cache
+
+        if cache is not None and cache.serialize:
+            return self._cached_xml_doc(indent).decode("utf-8")
+
         return stringify_xml_doc(self.to_xml(), indent=indent)
 
+    def _cached_xml_doc(self, indent):
+        data, has_subelements = _cached_xml_fragment(self, indent, 0)
+
+        # indent_xml() adds a final newline after a root that has children.
+        if indent and has_subelements:
+            return _XML_DECLARATION + data + b"\n"
+
+        return _XML_DECLARATION + data
+
+    def enable_xml_cache(self):
+        """Cache the XML serialization of this object and its descendants.
+
+        Returns
+        -------
+        *self*
+
+        Notes
+        -----
+        Once caching is enabled, :meth:`to_xml_string` and :meth:`write_xml`
+        save the UTF-8 serialization of this object and of every object that
+        it contains. Modifying any of these objects, including in-place
+        modifications of lists and namespaces like
+        :attr:`~wwt_data_formats.folder.Folder.children`, invalidates its
+        saved serialization and those of the objects that contain it. The
+        serializations of folders are assembled from those of their
+        children, so that reserializing a large, mostly-unchanged tree only
+        costs as much as reserializing the objects that have changed. The
+        output is identical to the uncached output.
+
+        The cost of caching is memory: the serialized data of each object are
+        retained, once for each indentation setting that is used.
+
+        """
+        _ensure_xml_cache(self, None).serialize = True
+
+        # Lazy lists must know their owner to link in the items that they
+        # load.
+        for step in self._xml_container_steps.values():
+            value = getattr(self, step.name)
+
+            if value is not None:
+                _wrap_xml_container(self, step, value)
+
+        return self
+
+    def disable_xml_cache(self):
+        """Stop caching the XML serialization of this object and its
+        descendants, and discard any cached data.
+
+        Returns
+        -------
+        *self*
+
+        """
+        todo = [self]
+
+        while todo:
+            obj = todo.pop()
+
+            if obj._xml_cache is None:
+                continue
+
+            obj._xml_cache = None
+
+            for step in obj._xml_tracked_steps:
+                value = getattr(obj, step.name)
+
+                if step.mode in (XmlSer.INNER, XmlSer.WRAPPED_INNER):
+                    if value is not None:
+                        todo.append(value)
+                elif step.mode != XmlSer.NS_TO_ATTR:
+                    if isinstance(value, _LazyXmlList):
+                        value = value._items
+
+                    todo.extend(v for v in value if not isinstance(v, _LazyXmlItem))
+
+        return self
+
+    def fingerprint(self):
+        """Compute a fingerprint of the content of this object.
+
+        Returns
+        -------
+        A string of 32 hexadecimal digits.
+
+        Notes
+        -----
+        The fingerprint is a hash of the values of the traits that are
+        serialized to XML, in a canonical encoding that does not depend on how
+        the object would be formatted as XML. Two objects of the same class
+        have the same fingerprint if and only if (barring hash collisions)
+        they have the same content, including the content of any objects
+        that they contain. Runtime metadata (``rmeta``) are not included.
+        Traits that have their default values do not contribute to the hash,
+        so that fingerprints remain stable if new traits are added to a class.
+
+        Fingerprints are cached. Modifying an object, including through
+        in-place modifications of its lists and namespaces, invalidates its
+        saved fingerprint and those of the objects that contain it, so that
+        refingerprinting a large, mostly-unchanged tree is cheap.
+
+        """
+        return _fingerprint_digest(self).hex()
+
+    def content_equals(self, other):
+        """Test whether another object has the same content as this one.
+
+        Parameters
+        ----------
+        other : any value
+          The object to compare to.
+
+        Returns
+        -------
+        True if *other* is a :class:`LockedXmlTraits` instance with the same
+        :meth:`fingerprint` as this object, False otherwise.
+
+        Notes
+        -----
+        The ``==`` operator is not overridden, and compares object identity,
+        since traitlets relies on it to detect trait value changes.
+
+        """
+        if other is self:
+            return True
+        if not isinstance(other, LockedXmlTraits):
+            return False
+        return _fingerprint_digest(self) == _fingerprint_digest(other)
+
+    def content_hash(self):
+        """Get a hash value for this object based on its content.
+
+        Returns
+        -------
+        An integer derived from :meth:`fingerprint`, consistent with
+        :meth:`content_equals`.
+
+        Notes
+        -----
+        The builtin ``hash()`` of an object is not overridden, because these
+        objects are mutable. Use this method, or the fingerprint itself, as a
+        key when deduplicating objects whose content will not change.
+
+        """
+        return int.from_bytes(_fingerprint_digest(self)[:8], "little", signed=True)
+
+    def clone(self):
+        """Make a deep copy of this object.
+
+        Returns
+        -------
+        A new instance of this class with the same data. Nested objects, such
+        as the children of a folder, are cloned as well, and the ``xmeta`` and
+        ``rmeta`` namespaces are copied, so that the clone can be modified
+        without affecting the original.
+
+        Notes
+        -----
+        Trait values are copied directly, which is much faster than
+        :func:`copy.deepcopy` or a round trip through XML. The clone does not
+        track changes (see :meth:`from_xml`) and has no serialization cache
+        (see :meth:`enable_xml_cache`). List items that have not yet been
+        loaded from a lazily deserialized document remain unloaded in the
+        clone.
+
+        """
+        inst = self.__class__()
+        trait_values = inst._trait_values
+
+        # The values were validated when they were set on this object, so we
+        # don't need to pass them through traitlets again.
+        for name, value in self._trait_values.items():
+            if name == "rmeta":
+                if vars(value):
+                    trait_values[name] = deepcopy(value)
+            else:
+                trait_values[name] = _clone_value(value)
+
+        return inst
+
 
 def indent_xml(elem, level=0):
     """A dumb XML indenter.
@@ -678,6 +2406,17 @@ def indent_xml(elem, level=0):
     and implements basic, sensible indentation using "tail" text.
 
     """
+    collector = _instrument._collector
+
+    if collector is None:
+        _indent_xml(elem, level)
+    else:
+        token = collector._begin()
+        _indent_xml(elem, level)
+        collector._end(token, "indent_xml", str(elem.tag), "stdlib")
+
+
+def _indent_xml(elem, level):
     i = "\n" + level * "  "
 
     if len(elem):
@@ -686,7 +2425,7 @@ def indent_xml(elem, level=0):
         if not elem.tail or not elem.tail.strip():
             elem.tail = i
         for elem in elem:  # intentionally updating "elem" here!
-            indent_xml(elem, level + 1)
+            _indent_xml(elem, level + 1)
         if not elem.tail or not elem.tail.strip():
             elem.tail = i
     else:
@@ -713,11 +2452,12 @@ def write_xml_doc(root_element, indent=True, dest_stream=None, dest_wants_bytes=
 
         dest_stream = sys.stdout
 
-    if indent:
+    if _is_lxml_element(root_element):
+        if indent:
+            _indent_lxml(root_element)
+    elif indent:
         indent_xml(root_element)
 
-    doc = etree.ElementTree(root_element)
-
     # If the dest stream accepts text, one can serialize XML into it using
     # `encoding = "Unicode"`. But it turns out that in this mode, ETree sets the
     # XML encoding declaration to what `locale.getpreferredencoding()` returns,
@@ -733,7 +2473,85 @@ def write_xml_doc(root_element, indent=True, dest_stream=None, dest_wants_bytes=
                 "underlying bytes I/O can be retrieved"
             ) from e
 
-    doc.write(dest_stream, encoding="UTF-8", xml_declaration=True)
+    if _is_lxml_element(root_element):
+        dest_stream.write(_stringify_lxml(root_element))
+    else:
+        doc = etree.ElementTree(root_element)
+        doc.write(dest_stream, encoding="UTF-8", xml_declaration=True)
+
+
+def _indent_lxml(root_element):
+    """Indent an lxml tree exactly as :func:`indent_xml` would, using lxml's
+    C-level implementation."""
+    from lxml import etree as lxml_etree
+
+    collector = _instrument._collector
+    if collector is not None:
+        token = collector._begin()
+
+    lxml_etree.indent(root_element, space="  ")
+
+    # indent_xml() also terminates a root element that has children with a
+    # newline.
+    if len(root_element) and (not root_element.tail or not root_element.tail.strip()):
+        root_element.tail = "\n"
+
+    if collector is not None:
+        collector._end(token, "indent_xml", str(root_element.tag), "lxml")
+
+
+def _stringify_lxml(root_element):
+    """Serialize an lxml tree into the exact bytes that ElementTree would
+    produce."""
+    from lxml import etree as lxml_etree
+
+    data = lxml_etree.tostring(root_element, encoding="UTF-8", xml_declaration=True)
+    return _normalize_lxml_output(data)
+
+
+_LXML_TEXT_CR_RE = re.compile(rb">[^<]*&#13;[^<]*<")
+
+
+def _normalize_lxml_output(data):
+    """Convert bytes serialized by lxml into the ones that ElementTree would
+    produce for the same tree."""
+
+    # The two libraries only differ in the formatting of empty elements, tab
+    # characters in attributes, and carriage returns in text, which lxml
+    # escapes and ElementTree doesn't. Because both backends strip comments
+    # and processing instructions, and both escape ">" in text and attribute
+    # values, "/>" can only occur as the end of an empty element tag, and
+    # text is exactly what lies between a ">" and the next "<".
+    data = data.replace(b"/>", b" />").replace(b"&#9;", b"&#09;")
+
+    if b"&#13;" in data:
+        data = _LXML_TEXT_CR_RE.sub(lambda m: m.group(0).replace(b"&#13;", b"\r"), data)
+
+    return data
+
+
+def _stringify_xml_fragment(elem, indent=True, level=0):
+    """Serialize an XML element, without any XML declaration or tail text,
+    into the exact UTF-8 bytes that :func:`write_xml_doc` would produce for it
+    if it were found at the specified nesting level of a document.
+
+    When *indent* is true, this function modifies *elem*.
+
+    """
+    if _is_lxml_element(elem):
+        from lxml import etree as lxml_etree
+
+        if indent:
+            lxml_etree.indent(elem, space="  ", level=level)
+
+        data = lxml_etree.tostring(elem, encoding="UTF-8", with_tail=False)
+        return _normalize_lxml_output(data)
+
+    if indent:
+        indent_xml(elem, level=level)
+
+    elem.tail = None
+    return etree.tostring(elem, encoding="utf-8")
 
 
 def stringify_xml_doc(root_element, indent=True):
@@ -0,0 +1,98 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+"""
+Parsing large numbers of WTML files in parallel.
+
+Deserializing XML is CPU-bound, so batch jobs that load many files can be
+sped up by spreading the work over several processes. The parsed objects are
+sent back to the parent process with pickle; the
+:class:`~wwt_data_formats.LockedXmlTraits` classes implement a compact pickle
+representation to keep that transfer cheap.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__all__ = """
+parse_files
+""".split()
+
+import os
+
+
+def _parse_one(cls, path, encoding):
+    return cls.from_file(path, encoding=encoding)
+
+
+def parse_files(paths, workers=None, cls=None, ordered=True, encoding="utf-8-sig"):
+    """Parse many XML files using a pool of worker processes.
+
+    Parameters
+    ----------
+    paths : iterable of strings
+        The paths of the files to parse.
+    workers : optional int
+        The number of worker processes to use. If unspecified, the number of
+        CPUs on the system is used. If 1, the files are parsed serially in the
+        current process.
+    cls : optional class
+        The class to deserialize the files into. This may be any class with a
+        ``from_file`` class method, including the classes of
+        :mod:`wwt_data_formats.records`. The default is
+        :class:`~wwt_data_formats.folder.Folder`.
+    ordered : optional bool, default True
+        If true, results are yielded in the same order as *paths*. Otherwise,
+        they are yielded as soon as they become available.
+    encoding : optional string, default "utf-8-sig"
+        The encoding of the file text.
+
+    Returns
+    -------
+    A generator of tuples of ``(path, obj)``, where ``obj`` is the object
+    deserialized from the file at ``path``.
+
+    Notes
+    -----
+    If parsing a file raises an exception, it is re-raised when the
+    corresponding result is reached. The worker pool is shut down when the
+    generator is exhausted or closed.
+
+    """
+    if cls is None:
+        from .folder import Folder as cls
+
+    paths = list(paths)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 2 or len(paths) < 2:
+        for path in paths:
+            yield (path, _parse_one(cls, path, encoding))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            # Batch up the work to amortize the IPC overhead for small files.
+            chunksize = max(1, len(paths) // (4 * workers))
+            results = executor.map(
+                _parse_one,
+                [cls] * len(paths),
+                paths,
+                [encoding] * len(paths),
+                chunksize=chunksize,
+            )
+
+            for path, obj in zip(paths, results):
+                yield (path, obj)
+        else:
+            futures = dict(
+                (executor.submit(_parse_one, cls, path, encoding), path)
+                for path in paths
+            )
+
+            for future in as_completed(futures):
+                yield (futures[future], future.result())
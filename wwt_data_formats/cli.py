@@ -296,12 +296,34 @@ def tree_getparser(parser):
     subparsers = parser.add_subparsers(dest="tree_command")
 
     p = subparsers.add_parser("fetch")
+    p.add_argument(
+        "--jobs",
+        "-j",
+        metavar="N",
+        type=int,
+        default=1,
+        help="The number of folders to download at once (default: %(default)s).",
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only download the folders that have changed since the previous "
+        "incremental fetch, and resume interrupted ones. This keeps the files "
+        "fetch-manifest.json and .fetch-staging in the current directory.",
+    )
     p.add_argument(
         "root_url",
         metavar="URL",
         help="The URL of the initial WTML file to download.",
     )
 
+    p = subparsers.add_parser("index")
+    p.add_argument(
+        "--full",
+        action="store_true",
+        help="Reindex every folder file, not just the ones that have changed.",
+    )
+
     p = subparsers.add_parser("print-dem-urls")
     p = subparsers.add_parser("print-image-urls")
     p = subparsers.add_parser("summarize")
@@ -314,6 +336,8 @@ def tree_impl(settings):
 
     if settings.tree_command == "fetch":
         return tree_fetch(settings)
+    elif settings.tree_command == "index":
+        return tree_index(settings)
     elif settings.tree_command == "print-dem-urls":
         return tree_print_dem_urls(settings)
     elif settings.tree_command == "print-image-urls":
@@ -330,24 +354,82 @@ def tree_fetch(settings):
     def on_fetch(url):
         print("Fetching", url, "...")
 
-    fetch_folder_tree(settings.root_url, ".", on_fetch)
+    counts = fetch_folder_tree(
+        settings.root_url,
+        ".",
+        on_fetch,
+        max_workers=settings.jobs,
+        incremental=settings.incremental,
+    )
+    print(
+        f"{counts['fetched']} fetched, {counts['unchanged']} unchanged, "
+        f"{counts['resumed']} resumed, {counts['failed']} failed"
+    )
 
 
-def tree_print_dem_urls(settings):
-    from .folder import Folder, walk_cached_folder_tree
-    from .imageset import ImageSet
-    from .place import Place
+def tree_index(settings):
+    from .treeindex import TreeIndex
 
-    done_urls = set()
+    with TreeIndex(".") as index:
+        counts = index.update(full=settings.full)
+
+    print(
+        f"{counts['parsed']} indexed, {counts['unchanged']} unchanged, "
+        f"{counts['removed']} removed"
+    )
+
+
+def _walk_cached_tree():
+    """Walk the cached folder tree in the current directory.
+
+    If the tree has been indexed with ``tree index``, the index is brought up
+    to date and used. Generates tuples of ``(treepath, kind, name, imgset)``,
+    where ``kind`` is ``"Folder"``, ``"Place"``, or ``"ImageSet"`` and
+    ``imgset``, if not None, is the imageset of the item, with attributes
+    ``name``, ``url``, ``alt_url``, and ``dem_url``.
+    """
+    from collections import namedtuple
+    from .records import FolderRecord, ImageSetRecord, PlaceRecord
+    from .treeindex import DEFAULT_INDEX_NAME, TreeIndex
+
+    if os.path.exists(DEFAULT_INDEX_NAME):
+        PlaceImageSet = namedtuple("PlaceImageSet", "name url alt_url dem_url")
+
+        with TreeIndex(".") as index:
+            index.update()
+
+            for treepath, entry in index.walk():
+                imgset = None
+
+                if entry.kind == "ImageSet":
+                    imgset = entry
+                elif entry.imageset_name is not None:
+                    imgset = PlaceImageSet(
+                        entry.imageset_name,
+                        entry.imageset_url,
+                        entry.imageset_alt_url,
+                        entry.imageset_dem_url,
+                    )
+
+                yield treepath, entry.kind, entry.name, imgset
+
+        return
 
-    for treepath, item in walk_cached_folder_tree("."):
-        imgset = None
+    from .folder import walk_cached_folder_tree
 
-        if isinstance(item, ImageSet):
-            imgset = item
-        elif isinstance(item, Place):
-            imgset = item.as_imageset()
+    for treepath, item in walk_cached_folder_tree(".", records=True):
+        if isinstance(item, FolderRecord):
+            yield treepath, "Folder", item.name, None
+        elif isinstance(item, ImageSetRecord):
+            yield treepath, "ImageSet", item.name, item
+        elif isinstance(item, PlaceRecord):
+            yield treepath, "Place", item.name, item.as_imageset()
 
+
+def tree_print_dem_urls(settings):
+    done_urls = set()
+
+    for treepath, kind, name, imgset in _walk_cached_tree():
         if imgset is None:
             continue
 
@@ -359,20 +441,9 @@ def tree_print_dem_urls(settings):
 
 
 def tree_print_image_urls(settings):
-    from .folder import Folder, walk_cached_folder_tree
-    from .imageset import ImageSet
-    from .place import Place
-
     done_urls = set()
 
-    for treepath, item in walk_cached_folder_tree("."):
-        imgset = None
-
-        if isinstance(item, ImageSet):
-            imgset = item
-        elif isinstance(item, Place):
-            imgset = item.as_imageset()
-
+    for treepath, kind, name, imgset in _walk_cached_tree():
         if imgset is None:
             continue
 
@@ -385,29 +456,17 @@ def tree_print_image_urls(settings):
 
 
 def tree_summarize(settings):
-    from .folder import Folder, walk_cached_folder_tree
-    from .imageset import ImageSet
-    from .place import Place
-
-    for treepath, item in walk_cached_folder_tree("."):
+    for treepath, kind, name, imgset in _walk_cached_tree():
         pfx = "  " * len(treepath)
 
-        if isinstance(item, Folder):
-            print(pfx + "Folder", item.name)
-        elif isinstance(item, ImageSet):
+        if kind == "Folder":
+            print(pfx + "Folder", name)
+        elif kind == "ImageSet":
             index = treepath[-1]
-            print(f"{pfx}{index:03d}", "ImageSet:", item.name, "@", item.url)
-        elif isinstance(item, Place):
-            maybe_imgset = item.as_imageset()
-            if maybe_imgset is not None:
-                index = treepath[-1]
-                print(
-                    f"{pfx}{index:03d}",
-                    "Place+ImgSet:",
-                    item.name,
-                    "@",
-                    maybe_imgset.url,
-                )
+            print(f"{pfx}{index:03d}", "ImageSet:", name, "@", imgset.url)
+        elif imgset is not None:
+            index = treepath[-1]
+            print(f"{pfx}{index:03d}", "Place+ImgSet:", name, "@", imgset.url)
 
 
 # "wtml" subcommand
@@ -416,6 +475,18 @@ def tree_summarize(settings):
 def wtml_getparser(parser):
     subparsers = parser.add_subparsers(dest="wtml_command")
 
+    p = subparsers.add_parser("diff")
+    p.add_argument(
+        "old_path",
+        metavar="OLD-WTML",
+        help="The path to the original WTML file.",
+    )
+    p.add_argument(
+        "new_path",
+        metavar="NEW-WTML",
+        help="The path to the modified WTML file.",
+    )
+
     p = subparsers.add_parser("merge")
     p.add_argument(
         "--merged-name",
@@ -521,7 +592,9 @@ def wtml_impl(settings):
         print('Run the "wtml" command with `--help` for help on its subcommands')
         return
 
-    if settings.wtml_command == "merge":
+    if settings.wtml_command == "diff":
+        return wtml_diff(settings)
+    elif settings.wtml_command == "merge":
         return wtml_merge(settings)
     elif settings.wtml_command == "register-images":
         return wtml_register_images(settings)
@@ -537,6 +610,46 @@ def wtml_impl(settings):
         die('unrecognized "wtml" subcommand ' + settings.wtml_command)
 
 
+def wtml_diff(settings):
+    from enum import Enum
+    from . import LockedXmlTraits
+    from .folder import Folder
+
+    def describe(item):
+        kind = type(item).__name__
+        name = getattr(item, "name", "")
+        return f"{kind} {name!r}" if name else kind
+
+    def fmt(value):
+        if isinstance(value, Enum):
+            return value.name
+        if isinstance(value, LockedXmlTraits):
+            return describe(value)
+        return repr(value)
+
+    old = Folder.from_file(settings.old_path)
+    new = Folder.from_file(settings.new_path)
+    counts = {"added": 0, "removed": 0, "modified": 0}
+    symbols = {"added": "+", "removed": "-", "modified": "~"}
+
+    for entry in old.diff(new):
+        counts[entry.kind] += 1
+        item = entry.old if entry.new is None else entry.new
+        print(
+            symbols[entry.kind],
+            type(item).__name__,
+            "/".join(entry.path) or "(top folder)",
+        )
+
+        for trait, old_value, new_value in entry.changes:
+            print(f"    {trait}: {fmt(old_value)} -> {fmt(new_value)}")
+
+    print(
+        f"{counts['added']} added, {counts['removed']} removed, "
+        f"{counts['modified']} modified"
+    )
+
+
 def wtml_merge(settings):
     from urllib.parse import urljoin, urlsplit
     from .folder import Folder
@@ -569,7 +682,7 @@ def wtml_merge(settings):
             return rel.replace(os.path.sep, "/")
 
         in_folder.mutate_urls(mutator)
-        out_folder.children += in_folder.children
+        out_folder.extend_children(in_folder.children)
 
     with open(settings.out_path, "wt", encoding="utf8") as f_out:
         out_folder.write_xml(f_out)
@@ -821,9 +934,11 @@ def wtml_rewrite_urls(settings):
 
 
 def wtml_transfer_astrometry(settings):
+    from . import _parse_xml_stream, write_xml_doc
     from .folder import Folder
     from .imageset import ImageSet
     from .place import Place
+    from .records import FolderRecord, ImageSetRecord, PlaceRecord
 
     # Tables of preferred entries ...
 
@@ -911,14 +1026,15 @@ def wtml_transfer_astrometry(settings):
         n_updates += update_imageset(place.foreground_image_set)
         return n_updates
 
-    # Load up the preferred data
+    # Load up the preferred data. We only read from these, so we can use the
+    # lightweight record classes.
 
-    in_folder = Folder.from_file(settings.in_path)
+    in_folder = FolderRecord.from_file(settings.in_path)
 
-    for depth, path, item in in_folder.walk(download=False):
-        if isinstance(item, Place):
+    for depth, path, item in in_folder.walk():
+        if isinstance(item, PlaceRecord):
             add_place(item)
-        elif isinstance(item, ImageSet):
+        elif isinstance(item, ImageSetRecord):
             add_imageset(item)
 
     # Now update everything
@@ -926,7 +1042,12 @@ def wtml_transfer_astrometry(settings):
     n_updated_files = 0
 
     for update_path in settings.update_paths:
-        folder = Folder.from_file(update_path)
+        # We apply the updates to the original XML tree, with change tracking,
+        # so that only the modified items are rewritten.
+        with open(update_path, "rb") as f_in:
+            elem = _parse_xml_stream(f_in)
+
+        folder = Folder.from_xml(elem, track_changes=True)
         n_updates = 0
 
         for depth, path, item in folder.walk(download=False):
@@ -940,8 +1061,10 @@ def wtml_transfer_astrometry(settings):
         if n_updates > 0:
             n_updated_files += 1
 
+            folder.apply_to_xml(elem)
+
             with open(update_path, "wt", encoding="utf8") as f_out:
-                folder.write_xml(f_out)
+                write_xml_doc(elem, dest_stream=f_out)
 
     print()
     print("Updated %d WTML files." % n_updated_files)
@@ -12,7 +12,7 @@ FileCabinetWriter
 from collections import namedtuple, OrderedDict
 from xml.etree import ElementTree as etree
 
-from . import stringify_xml_doc
+from . import _parse_xml_bytes, instrument as _instrument, stringify_xml_doc
 
 ReaderFileInfo = namedtuple('ReaderFileInfo', 'name offset size')
 
@@ -29,6 +29,10 @@ class FileCabinetReader(object):
     _files = None
 
     def __init__(self, stream):
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
+
         self._stream = stream
         self._files = {}
 
@@ -53,7 +57,7 @@ class FileCabinetReader(object):
 
         stream.seek(0)
         header = stream.read(header_size)
-        header_doc = etree.fromstring(header)
+        header_doc = _parse_xml_bytes(header)
 
         for file in header_doc.find('Files').iterfind('File'):
             name = file.get('Name')
@@ -76,6 +80,10 @@ class FileCabinetReader(object):
 
             self._files[name] = ReaderFileInfo(name, header_size + rel_offset, size)
 
+        if collector is not None:
+            collector._end(token, 'open', self.__class__.__name__, '',
+                           bytes_read=256 + header_size)
+
 
     def close(self):
         """Close the underlying stream, making this object essentially unusable."""
@@ -100,8 +108,18 @@ class FileCabinetReader(object):
         if info is None:
             raise Exception('no such file "{}" in FileCabinet'.format(filename))
 
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
+
         self._stream.seek(info.offset)
-        return self._stream.read(info.size)
+        data = self._stream.read(info.size)
+
+        if collector is not None:
+            collector._end(token, 'read', self.__class__.__name__, '',
+                           bytes_read=len(data))
+
+        return data
 
 
 WriterFileInfo = namedtuple('WriterFileInfo', 'name size contents')
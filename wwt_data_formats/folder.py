@@ -6,21 +6,47 @@ from __future__ import absolute_import, division, print_function
 
 __all__ = """
 Folder
+FolderIndex
+FolderStreamWriter
 fetch_folder_tree
+fetch_folder_tree_async
 make_absolutizing_url_mutator
 make_filesystem_url_mutator
 walk_cached_folder_tree
 """.split()
 
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import hashlib
+import json
 import os.path
 import re
 import requests
-from traitlets import Bool, Instance, Int, List, Unicode, Union, UseEnum
-from xml.etree import ElementTree as etree
-
-from . import LockedXmlTraits, XmlSer
+import shutil
+import threading
+from traitlets import Bool, Instance, Int, List, TraitError, Unicode, Union, UseEnum
+
+from . import (
+    DEFAULT_ASYNC_CONNECTION_LIMIT,
+    DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    instrument as _instrument,
+    LockedXmlTraits,
+    XmlSer,
+    _fetch_text_async,
+    _iterparse_xml,
+    _parse_xml_bytes,
+    _parse_xml_text,
+    _parse_context,
+    _stringify_xml_fragment,
+    open_async_session,
+    open_session,
+)
 from .abcs import UrlContainer
 from .enums import FolderType
+from .snapshot import read_snapshot, write_snapshot
+
+DiffEntry = namedtuple("DiffEntry", "kind path old new changes")
 
 
 class Folder(LockedXmlTraits, UrlContainer):
@@ -69,21 +95,245 @@ class Folder(LockedXmlTraits, UrlContainer):
     def _tag_name(self):
         return "Folder"
 
-    def walk(self, download=False):
-        yield (0, (), self)
+    @classmethod
+    def iter_children_from_stream(cls, stream, trusted=False):
+        """Incrementally deserialize the children of a folder from an XML
+        stream.
 
-        for index, child in enumerate(self.children):
-            if isinstance(child, Folder):
-                if not len(child.children) and child.url and download:
-                    url = child.url
-                    child = Folder.from_url(url)
-                    child.url = url
-                    self.children[index] = child
-
-                for depth, path, subchild in child.walk(download=download):
-                    yield (depth + 1, (index,) + path, subchild)
-            else:
-                yield (1, (index,), child)
+        Parameters
+        ----------
+        stream : readable, bytes-based file-like object
+            The source of the XML data.
+        trusted : optional bool, default False
+            Whether to skip validation of the deserialized data; see
+            :meth:`~wwt_data_formats.LockedXmlTraits.from_xml`.
+
+        Returns
+        -------
+        A generator yielding the deserialized children of the root folder
+        (:class:`Folder`, :class:`~wwt_data_formats.place.Place`, or
+        :class:`~wwt_data_formats.imageset.ImageSet` objects) one at a time,
+        in document order.
+
+        Notes
+        -----
+        Unlike :meth:`~wwt_data_formats.LockedXmlTraits.from_file`, this
+        method never holds the full XML tree or object graph in memory. The
+        XML is parsed incrementally (with ``iterparse()``) and each
+        top-level child's element is discarded once it has been deserialized,
+        so that huge WTML files can be scanned in bounded memory. The
+        attributes of the root folder itself are not returned. Unrecognized
+        top-level elements are skipped, as with :meth:`from_xml`.
+
+        """
+        root_inst = cls()
+        klasses = None
+        root = None
+        depth = 0
+
+        for event, elem in _iterparse_xml(stream, ("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+
+                    if not root_inst._check_elem_is_this_type(root):
+                        raise ValueError(
+                            f"expected to get a {cls} instance from <{root.tag}>, but didn't"
+                        )
+
+                    step = next(s for s in cls._xml_plan if s.name == "children")
+                    klasses = step.item_classes()
+
+                depth += 1
+                continue
+
+            depth -= 1
+
+            if depth != 1:
+                continue
+
+            with _parse_context(trusted=trusted):
+                for klass in klasses:
+                    child = klass._maybe_from_xml(elem)
+                    if child is not None:
+                        break
+
+            if child is not None:
+                yield child
+
+            # Done with this element: drop it from the in-memory tree.
+            elem.clear()
+            root.remove(elem)
+
+    @classmethod
+    def iter_children_from_file(cls, path):
+        """Incrementally deserialize the children of a folder from an XML file
+        on local disk.
+
+        Parameters
+        ----------
+        path : string
+            The path of the XML file.
+
+        Returns
+        -------
+        A generator yielding the deserialized children of the root folder one
+        at a time. See :meth:`iter_children_from_stream` for details.
+
+        """
+        with open(path, "rb") as f:
+            for child in cls.iter_children_from_stream(f):
+                yield child
+
+    def save_snapshot(self, path):
+        """Save this folder and its contents to a binary snapshot file.
+
+        Parameters
+        ----------
+        path : string
+            The path of the file to write.
+
+        Notes
+        -----
+        Snapshots can be loaded much more quickly than XML files. See
+        :mod:`wwt_data_formats.snapshot` for details.
+
+        """
+        with open(path, "wb") as f:
+            write_snapshot(self, f)
+
+    @classmethod
+    def load_snapshot(cls, path):
+        """Load a folder from a binary snapshot file.
+
+        Parameters
+        ----------
+        path : string
+            The path of a file created with :meth:`save_snapshot`.
+
+        Returns
+        -------
+        A new :class:`Folder` that serializes to the same XML as the folder
+        that was saved.
+
+        """
+        with open(path, "rb") as f:
+            folder = read_snapshot(f)
+
+        if not isinstance(folder, cls):
+            raise ValueError(f"expected to load a {cls} from {path!r}, but didn't")
+
+        return folder
+
+    def extend_children(self, items):
+        """Append multiple items to the :attr:`children` of this folder.
+
+        Parameters
+        ----------
+        items : iterable of :class:`Folder`, :class:`~wwt_data_formats.place.Place`, or :class:`~wwt_data_formats.imageset.ImageSet`
+            The items to append.
+
+        Returns
+        -------
+        *self*, for chaining.
+
+        Notes
+        -----
+        Assigning to :attr:`children`, as in ``folder.children +=
+        other.children``, revalidates every item in the resulting list, so
+        building up a big folder that way takes quadratic time. This method
+        validates only the new items, extends the list in place, and issues a
+        single change notification, so its cost is proportional to the number
+        of items added. If any item is invalid, the folder is left unchanged.
+        See also :meth:`building_children`.
+
+        """
+        list_trait = self.__class__.children
+        item_trait = list_trait._trait
+        validated = []
+
+        for item in items:
+            try:
+                validated.append(item_trait._validate(self, item))
+            except TraitError as e:
+                list_trait.error(self, item, e)
+
+        if validated:
+            children = self.children
+            children.extend(validated)
+            self._notify_trait("children", children, children)
+
+        return self
+
+    @contextmanager
+    def building_children(self):
+        """Add children to this folder in a batch.
+
+        Returns
+        -------
+        A context manager yielding an empty list. When the context exits
+        without an exception, the items that have been added to the list are
+        appended to the :attr:`children` of this folder with
+        :meth:`extend_children`.
+
+        Examples
+        --------
+        Merge the contents of several WTML files::
+
+            with merged.building_children() as children:
+                for path in paths:
+                    children.extend(Folder.from_file(path).children)
+
+        """
+        pending = []
+        yield pending
+        self.extend_children(pending)
+
+    def walk(self, download=False, cache=None, prefetch=0, session=None):
+        """Walk this folder and its descendants.
+
+        Parameters
+        ----------
+        download : optional bool, default False
+            If true, linked folders (child folders with a URL but no children)
+            are downloaded, substituted into their parents, and walked.
+        cache : optional :class:`~wwt_data_formats.httpcache.HttpCache`
+            If specified, a cache to use when downloading linked folders.
+        prefetch : optional int, default 0
+            If positive, and *download* is true, linked folders are downloaded
+            ahead of the walk on a pool of this many threads.
+        session : ``requests`` session or None (the default)
+            The HTTP communications session to use for downloads.
+
+        Returns
+        -------
+        A generator of tuples of ``(depth, treepath, item)``, where ``depth``
+        is the depth of the item below this folder, ``treepath`` is a tuple of
+        child indices, and ``item`` is this folder or one of its descendants.
+
+        Notes
+        -----
+        When prefetching, the linked folders of each downloaded folder are
+        queued for download as soon as it is reached, so that they are
+        usually ready by the time that the walk gets to them. The items are
+        generated in the same order either way. Each distinct URL is only
+        downloaded once: later links to the same URL are substituted with
+        clones of the first download (see
+        :meth:`~wwt_data_formats.LockedXmlTraits.clone`). The downloads share
+        one session, created with :func:`~wwt_data_formats.open_session` if
+        *session* is None, and at most 8 are made to any one host at once.
+
+        """
+        if not download:
+            return _walk_folder(self, None)
+
+        if prefetch > 0:
+            return _walk_folder_prefetching(self, prefetch, session, cache)
+
+        def load(url):
+            return Folder.from_url(url, session=session, cache=cache)
+
+        return _walk_folder(self, load)
 
     def mutate_urls(self, mutator):
         if self.url:
@@ -141,6 +391,540 @@ class Folder(LockedXmlTraits, UrlContainer):
                 if child.background_image_set is not None:
                     yield (index, "place_background", child.background_image_set)
 
+    def diff(self, other):
+        """Compute the differences between this folder and another one.
+
+        Parameters
+        ----------
+        other : :class:`Folder`
+            The folder to compare to, considered to be a newer version of this
+            one.
+
+        Returns
+        -------
+        A list of named tuples ``(kind, path, old, new, changes)``, one for
+        each difference found. The *kind* is ``"added"``, ``"removed"``, or
+        ``"modified"``. The *path* is a tuple of the labels of the items
+        leading from the top folder to the item that differs, where the label
+        of an item is its name, or its URL if it has no name. The *old* and
+        *new* items are the versions of the item in this folder and *other*,
+        either of which is None if the item was added or removed. For
+        modified items, *changes* is a list of tuples ``(trait, old_value,
+        new_value)``, where nested traits are named with dotted paths such as
+        ``"foreground_image_set.name"``; otherwise it is empty.
+
+        Notes
+        -----
+        The children of corresponding folders are matched up by their class,
+        name, and URL. Children that can't be matched exactly are then matched
+        by name alone, then by URL alone, so that renamed or relocated items
+        are reported as modifications. Siblings that share a key are paired
+        with identical siblings first, and otherwise in order. Added or
+        removed folders are reported as single entries, without listing their
+        contents. Changes in the order of children are not reported.
+
+        Items are compared using their cached content fingerprints (see
+        :meth:`~wwt_data_formats.LockedXmlTraits.fingerprint`), so identical
+        subtrees are skipped without being examined and the comparison runs in
+        time roughly proportional to the size of the trees.
+
+        """
+        entries = []
+        _diff_items(self, other, (), entries)
+        return entries
+
+
+class FolderStreamWriter(object):
+    """Write a WTML folder document incrementally, one child at a time.
+
+    Parameters
+    ----------
+    dest_stream : writeable file-like object or None
+        The destination to which the XML data will be written. If None,
+        standard output is used.
+    folder_attrs : optional :class:`Folder` or dict
+        The attributes of the root folder. This may be a :class:`Folder`, whose
+        :attr:`~Folder.children` are ignored, or a dictionary of keyword
+        arguments used to construct one. If unspecified, a default folder is
+        used.
+    indent : optional bool, default True
+        Whether the output will have user-friendly indentation or not.
+    dest_wants_bytes : optional bool, default False
+        Whether the destination stream expects to be fed bytes data rather
+        than Unicode.
+
+    Notes
+    -----
+    Serializing a :class:`Folder` with
+    :meth:`~wwt_data_formats.LockedXmlTraits.write_xml` requires the entire
+    folder and its XML representation to be held in memory. This class writes
+    out each child as soon as it is added with :meth:`add`, so that folders
+    with huge numbers of children can be generated in constant memory. The
+    output is byte-for-byte identical to what
+    :func:`~wwt_data_formats.write_xml_doc` would produce for the equivalent
+    in-memory folder.
+
+    Instances of this class are context managers. When the context is exited
+    without an exception, :meth:`close` is called automatically::
+
+        with open("index.wtml", "wb") as f:
+            with FolderStreamWriter(f, {"name": "Big"}, dest_wants_bytes=True) as w:
+                for place in generate_places():
+                    w.add(place)
+
+    """
+
+    def __init__(
+        self, dest_stream=None, folder_attrs=None, indent=True, dest_wants_bytes=False
+    ):
+        if dest_stream is None:
+            import sys
+
+            dest_stream = sys.stdout
+
+        # See write_xml_doc() for why we insist on writing bytes.
+        if not dest_wants_bytes:
+            try:
+                dest_stream = dest_stream.buffer
+            except Exception as e:
+                raise Exception(
+                    "XML output into text I/O requires a destination whose "
+                    "underlying bytes I/O can be retrieved"
+                ) from e
+
+        if folder_attrs is None:
+            folder_attrs = {}
+        elif isinstance(folder_attrs, Folder):
+            folder_attrs = dict(
+                (step.name, getattr(folder_attrs, step.name))
+                for step in folder_attrs._xml_plan
+                if step.name != "children"
+            )
+
+        # Serialize the folder's own attributes without any children. An empty
+        # element is always rendered as `<Folder ... />`.
+        root = Folder(**folder_attrs).to_xml()
+        self._empty_root = _stringify_xml_fragment(root, indent=False)
+        self._tag = root.tag.encode("utf-8")
+        self._stream = dest_stream
+        self._indent = indent
+        self._n_children = 0
+        self._closed = False
+
+        self._stream.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def add(self, child):
+        """Add a child to the folder, writing it out immediately.
+
+        Parameters
+        ----------
+        child : :class:`Folder`, :class:`~wwt_data_formats.place.Place`, or :class:`~wwt_data_formats.imageset.ImageSet`
+            The child to add.
+
+        Returns
+        -------
+        *self*, for chaining.
+
+        """
+        if self._closed:
+            raise ValueError("cannot add children to a closed FolderStreamWriter")
+
+        if not self._n_children:
+            self._stream.write(self._empty_root[:-3] + b">")
+
+        if self._indent:
+            self._stream.write(b"\n  ")
+
+        self._stream.write(
+            _stringify_xml_fragment(child.to_xml(), indent=self._indent, level=1)
+        )
+        self._n_children += 1
+        return self
+
+    def close(self):
+        """Finish writing the folder.
+
+        The underlying stream is not closed. Calling this method more than
+        once has no effect.
+
+        """
+        if self._closed:
+            return
+
+        if not self._n_children:
+            self._stream.write(self._empty_root)
+        elif self._indent:
+            self._stream.write(b"\n</" + self._tag + b">\n")
+        else:
+            self._stream.write(b"</" + self._tag + b">")
+
+        self._closed = True
+
+
+class FolderIndex(object):
+    """An in-memory index of the items in a tree of folders.
+
+    Parameters
+    ----------
+    root : :class:`Folder`
+        The root of the tree to index.
+
+    Notes
+    -----
+    The index is built in one pass over the tree, visiting the same items as
+    :meth:`Folder.walk` without downloading anything. Afterwards, items can be
+    found by their name, URL, alternate URL, or DEM URL with :meth:`find`, or
+    by their tree path with :meth:`item_at`, in constant time. The parent and
+    tree path of each item are recorded too, so its ancestors can be found in
+    time proportional to its depth.
+
+    The index observes the :attr:`~Folder.children` of each of its folders,
+    so when children are added or removed by assigning a new list or with
+    :meth:`Folder.extend_children`, only the affected entries are updated.
+    In-place modifications of a list of children, and changes to the
+    attributes of indexed items, cannot be observed: call :meth:`refresh`
+    afterwards. Each object is assumed to appear in the tree only once, but
+    an item can be moved from one folder to another.
+
+    Because the folders of the tree refer to the index, :meth:`close` should
+    be called when it is no longer needed.
+
+    """
+
+    KEYS = ("name", "url", "alt_url", "dem_url")
+    "The keys by which items can be found with :meth:`find`."
+
+    def __init__(self, root):
+        self.root = root
+        self._build()
+
+    def _build(self):
+        self._parents = {}
+        self._paths = {}
+        self._by_path = {}
+        self._children = {}
+        self._values = {}
+        self._tables = [{} for _ in self.KEYS]
+        self._observing = True
+        self._add(self.root, None, ())
+
+    def _add(self, item, parent, path):
+        """Index an item and its descendants."""
+
+        todo = [(item, parent, path)]
+
+        while todo:
+            item, parent, path = todo.pop()
+
+            if item in self._parents:
+                # The item has been moved here from elsewhere in the tree, or
+                # within its folder.
+                self._parents[item] = parent
+                self._move(item, path)
+                continue
+
+            self._parents[item] = parent
+            self._paths[item] = path
+            self._by_path[path] = item
+            self._add_keys(item)
+
+            if isinstance(item, Folder):
+                children = list(item.children)
+                self._children[item] = children
+
+                if self._observing:
+                    item.observe(self._on_children_change, names="children")
+
+                for index in range(len(children) - 1, -1, -1):
+                    todo.append((children[index], item, path + (index,)))
+
+    def _remove(self, item, parent):
+        """Remove an item and its descendants from the index, unless the item
+        has been moved out of *parent*."""
+
+        todo = [(item, parent)]
+
+        while todo:
+            item, parent = todo.pop()
+
+            if self._parents.get(item, self) is not parent:
+                continue
+
+            del self._parents[item]
+            path = self._paths.pop(item)
+
+            if self._by_path.get(path) is item:
+                del self._by_path[path]
+
+            self._remove_keys(item)
+            children = self._children.pop(item, None)
+
+            if children is not None:
+                if self._observing:
+                    item.unobserve(self._on_children_change, names="children")
+
+                todo.extend((child, item) for child in children)
+
+    def _move(self, item, path):
+        """Update the tree paths of an item and its descendants."""
+
+        todo = [(item, path)]
+
+        while todo:
+            item, path = todo.pop()
+            old_path = self._paths[item]
+
+            if old_path == path:
+                continue
+
+            if self._by_path.get(old_path) is item:
+                del self._by_path[old_path]
+
+            self._paths[item] = path
+            self._by_path[path] = item
+
+            for index, child in enumerate(self._children.get(item, ())):
+                if self._parents.get(child) is item:
+                    todo.append((child, path + (index,)))
+
+    def _add_keys(self, item):
+        # Reading the trait values directly is much faster than getattr(), and
+        # gives None for attributes that the item doesn't have.
+        values = self._values[item] = tuple(map(item._trait_values.get, self.KEYS))
+
+        # To save memory, a table entry is a list only if a value is repeated.
+        for table, value in zip(self._tables, values):
+            if value:
+                match = table.get(value)
+
+                if match is None:
+                    table[value] = item
+                elif type(match) is list:
+                    match.append(item)
+                else:
+                    table[value] = [match, item]
+
+    def _remove_keys(self, item):
+        # The attributes of the item may have changed since it was indexed.
+        values = self._values.pop(item)
+
+        for table, value in zip(self._tables, values):
+            match = table.get(value)
+
+            if match is item:
+                del table[value]
+            elif type(match) is list:
+                # Not `list.remove()`: only this exact object should go.
+                for index, other in enumerate(match):
+                    if other is item:
+                        del match[index]
+                        break
+
+                if len(match) == 1:
+                    table[value] = match[0]
+
+    def _on_children_change(self, change):
+        folder = change["owner"]
+
+        if change["old"] is change["new"]:
+            # Folder.extend_children() appends to the list in place.
+            children = self._children[folder]
+            path = self._paths[folder]
+            n_old = len(children)
+
+            for index, child in enumerate(folder.children[n_old:], n_old):
+                children.append(child)
+                self._add(child, folder, path + (index,))
+        else:
+            self._sync_children(folder)
+
+    def _sync_children(self, folder):
+        """Bring the index up to date with the children of an indexed folder."""
+
+        old = self._children[folder]
+        new = list(folder.children)
+        new_set = set(new)
+
+        for child in old:
+            if child not in new_set:
+                self._remove(child, folder)
+
+        self._children[folder] = new
+        path = self._paths[folder]
+        n_kept = len(old)
+
+        # Appending to the list is the common case, and requires no changes to
+        # the existing entries.
+        if len(new) < n_kept or any(a is not b for a, b in zip(old, new)):
+            n_kept = 0
+
+        for index in range(n_kept, len(new)):
+            self._add(new[index], folder, path + (index,))
+
+    def _check(self, item):
+        if item not in self._parents:
+            raise KeyError(f"{item!r} is not in this index")
+
+    def __len__(self):
+        return len(self._parents)
+
+    def __contains__(self, item):
+        return item in self._parents
+
+    def __iter__(self):
+        return iter(self._parents)
+
+    def find(self, key, value):
+        """Find the items with a given name or URL.
+
+        Parameters
+        ----------
+        key : string
+            The attribute to match: one of ``"name"``, ``"url"``,
+            ``"alt_url"``, or ``"dem_url"``.
+        value : string
+            The value to look for.
+
+        Returns
+        -------
+        A list of the matching items, which may be empty.
+
+        """
+        try:
+            table = self._tables[self.KEYS.index(key)]
+        except ValueError:
+            raise ValueError(f"cannot index folder items by {key!r}")
+
+        match = table.get(value)
+
+        if match is None:
+            return []
+        if type(match) is list:
+            return list(match)
+        return [match]
+
+    def item_at(self, path):
+        """Get the item at a tree path.
+
+        Parameters
+        ----------
+        path : tuple of int
+            The tree path of the item, as generated by :meth:`Folder.walk`.
+
+        Returns
+        -------
+        The item at the path. A :exc:`KeyError` is raised if there is none.
+
+        """
+        return self._by_path[tuple(path)]
+
+    def path_of(self, item):
+        """Get the tree path of an item.
+
+        Parameters
+        ----------
+        item : :class:`Folder`, :class:`~wwt_data_formats.place.Place`, or :class:`~wwt_data_formats.imageset.ImageSet`
+            An indexed item.
+
+        Returns
+        -------
+        The tree path of the item, a tuple of child indices.
+
+        """
+        self._check(item)
+        return self._paths[item]
+
+    def parent_of(self, item):
+        """Get the folder containing an item.
+
+        Parameters
+        ----------
+        item : :class:`Folder`, :class:`~wwt_data_formats.place.Place`, or :class:`~wwt_data_formats.imageset.ImageSet`
+            An indexed item.
+
+        Returns
+        -------
+        The parent :class:`Folder` of the item, or None if it is the root.
+
+        """
+        self._check(item)
+        return self._parents[item]
+
+    def ancestors(self, item):
+        """Get the folders containing an item.
+
+        Parameters
+        ----------
+        item : :class:`Folder`, :class:`~wwt_data_formats.place.Place`, or :class:`~wwt_data_formats.imageset.ImageSet`
+            An indexed item.
+
+        Returns
+        -------
+        A list of folders, starting with the parent of the item and ending
+        with the root. It is empty if the item is the root.
+
+        """
+        self._check(item)
+        result = []
+        parent = self._parents[item]
+
+        while parent is not None:
+            result.append(parent)
+            parent = self._parents[parent]
+
+        return result
+
+    def refresh(self, item=None):
+        """Update the index after changes that it could not observe.
+
+        Parameters
+        ----------
+        item : optional indexed item
+            The item that has changed. If it is a folder, changes to its list
+            of children are picked up, but not changes within its descendants.
+            If unspecified, the whole index is rebuilt.
+
+        Returns
+        -------
+        *self*
+
+        """
+        if item is None:
+            self.close()
+            self._build()
+            return self
+
+        self._check(item)
+        self._remove_keys(item)
+        self._add_keys(item)
+
+        if item in self._children:
+            self._sync_children(item)
+
+        return self
+
+    def close(self):
+        """Stop observing the folders of the tree.
+
+        The index can still be queried, but will no longer be updated
+        automatically. Calling this method more than once has no effect.
+
+        """
+        if not self._observing:
+            return
+
+        for folder in self._children:
+            folder.unobserve(self._on_children_change, names="children")
+
+        self._observing = False
+
 
 def make_absolutizing_url_mutator(baseurl):
     """Return a function that makes relative URLs absolute.
@@ -212,6 +996,59 @@ def make_filesystem_url_mutator(basedir):
     return mutator
 
 
+def _walk_folder(folder, load):
+    """Implement :meth:`Folder.walk`, where ``load(url)`` loads a linked folder,
+    or *load* is None if linked folders should not be downloaded."""
+
+    yield (0, (), folder)
+
+    for index, child in enumerate(folder.children):
+        if isinstance(child, Folder):
+            if load is not None and not len(child.children) and child.url:
+                url = child.url
+                child = load(url)
+                child.url = url
+                folder.children[index] = child
+
+            for depth, path, subchild in _walk_folder(child, load):
+                yield (depth + 1, (index,) + path, subchild)
+        else:
+            yield (1, (index,), child)
+
+
+def _walk_folder_prefetching(folder, max_workers, session, cache):
+    """Implement :meth:`Folder.walk` with prefetching."""
+
+    def fetch(session, url):
+        return Folder.from_url(url, session=session, cache=cache)
+
+    with _ThreadedLoader(max_workers, session=session) as loader:
+        futures = {}
+        loaded = {}
+
+        def schedule(folder):
+            for url in _linked_folder_urls(folder):
+                if url not in futures:
+                    futures[url] = loader.call(url, fetch)
+
+        def load(url):
+            first = loaded.get(url)
+            if first is not None:
+                return first.clone()
+
+            if url not in futures:
+                futures[url] = loader.call(url, fetch)
+
+            child = loaded[url] = futures[url].result()
+            schedule(child)
+            return child
+
+        schedule(folder)
+
+        for info in _walk_folder(folder, load):
+            yield info
+
+
 def _sanitize_name(name):
     s = re.sub("[^-_a-zA-Z0-9]+", "_", name)
     s = re.sub("^_+", "", s)
@@ -219,24 +1056,174 @@ def _sanitize_name(name):
     return s
 
 
-def fetch_folder_tree(root_url, root_cache_path, on_fetch=None):
+_LIST_MODES = frozenset((XmlSer.INNER_LIST, XmlSer.WRAPPED_INNER_LIST))
+
+
+def _diff_label(item):
+    return getattr(item, "name", "") or getattr(item, "url", "") or item._tag_name()
+
+
+def _diff_traits(old, new, prefix, changes):
+    """Find the non-list traits that differ between two objects of the same
+    class, recursing into nested objects."""
+
+    for step in old._xml_plan:
+        if step.mode in _LIST_MODES:
+            continue
+
+        name = step.name
+        a = getattr(old, name)
+        b = getattr(new, name)
+
+        if isinstance(a, LockedXmlTraits) and type(a) is type(b):
+            if not a.content_equals(b):
+                _diff_traits(a, b, prefix + name + ".", changes)
+        elif step.mode == XmlSer.NS_TO_ATTR:
+            a = vars(a)
+            b = vars(b)
+
+            for key in sorted(set(a) | set(b)):
+                if a.get(key) != b.get(key):
+                    changes.append((prefix + name + "." + key, a.get(key), b.get(key)))
+        elif a != b:
+            changes.append((prefix + name, a, b))
+
+
+def _diff_items(old, new, path, entries):
+    """Compare two matched items, appending DiffEntry records to *entries*."""
+
+    if old.content_equals(new):
+        return
+
+    changes = []
+    _diff_traits(old, new, "", changes)
+
+    if changes:
+        entries.append(DiffEntry("modified", path, old, new, changes))
+
+    for step in old._xml_plan:
+        if step.mode in _LIST_MODES:
+            _diff_lists(getattr(old, step.name), getattr(new, step.name), path, entries)
+
+
+def _diff_lists(old_items, new_items, path, entries):
+    """Match up the items of two lists by their keys and compare them."""
+
+    matches = {}
+    unmatched_old = list(range(len(old_items)))
+    unmatched_new = list(range(len(new_items)))
+
+    for make_key in (
+        lambda item: (type(item), getattr(item, "name", ""), getattr(item, "url", "")),
+        lambda item: getattr(item, "name", "") and (type(item), item.name),
+        lambda item: getattr(item, "url", "") and (type(item), item.url),
+    ):
+        if not unmatched_old or not unmatched_new:
+            break
+
+        index = {}
+
+        for i in unmatched_old:
+            key = make_key(old_items[i])
+            if key:
+                index.setdefault(key, deque()).append(i)
+
+        new_keys = {}
+
+        for j in unmatched_new:
+            key = make_key(new_items[j])
+            if key in index:
+                new_keys.setdefault(key, []).append(j)
+
+        # Siblings can share a key. Pair up those with identical content
+        # first, so that reordering them isn't reported as modifications,
+        # then match the rest in order.
+        for key, js in new_keys.items():
+            candidates = index[key]
+
+            if len(js) == 1 and len(candidates) == 1:
+                continue
+
+            for j in js:
+                fp = new_items[j].fingerprint()
+
+                for i in candidates:
+                    if old_items[i].fingerprint() == fp:
+                        matches[j] = i
+                        candidates.remove(i)
+                        break
+
+        still_unmatched = []
+
+        for j in unmatched_new:
+            if j in matches:
+                continue
+
+            candidates = index.get(make_key(new_items[j]))
+
+            if candidates:
+                matches[j] = candidates.popleft()
+            else:
+                still_unmatched.append(j)
+
+        unmatched_new = still_unmatched
+        matched_old = set(matches.values())
+        unmatched_old = [i for i in unmatched_old if i not in matched_old]
+
+    for j, new_item in enumerate(new_items):
+        item_path = path + (_diff_label(new_item),)
+        i = matches.get(j)
+
+        if i is None:
+            entries.append(DiffEntry("added", item_path, None, new_item, []))
+        else:
+            _diff_items(old_items[i], new_item, item_path, entries)
+
+    for i in unmatched_old:
+        old_item = old_items[i]
+        item_path = path + (_diff_label(old_item),)
+        entries.append(DiffEntry("removed", item_path, old_item, None, []))
+
+
+def _write_folder_text(dir_path, text):
+    """Write the text of a folder into its directory in a cached tree,
+    returning the number of bytes written."""
+
+    with open(os.path.join(dir_path, "index.wtml"), "wt", encoding="utf8") as f:
+        f.write(text)
+
+    return len(text.encode("utf8"))
+
+
+def _save_folder_tree(root_url, root_cache_path, load_folder, save_folder=None):
+    """Save a folder tree to disk in the layout of :func:`fetch_folder_tree`,
+    where ``load_folder(url)`` returns a tuple ``(text, folder)``, or ``(None,
+    None)`` if the folder is unavailable. Each URL is loaded at most once. If
+    specified, ``save_folder(url, dir_path, text)`` is called to save each
+    folder instead of :func:`_write_folder_text`. Returns the number of bytes
+    of text saved."""
+
     done_urls = set()
+    n_saved = 0
 
     def get_folder(url):
         if url in done_urls:
             return None, None
 
-        if on_fetch is not None:
-            on_fetch(url)
-        resp = requests.get(url)
-        resp.encoding = "utf-8-sig"  # see LockedXmlTraits.from_url()
-        elem = etree.fromstring(resp.text)
+        text, folder = load_folder(url)
         done_urls.add(url)
-        return resp.text, Folder.from_xml(elem)
+        return text, folder
+
+    def save(url, dir_path, text):
+        nonlocal n_saved
+
+        if save_folder is None:
+            n_saved += _write_folder_text(dir_path, text)
+        else:
+            n_saved += save_folder(url, dir_path, text)
 
     root_text, root_folder = get_folder(root_url)
-    with open(os.path.join(root_cache_path, "index.wtml"), "wt", encoding="utf8") as f:
-        f.write(root_text)
+    save(root_url, root_cache_path, root_text)
 
     def walk(cur_folder, cur_cache_path):
         for index, child in enumerate(cur_folder.children):
@@ -248,25 +1235,617 @@ def fetch_folder_tree(root_url, root_cache_path, on_fetch=None):
             child_cache_path = os.path.join(cur_cache_path, subdir_base)
 
             if not len(child.children) and child.url:
-                text, child = get_folder(child.url)
+                url = child.url
+                text, child = get_folder(url)
                 if child is None:
                     continue
 
                 os.makedirs(child_cache_path, exist_ok=True)
-                with open(
-                    os.path.join(child_cache_path, "index.wtml"), "wt", encoding="utf8"
-                ) as f:
-                    f.write(text)
+                save(url, child_cache_path, text)
 
             walk(child, child_cache_path)
 
     walk(root_folder, root_cache_path)
+    return n_saved
+
+
+def _linked_folder_urls(folder):
+    """Generate the URLs of the folders linked from a folder tree, in the
+    order that :func:`_save_folder_tree` visits them."""
+
+    for child in folder.children:
+        if isinstance(child, Folder):
+            if not len(child.children) and child.url:
+                yield child.url
+            else:
+                for url in _linked_folder_urls(child):
+                    yield url
+
+
+class _ThreadedLoader(object):
+    """Download documents on a thread pool, sharing one HTTP session and
+    limiting the number of simultaneous requests to each host.
+
+    If *session* is None, one is created with :func:`open_session` and closed
+    along with the loader. If specified, *on_fetch* is called with each URL as
+    it begins to be fetched, in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_workers,
+        session=None,
+        limit_per_host=DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        on_fetch=None,
+    ):
+        self._owns_session = session is None
+        if session is None:
+            session = open_session(limit_per_host=limit_per_host)
+
+        self.session = session
+        self._on_fetch = on_fetch
+        self._limit_per_host = limit_per_host
+        self._host_limits = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers)
+
+        # The futures that haven't completed, so that they can be cancelled.
+        self._pending = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _host_limit(self, url):
+        from urllib.parse import urlsplit
+
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = threading.BoundedSemaphore(self._limit_per_host)
+                self._host_limits[host] = limit
+
+        return limit
+
+    def submit(self, url, process, **kwargs):
+        """Schedule a download of *url*, returning a future for the result of
+        ``process(url, response)``. Extra arguments are passed to
+        ``session.get()``."""
+
+        limit = self._host_limit(url)
+
+        def task():
+            with limit:
+                if self._on_fetch is not None:
+                    self._on_fetch(url)
+                resp = self.session.get(url, **kwargs)
+
+            return process(url, resp)
+
+        return self._submit(task)
+
+    def call(self, url, func):
+        """Schedule ``func(session, url)``, a function that downloads *url*
+        itself, returning a future for its result."""
 
+        limit = self._host_limit(url)
+
+        def task():
+            with limit:
+                return func(self.session, url)
+
+        return self._submit(task)
+
+    def _submit(self, task):
+        future = self._pool.submit(task)
+
+        with self._lock:
+            self._pending.add(future)
+
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def close(self):
+        """Cancel any downloads that haven't started and wait for the rest."""
+
+        # Not `shutdown(cancel_futures=True)`, which needs Python 3.9.
+        with self._lock:
+            pending = list(self._pending)
+
+        for future in pending:
+            future.cancel()
+
+        self._pool.shutdown(wait=True)
+
+        if self._owns_session:
+            self.session.close()
+
+
+def _folder_from_response(resp):
+    """Deserialize a downloaded folder, returning ``(text, folder)``."""
+
+    folder = Folder.from_xml(_parse_xml_bytes(resp.content))
+    resp.encoding = "utf-8-sig"  # see LockedXmlTraits.from_url()
+    return resp.text, folder
+
+
+_MANIFEST_NAME = "fetch-manifest.json"
+_STAGING_NAME = ".fetch-staging"
+
+
+class _FetchManifest(object):
+    """The bookkeeping of an incremental :func:`fetch_folder_tree`.
+
+    The manifest file in the root of the cached tree maps the URL of each saved
+    folder to the directory where it was saved, the SHA-256 hash of its text,
+    and its HTTP validators. While a fetch is in progress, each downloaded
+    folder is also staged in a hidden directory, so that if the fetch is
+    interrupted, the next one can pick up where it left off.
+    """
+
+    def __init__(self, root_cache_path):
+        self.root = root_cache_path
+        self.staging = os.path.join(root_cache_path, _STAGING_NAME)
+        self.entries = {}
+        self.validators = {}
+        self._new_entries = {}
+
+        try:
+            path = os.path.join(root_cache_path, _MANIFEST_NAME)
+            with open(path, "rt", encoding="utf8") as f:
+                self.entries = json.load(f)["folders"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        os.makedirs(self.staging, exist_ok=True)
+
+    def _staged_paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.staging, key)
+        return base + ".wtml", base + ".json"
+
+    def saved_validators(self, url):
+        entry = self.entries.get(url, {})
+        return {"etag": entry.get("etag"), "last_modified": entry.get("last_modified")}
+
+    def saved_text(self, url):
+        """Get the text of a folder saved by a previous fetch, or None if there
+        isn't one or it has been modified since."""
+
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+
+        try:
+            with open(os.path.join(self.root, entry["path"], "index.wtml"), "rb") as f:
+                data = f.read()
+        except (OSError, KeyError, TypeError):
+            return None
+
+        if hashlib.sha256(data).hexdigest() != entry.get("sha256"):
+            return None
+
+        return data.decode("utf8")
+
+    def conditional_headers(self, url):
+        validators = self.saved_validators(url)
+        headers = {}
+
+        if validators["etag"]:
+            headers["If-None-Match"] = validators["etag"]
+        if validators["last_modified"]:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        return headers
+
+    def staged(self, url):
+        """Get ``(text, validators)`` for a folder downloaded by an interrupted
+        fetch, or None."""
+
+        text_path, meta_path = self._staged_paths(url)
+
+        try:
+            with open(meta_path, "rt", encoding="utf8") as f:
+                meta = json.load(f)
+            with open(text_path, "rt", encoding="utf8") as f:
+                text = f.read()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("url") != url:
+            return None
+
+        meta.pop("url")
+        return text, meta
+
+    def stage(self, url, text, validators):
+        text_path, meta_path = self._staged_paths(url)
+
+        with open(text_path, "wt", encoding="utf8") as f:
+            f.write(text)
+
+        # The metadata are written last, atomically, so that their presence
+        # means that the staged text is complete.
+        with open(meta_path + ".tmp", "wt", encoding="utf8") as f:
+            json.dump(dict(validators, url=url), f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def save(self, url, dir_path, text):
+        """Save a folder into the tree, unless an identical copy is already in
+        place. Returns the number of bytes written."""
+
+        data = text.encode("utf8")
+        n_written = 0
+
+        try:
+            with open(os.path.join(dir_path, "index.wtml"), "rb") as f:
+                unchanged = f.read() == data
+        except OSError:
+            unchanged = False
+
+        if not unchanged:
+            n_written = _write_folder_text(dir_path, text)
+
+        entry = self.validators.get(url) or self.saved_validators(url)
+        entry = dict(entry)
+        entry["path"] = os.path.relpath(dir_path, self.root).replace(os.path.sep, "/")
+        entry["sha256"] = hashlib.sha256(data).hexdigest()
+        self._new_entries[url] = entry
+        return n_written
+
+    def finish(self):
+        """Record the folders saved by a completed fetch and discard the
+        staged downloads."""
+
+        path = os.path.join(self.root, _MANIFEST_NAME)
+
+        with open(path + ".tmp", "wt", encoding="utf8") as f:
+            json.dump({"folders": self._new_entries}, f, indent=1, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+def fetch_folder_tree(
+    root_url,
+    root_cache_path,
+    on_fetch=None,
+    max_workers=1,
+    session=None,
+    limit_per_host=DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    incremental=False,
+):
+    """Download a tree of WTML folders.
+
+    Parameters
+    ----------
+    root_url : string
+        The URL of the root folder.
+    root_cache_path : string
+        The directory in which to save the tree, which must exist.
+    on_fetch : optional callable
+        If specified, called with each URL as it begins to be fetched.
+    max_workers : optional int, default 1
+        The number of folders to download at once. If 1, the folders are
+        downloaded one at a time. Otherwise, they are downloaded on a pool of
+        this many threads.
+    session : ``requests`` session or None (the default)
+        The HTTP communications session to use. If None and *max_workers* is
+        greater than 1 or *incremental* is true, a session is created with
+        :func:`~wwt_data_formats.open_session`, so that failed requests are
+        retried with backoff.
+    limit_per_host : optional int, default 8
+        The maximum number of simultaneous requests to any one host when
+        *max_workers* is greater than 1.
+    incremental : optional bool, default False
+        If true, update a tree saved by a previous incremental fetch, only
+        downloading and rewriting the folders that have changed. See below.
+
+    Returns
+    -------
+    A dictionary with the integer keys ``fetched``, the number of folders
+    downloaded; ``unchanged``, the number found to be unchanged since a
+    previous fetch; ``resumed``, the number recovered from an interrupted
+    fetch; and ``failed``, the number that could not be downloaded.
+
+    Notes
+    -----
+    The root folder is saved as ``index.wtml`` in *root_cache_path*. Each
+    linked folder is saved as ``index.wtml`` in a subdirectory named after its
+    index and name within its parent, such as ``003_Nebulae``, so that the
+    directory tree mirrors the folder tree. Each distinct URL is fetched and
+    saved only once, at its first position in the tree. Use
+    :func:`walk_cached_folder_tree` to process the result.
+
+    With multiple workers, linked folders are fetched as soon as their links
+    are discovered, so *on_fetch* is called from the worker threads and in no
+    particular order. The files are written once the whole tree has been
+    downloaded, and are the same as those saved by a one-at-a-time fetch.
+
+    An incremental fetch keeps a manifest, ``fetch-manifest.json``, in
+    *root_cache_path*, recording the URL, HTTP ``ETag`` and ``Last-Modified``
+    validators, content hash, and location of each saved folder. Folders that
+    were saved before are requested conditionally, and if the server reports
+    that they haven't changed, the saved copies are used. Files are only
+    rewritten if their contents or locations have changed. If a folder can't
+    be downloaded, it is counted as failed, and any previously saved copy is
+    kept; the fetch only fails outright if the root folder is unavailable.
+    Downloaded folders are staged on disk as the fetch progresses, so if it is
+    interrupted, the next incremental fetch reuses them without requesting
+    them again. Directories of folders that are no longer part of the tree
+    are not removed.
+
+    """
+    collector = _instrument._collector
+    if collector is not None:
+        token = collector._begin()
+
+    counts = {"fetched": 0, "unchanged": 0, "resumed": 0, "failed": 0}
+    n_read = 0
+
+    if max_workers == 1 and not incremental:
+        get = requests.get if session is None else session.get
+
+        def load_folder(url):
+            nonlocal n_read
+
+            if on_fetch is not None:
+                on_fetch(url)
+            resp = get(url)
+            counts["fetched"] += 1
+
+            if collector is not None:
+                n_read += len(resp.content)
+
+            return _folder_from_response(resp)
+
+        n_written = _save_folder_tree(root_url, root_cache_path, load_folder)
+    else:
+        manifest = _FetchManifest(root_cache_path) if incremental else None
+        previous = {}
+        loaded = {}
+        errors = {}
+        requested = set()
+        pending = {}
+        ready = deque()
+
+        def process(url, resp):
+            # This runs in a worker thread.
+            if resp.status_code == 304 and url in previous:
+                text = previous[url]
+                folder = Folder.from_xml(_parse_xml_text(text))
+                return ("unchanged", 0, None, text, folder)
+
+            validators = None
+
+            if manifest is not None:
+                resp.raise_for_status()
+                validators = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                }
+
+            text, folder = _folder_from_response(resp)
+            return ("fetched", len(resp.content), validators, text, folder)
+
+        def request(url):
+            requested.add(url)
+            headers = {}
+
+            if manifest is not None:
+                staged = manifest.staged(url)
+
+                if staged is not None:
+                    text, validators = staged
+                    folder = Folder.from_xml(_parse_xml_text(text))
+                    ready.append((url, ("resumed", 0, validators, text, folder)))
+                    return
+
+                text = manifest.saved_text(url)
+
+                if text is not None:
+                    previous[url] = text
+                    headers = manifest.conditional_headers(url)
+
+            pending[loader.submit(url, process, headers=headers)] = url
+
+        with _ThreadedLoader(
+            max_workers,
+            session=session,
+            limit_per_host=limit_per_host,
+            on_fetch=on_fetch,
+        ) as loader:
+            request(root_url)
+
+            while pending or ready:
+                if not ready:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        url = pending.pop(future)
+
+                        try:
+                            ready.append((url, future.result()))
+                        except Exception as e:
+                            if manifest is None:
+                                raise
+                            ready.append((url, e))
+
+                url, result = ready.popleft()
+
+                if isinstance(result, Exception):
+                    counts["failed"] += 1
+                    text = previous.get(url)
+
+                    if text is None:
+                        errors[url] = result
+                        continue
+
+                    # Keep the copy saved by the previous fetch.
+                    folder = Folder.from_xml(_parse_xml_text(text))
+                    result = (None, 0, None, text, folder)
+
+                status, size, validators, text, folder = result
+                n_read += size
+                loaded[url] = (text, folder)
+
+                if status is not None:
+                    counts[status] += 1
+
+                if manifest is not None and validators is not None:
+                    manifest.validators[url] = validators
+
+                    if status == "fetched":
+                        manifest.stage(url, text, validators)
+
+                for child_url in _linked_folder_urls(folder):
+                    if child_url not in requested:
+                        request(child_url)
+
+        if root_url in errors:
+            raise errors[root_url]
+
+        if manifest is None:
+            n_written = _save_folder_tree(root_url, root_cache_path, loaded.__getitem__)
+        else:
+            n_written = _save_folder_tree(
+                root_url,
+                root_cache_path,
+                lambda url: loaded.get(url, (None, None)),
+                manifest.save,
+            )
+            manifest.finish()
+
+    if collector is not None:
+        collector._end(
+            token,
+            "fetch_folder_tree",
+            "Folder",
+            "",
+            bytes_read=n_read,
+            bytes_written=n_written,
+        )
+
+    return counts
+
+
+async def fetch_folder_tree_async(
+    root_url,
+    root_cache_path,
+    on_fetch=None,
+    session=None,
+    max_concurrency=DEFAULT_ASYNC_CONNECTION_LIMIT,
+):
+    """Asynchronously download a tree of WTML folders.
+
+    Parameters
+    ----------
+    root_url : string
+        The URL of the root folder.
+    root_cache_path : string
+        The directory in which to save the tree, which must exist.
+    on_fetch : optional callable
+        If specified, called with each URL as it begins to be fetched.
+    session : :class:`aiohttp.ClientSession` or None (the default)
+        The HTTP communications session to use. If None, a temporary session
+        is created with :func:`~wwt_data_formats.open_async_session`.
+    max_concurrency : optional int, default 100
+        The maximum number of folders that may be in flight at once.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    This is a coroutine and requires the optional ``aiohttp`` package. It is
+    an asynchronous version of :func:`fetch_folder_tree`: it saves the same
+    files in the same on-disk layout, suitable for
+    :func:`walk_cached_folder_tree`, but fetches the folders concurrently.
+    Linked folders are fetched as soon as their links are discovered, and
+    each distinct URL is fetched only once. The files are written once the
+    whole tree has been downloaded, so the tree is held in memory until then.
+
+    Connection pooling, including the per-host connection limit, is
+    controlled by the session.
+
+    """
+    if session is None:
+        async with open_async_session() as session:
+            return await fetch_folder_tree_async(
+                root_url,
+                root_cache_path,
+                on_fetch=on_fetch,
+                session=session,
+                max_concurrency=max_concurrency,
+            )
+
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    requested = set([root_url])
+    loaded = {}
+
+    async def fetch(url):
+        async with semaphore:
+            if on_fetch is not None:
+                on_fetch(url)
+            text = await _fetch_text_async(session, url)
+
+        folder = Folder.from_xml(_parse_xml_text(text))
+        loaded[url] = (text, folder)
+        todo = []
+
+        for child_url in _linked_folder_urls(folder):
+            if child_url not in requested:
+                requested.add(child_url)
+                todo.append(fetch(child_url))
+
+        await asyncio.gather(*todo)
+
+    await fetch(root_url)
+
+    # Now that everything is in hand, save the files exactly as the
+    # synchronous version would.
+    _save_folder_tree(root_url, root_cache_path, loaded.__getitem__)
+
+
+def walk_cached_folder_tree(root_cache_path, records=False):
+    """Walk a folder tree that has been downloaded with :func:`fetch_folder_tree`.
+
+    Parameters
+    ----------
+    root_cache_path : string
+        The path of the root of the cached tree.
+    records : optional bool, default False
+        If true, the folder files are loaded into the lightweight classes of
+        :mod:`wwt_data_formats.records` rather than the full traitlets-based
+        data classes. This is much faster for read-only processing.
+
+    Returns
+    -------
+    A generator of tuples of ``(treepath, item)``, where ``treepath`` is a
+    tuple of child indices and ``item`` is a folder, place, or imageset.
+    Linked folders that weren't saved because they couldn't be downloaded are
+    generated as-is.
+
+    """
+    if records:
+        from .records import FolderRecord as folder_class
+    else:
+        folder_class = Folder
 
-def walk_cached_folder_tree(root_cache_path):
     seen_urls = set()
 
-    root_folder = Folder.from_file(os.path.join(root_cache_path, "index.wtml"))
+    root_folder = folder_class.from_file(os.path.join(root_cache_path, "index.wtml"))
 
     def walk(cur_treepath, cur_folder, cur_cache_path):
         yield (cur_treepath, cur_folder)
@@ -274,7 +1853,7 @@ def walk_cached_folder_tree(root_cache_path):
         for index, child in enumerate(cur_folder.children):
             child_treepath = cur_treepath + (index,)
 
-            if not isinstance(child, Folder):
+            if not isinstance(child, folder_class):
                 yield (child_treepath, child)
             else:
                 subdir_base = f"{index:03d}_{_sanitize_name(child.name)}"
@@ -285,9 +1864,14 @@ def walk_cached_folder_tree(root_cache_path):
                         continue
 
                     seen_urls.add(child.url)
-                    child = Folder.from_file(
-                        os.path.join(child_cache_path, "index.wtml")
-                    )
+                    child_path = os.path.join(child_cache_path, "index.wtml")
+
+                    if not os.path.exists(child_path):
+                        # This folder couldn't be downloaded.
+                        yield (child_treepath, child)
+                        continue
+
+                    child = folder_class.from_file(child_path)
 
                 for sub_treepath, sub_child in walk(
                     child_treepath, child, child_cache_path
@@ -0,0 +1,305 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+"""
+An on-disk cache of downloaded WTML data, revalidated with conditional HTTP
+requests.
+
+Tools that repeatedly load the same collection URLs can pass an
+:class:`HttpCache` to :meth:`~wwt_data_formats.LockedXmlTraits.from_url` or
+:meth:`~wwt_data_formats.folder.Folder.walk`. The cache records the ``ETag``
+and ``Last-Modified`` validators of each response along with a
+:mod:`~wwt_data_formats.snapshot` of the parsed data. Later requests for the
+same URL are sent as conditional GETs, and if the server replies that the
+document has not changed, the data are reloaded from the snapshot rather
+than being downloaded and parsed again.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__all__ = """
+HttpCache
+""".split()
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+from .snapshot import read_snapshot, write_snapshot
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+class HttpCache(object):
+    """An on-disk, size-bounded cache of WTML documents downloaded over HTTP.
+
+    Parameters
+    ----------
+    path : string
+        The directory in which to store the cached data. It is created if it
+        does not exist. Its contents persist between runs.
+    max_size : optional int, default 256 MiB
+        The maximum total size of the cached data, in bytes. When it is
+        exceeded, the least recently used entries are evicted.
+
+    Notes
+    -----
+    Only responses that carry an ``ETag`` or ``Last-Modified`` header are
+    cached, since others cannot be revalidated. Each cache entry consists of
+    a small JSON file holding the URL and its validators, and a snapshot file
+    holding the parsed data.
+
+    The counters :attr:`hits`, :attr:`misses`, and :attr:`evictions` record
+    the cache activity of this instance; see also :meth:`stats`. A cache may
+    be shared by multiple threads.
+
+    """
+
+    hits = 0
+    "The number of requests answered from the cache after revalidation."
+
+    misses = 0
+    "The number of requests for which the document had to be downloaded."
+
+    evictions = 0
+    "The number of entries evicted to keep the cache within its size bound."
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self._entries = None
+        self._total_size = 0
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+
+    def _paths(self, key):
+        base = os.path.join(self.path, key)
+        return base + ".json", base + ".snap"
+
+    def _index(self):
+        """Get an ordered dict mapping entry keys to their sizes, from least to
+        most recently used. The caller must hold the lock."""
+
+        if self._entries is None:
+            found = []
+
+            for fn in os.listdir(self.path):
+                if not fn.endswith(".json"):
+                    continue
+
+                key = fn[:-5]
+                meta_path, snap_path = self._paths(key)
+
+                try:
+                    meta_stat = os.stat(meta_path)
+                    snap_stat = os.stat(snap_path)
+                except OSError:
+                    continue
+
+                # The metadata file is touched when its entry is used.
+                found.append(
+                    (meta_stat.st_mtime, key, meta_stat.st_size + snap_stat.st_size)
+                )
+
+            found.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self._total_size = sum(self._entries.values())
+
+        return self._entries
+
+    def _touch(self, key):
+        with self._lock:
+            entries = self._index()
+
+            # Another thread may have evicted the entry in the meantime.
+            if key not in entries:
+                return
+
+            entries.move_to_end(key)
+
+        try:
+            os.utime(self._paths(key)[0])
+        except OSError:
+            pass
+
+    def _remove(self, key):
+        with self._lock:
+            self._total_size -= self._index().pop(key, 0)
+
+            for path in self._paths(key):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _read_meta(self, key, url):
+        meta_path = self._paths(key)[0]
+
+        try:
+            with open(meta_path, "rt", encoding="utf8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("url") != url:
+            return None
+
+        return meta
+
+    def _read_object(self, key, cls):
+        try:
+            with open(self._paths(key)[1], "rb") as f:
+                obj = read_snapshot(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(obj, cls):
+            return None
+
+        return obj
+
+    def _store(self, key, meta, obj):
+        meta_path, snap_path = self._paths(key)
+
+        with self._lock:
+            self._remove(key)
+
+            # Write to temporary files first so that an interrupted update
+            # can't leave a mismatched entry behind.
+            with open(snap_path + ".tmp", "wb") as f:
+                write_snapshot(obj, f)
+            with open(meta_path + ".tmp", "wt", encoding="utf8") as f:
+                json.dump(meta, f)
+
+            os.replace(snap_path + ".tmp", snap_path)
+            os.replace(meta_path + ".tmp", meta_path)
+
+            size = os.stat(meta_path).st_size + os.stat(snap_path).st_size
+            entries = self._index()
+            entries[key] = size
+            self._total_size += size
+
+            while self._total_size > self.max_size and len(entries) > 1:
+                oldest = next(iter(entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def load(self, cls, url, session=None, lazy=False, **kwargs):
+        """Load an object from a URL, using the cache when possible.
+
+        Parameters
+        ----------
+        cls : subclass of :class:`~wwt_data_formats.LockedXmlTraits`
+            The class to deserialize the document into.
+        url : string
+            The URL from which to download the XML.
+        session : ``requests`` session or None (the default)
+            The HTTP communications session to use.
+        lazy : optional bool, default False
+            Whether to defer deserialization of list items when the document
+            is downloaded. Objects loaded from the cache are fully
+            deserialized.
+        kwargs
+            Extra arguments to pass to ``requests.get``.
+
+        Returns
+        -------
+        An instance of *cls*, initialized with data from the XML.
+
+        Notes
+        -----
+        This is what :meth:`~wwt_data_formats.LockedXmlTraits.from_url` calls
+        when it is given a cache. Each call returns a new object, so callers
+        are free to modify it.
+
+        """
+        if session is None:
+            import requests
+
+            session = requests
+
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base_headers = kwargs.pop("headers", None) or {}
+        meta = self._read_meta(key, url)
+        resp = None
+
+        if meta is not None:
+            headers = dict(base_headers)
+
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+            resp = session.get(url, headers=headers, **kwargs)
+
+            if resp.status_code == 304:
+                obj = self._read_object(key, cls)
+
+                if obj is not None:
+                    with self._lock:
+                        self.hits += 1
+
+                    self._touch(key)
+                    return obj
+
+                # The cached data are unusable. Start over.
+                self._remove(key)
+                resp = None
+
+        if resp is None:
+            resp = session.get(url, headers=base_headers, **kwargs)
+
+        with self._lock:
+            self.misses += 1
+
+        obj = cls.from_bytes(resp.content, lazy=lazy)
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+
+        if resp.status_code == 200 and (etag or last_modified):
+            self._store(
+                key,
+                {"url": url, "etag": etag, "last_modified": last_modified},
+                obj,
+            )
+        elif meta is not None:
+            self._remove(key)
+
+        return obj
+
+    def stats(self):
+        """Get statistics about this cache.
+
+        Returns
+        -------
+        A dictionary with the integer keys ``hits``, ``misses``, and
+        ``evictions``, the counters of this instance; and ``entries`` and
+        ``size``, the number of entries in the cache and their total size in
+        bytes.
+
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._index()),
+                "size": self._total_size,
+            }
+
+    def clear(self):
+        """Remove all entries from the cache.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            for key in list(self._index()):
+                self._remove(key)
@@ -0,0 +1,304 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+"""
+Measuring where time goes when processing WWT data.
+
+The main operations of this package are instrumented: XML deserialization
+and serialization, indentation, downloads, folder tree fetches, and the
+readers of the plate and file-cabinet container formats. When an
+:class:`Instrumentation` collector is active, each of these operations is
+timed and counted, and tallied by operation, class, and mode::
+
+    from wwt_data_formats.folder import Folder
+    from wwt_data_formats.instrument import Instrumentation
+
+    with Instrumentation() as stats:
+        Folder.from_file("index.wtml").to_xml_string()
+
+    print(stats.to_json())
+
+When no collector is active, an instrumentation point costs a single
+attribute lookup and comparison.
+
+The operations and their modes are:
+
+``parse``
+    Deserialization of one object from XML, in mode ``eager`` or ``lazy``.
+``serialize``
+    Serialization of one object to XML, in mode ``full``, or
+    ``incremental`` when only the modified parts of a change-tracked
+    element are updated.
+``indent_xml``
+    Indentation of an XML tree, tallied by the tag of its root.
+``from_url``
+    A download with :meth:`~wwt_data_formats.LockedXmlTraits.from_url`, in
+    mode ``download`` or ``cache`` depending on whether an HTTP cache was
+    used.
+``fetch_folder_tree``
+    A :func:`~wwt_data_formats.folder.fetch_folder_tree` operation.
+``open`` and ``read``
+    The opening of a plate, file-cabinet, or layer-container file and the
+    reading of an item from it.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__all__ = """
+Instrumentation
+""".split()
+
+import json
+import threading
+from time import perf_counter
+
+# The active collector, if any. The instrumented code checks this.
+_collector = None
+
+
+class Instrumentation(object):
+    """A collector of statistics about the operations of this package.
+
+    Parameters
+    ----------
+    hooks : optional iterable of callables
+        Functions to be called after each instrumented operation completes.
+        Each is called as ``hook(operation, class_name, mode, elapsed,
+        bytes_read, bytes_written)``, where *elapsed* is the wall time of the
+        operation in seconds.
+
+    Notes
+    -----
+    A collector gathers statistics while it is active. It can be activated
+    by using it as a context manager, or with :meth:`activate` and
+    :meth:`deactivate`. Only one collector may be active at a time, and
+    operations are attributed to it no matter which thread performs them.
+    Hooks may therefore be called from any thread.
+
+    Instrumented operations are often nested: deserializing a folder
+    deserializes its children. For each tally, ``time`` is the cumulative
+    wall time of the operation including nested operations, while
+    ``self_time`` excludes the time spent in nested instrumented operations
+    performed by the same thread.
+
+    """
+
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+        self._tallies = {}
+        self._lock = threading.Lock()
+
+        # The stack of operations in progress is per-thread, so that
+        # concurrent operations aren't mistaken for nested ones.
+        self._local = threading.local()
+
+    def activate(self):
+        """Start collecting statistics.
+
+        Returns
+        -------
+        *self*
+
+        """
+        global _collector
+
+        if _collector is not None:
+            raise RuntimeError("an Instrumentation collector is already active")
+
+        _collector = self
+        return self
+
+    def deactivate(self):
+        """Stop collecting statistics.
+
+        Returns
+        -------
+        *self*
+
+        """
+        global _collector
+
+        if _collector is self:
+            _collector = None
+            self._local = threading.local()
+
+        return self
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, *_exc):
+        self.deactivate()
+        return False
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    def _begin(self):
+        """Note the start of an operation, returning a token to pass to
+        :meth:`_end`."""
+        stack = self._stack()
+        stack.append([perf_counter(), 0.0])
+        return len(stack) - 1
+
+    def _end(self, token, operation, class_name, mode, bytes_read=0, bytes_written=0):
+        """Note the end of an operation."""
+        now = perf_counter()
+        stack = self._stack()
+
+        if token >= len(stack):
+            return  # the collector was reset mid-operation
+
+        start, child_time = stack[token]
+
+        # If a nested operation raised an exception, its frame was never
+        # popped. Discard it along with ours.
+        del stack[token:]
+
+        elapsed = now - start
+
+        if stack:
+            stack[-1][1] += elapsed
+
+        self.record(
+            operation,
+            class_name,
+            mode,
+            elapsed,
+            elapsed - child_time,
+            bytes_read,
+            bytes_written,
+        )
+
+    def record(
+        self,
+        operation,
+        class_name,
+        mode,
+        elapsed,
+        self_elapsed=None,
+        bytes_read=0,
+        bytes_written=0,
+    ):
+        """Record the completion of an operation.
+
+        Parameters
+        ----------
+        operation : string
+            The name of the operation.
+        class_name : string
+            The name of the class associated with the operation.
+        mode : string
+            The mode of the operation, which may be empty.
+        elapsed : float
+            The wall time of the operation, in seconds.
+        self_elapsed : optional float
+            The wall time of the operation, excluding nested operations. If
+            unspecified, this is the same as *elapsed*.
+        bytes_read : optional int
+            The number of bytes read by the operation.
+        bytes_written : optional int
+            The number of bytes written by the operation.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        This is called by the instrumented code, but can also be used to add
+        custom operations to the statistics.
+
+        """
+        if self_elapsed is None:
+            self_elapsed = elapsed
+
+        key = (operation, class_name, mode)
+
+        with self._lock:
+            tally = self._tallies.get(key)
+
+            if tally is None:
+                tally = self._tallies[key] = [0, 0.0, 0.0, 0, 0]
+
+            tally[0] += 1
+            tally[1] += elapsed
+            tally[2] += self_elapsed
+            tally[3] += bytes_read
+            tally[4] += bytes_written
+
+        for hook in self.hooks:
+            hook(operation, class_name, mode, elapsed, bytes_read, bytes_written)
+
+    def reset(self):
+        """Discard all of the statistics collected so far.
+
+        Returns
+        -------
+        *self*
+
+        """
+        with self._lock:
+            self._tallies.clear()
+
+        return self
+
+    def as_dict(self):
+        """Get the collected statistics as a dictionary.
+
+        Returns
+        -------
+        A dictionary with three keys. ``"operations"`` is a list of
+        dictionaries, one for each distinct combination of operation, class
+        name, and mode, with keys ``operation``, ``class``, ``mode``,
+        ``count``, ``time``, ``self_time``, ``bytes_read``, and
+        ``bytes_written``. The list is sorted by decreasing ``self_time``.
+        ``"bytes_read"`` and ``"bytes_written"`` are the overall totals.
+
+        """
+        operations = []
+
+        with self._lock:
+            tallies = [(key, list(tally)) for key, tally in self._tallies.items()]
+
+        for (operation, class_name, mode), tally in tallies:
+            operations.append(
+                {
+                    "operation": operation,
+                    "class": class_name,
+                    "mode": mode,
+                    "count": tally[0],
+                    "time": tally[1],
+                    "self_time": tally[2],
+                    "bytes_read": tally[3],
+                    "bytes_written": tally[4],
+                }
+            )
+
+        operations.sort(key=lambda op: op["self_time"], reverse=True)
+
+        return {
+            "operations": operations,
+            "bytes_read": sum(op["bytes_read"] for op in operations),
+            "bytes_written": sum(op["bytes_written"] for op in operations),
+        }
+
+    def to_json(self, indent=2):
+        """Get the collected statistics as JSON text.
+
+        Parameters
+        ----------
+        indent : optional int or None, default 2
+            The indentation of the JSON; see :func:`json.dumps`.
+
+        Returns
+        -------
+        The JSON serialization of :meth:`as_dict`.
+
+        """
+        return json.dumps(self.as_dict(), indent=indent)
@@ -28,7 +28,7 @@ LayerContainerXml
 
 from traitlets import Bool, Float, Instance, List, Unicode, Union
 
-from . import LockedXmlTraits, XmlSer
+from . import LockedXmlTraits, XmlSer, instrument as _instrument
 from .filecabinet import FileCabinetReader
 from .imageset import ImageSet
 
@@ -40,17 +40,23 @@ class LayerContainerReader(object):
     _info = None
 
     def __init__(self, stream):
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
+
         self._reader = FileCabinetReader(stream)
 
         for fn in self._reader.filenames():
             if fn.endswith('.wwtxml') and '\\' not in fn:
                 b = self._reader.read_file(fn)
-                text = b.decode('utf-8-sig')
-                self._info = LayerContainerXml.from_text(text)
+                self._info = LayerContainerXml.from_bytes(b)
 
         if self._info is None:
             raise Exception('found no ".wwtxml" file in WWTL file cabinet')
 
+        if collector is not None:
+            collector._end(token, 'open', self.__class__.__name__, '')
+
 
     def close(self):
         self._reader.close()
@@ -38,6 +38,8 @@ from io import BytesIO
 from struct import pack, unpack
 from typing import BinaryIO, List
 
+from . import instrument as _instrument
+
 
 class V1PlateReader(object):
     """Reader for the "V1" WWT plate file format.
@@ -57,6 +59,10 @@ class V1PlateReader(object):
     _levels: int
 
     def __init__(self, stream: BinaryIO):
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
+
         self._stream = stream
 
         # We must have random access to the stream.
@@ -70,6 +76,9 @@ class V1PlateReader(object):
 
         self._levels = levels
 
+        if collector is not None:
+            collector._end(token, "open", self.__class__.__name__, "", bytes_read=8)
+
     def close(self):
         """Close the underlying stream, making this object essentially unusable."""
         if self._stream is not None:
@@ -104,6 +113,10 @@ class V1PlateReader(object):
         if self._stream is None:
             raise Exception("cannot read a closed V1PlateReader")
 
+        collector = _instrument._collector
+        if collector is not None:
+            token = collector._begin()
+
         if level < 0 or level > self._levels:
             raise ValueError(f"invalid `level` {level}")
 
@@ -123,7 +136,14 @@ class V1PlateReader(object):
         offset, length = unpack("<II", self._stream.read(8))
 
         self._stream.seek(offset)
-        return self._stream.read(length)
+        data = self._stream.read(length)
+
+        if collector is not None:
+            collector._end(
+                token, "read", self.__class__.__name__, "", bytes_read=8 + len(data)
+            )
+
+        return data
 
 
 class V1PlateWriter(object):
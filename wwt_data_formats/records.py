@@ -0,0 +1,357 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+"""
+Lightweight, read-oriented record representations of WTML data.
+
+The main data classes of this package, like
+:class:`~wwt_data_formats.imageset.ImageSet`, are built on `traitlets`_, which
+provides validation and change notification but makes each object fairly
+expensive to create and to hold in memory. The record classes defined here
+have the same fields as their traitlets counterparts, but store them in plain
+``__slots__``. They are filled in from XML using the same serialization plan
+as the full classes and can be cheaply converted to and from them, so that
+pipelines that only need to read data can skip the traitlets machinery
+entirely.
+
+.. _traitlets: https://traitlets.readthedocs.io/
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__all__ = """
+FolderRecord
+ImageSetRecord
+PlaceRecord
+XmlRecord
+""".split()
+
+from argparse import Namespace
+
+from . import (
+    XmlSer,
+    _is_utf8_codec,
+    _parse_xml_stream,
+    _parse_xml_text,
+    _parse_context,
+)
+from .folder import Folder
+from .imageset import ImageSet
+from .place import Place
+
+_RECORD_CLASSES = {}
+
+
+def _record_class_for(traits_class):
+    rc = _RECORD_CLASSES.get(traits_class)
+    if rc is None:
+        raise ValueError(f"no record class is defined for {traits_class}")
+    return rc
+
+
+def _record_read_inner(step, elem):
+    rklass = _record_class_for(step.spec.klass)
+
+    for sub in elem:
+        value = rklass._maybe_from_xml(sub)
+        if value is not None:
+            return value
+
+    return None
+
+
+def _record_read_wrapped_inner(step, elem):
+    wrapper = elem.find(step.key)
+    if wrapper is None:
+        return None
+    return _record_read_inner(step, wrapper)
+
+
+def _record_read_inner_list(step, elem):
+    rklasses = [_record_class_for(k) for k in step.item_classes()]
+    value = []
+
+    for sub in elem:
+        for rklass in rklasses:
+            v = rklass._maybe_from_xml(sub)
+            if v is not None:
+                value.append(v)
+                break
+
+    return value
+
+
+def _record_read_wrapped_inner_list(step, elem):
+    wrapper = elem.find(step.key)
+    if wrapper is None:
+        return []
+    return _record_read_inner_list(step, wrapper)
+
+
+# Modes that contain nested objects need record-specific readers. The others
+# can use the readers of the serialization plan directly.
+
+_RECORD_READERS = {
+    XmlSer.INNER: _record_read_inner,
+    XmlSer.WRAPPED_INNER: _record_read_wrapped_inner,
+    XmlSer.INNER_LIST: _record_read_inner_list,
+    XmlSer.WRAPPED_INNER_LIST: _record_read_wrapped_inner_list,
+}
+
+_LIST_MODES = (XmlSer.INNER_LIST, XmlSer.WRAPPED_INNER_LIST)
+
+
+def _copy_to_traits(step, value):
+    if step.mode in _LIST_MODES:
+        return [c.to_traits() for c in value]
+    if isinstance(value, XmlRecord):
+        return value.to_traits()
+    if isinstance(value, Namespace):
+        return Namespace(**value.__dict__)
+    return value
+
+
+def _copy_from_traits(step, value):
+    if step.mode in _LIST_MODES:
+        return [_record_class_for(type(c)).from_traits(c) for c in value]
+    if isinstance(value, Namespace):
+        return Namespace(**value.__dict__)
+    if value is not None and step.mode in _RECORD_READERS:
+        return _record_class_for(type(value)).from_traits(value)
+    return value
+
+
+class _MetaXmlRecord(type):
+    """Metaclass that sets up the slots of a record class from the XML
+    serialization plan of its associated traitlets class."""
+
+    def __new__(mcls, name, bases, classdict, traits_class=None):
+        if traits_class is not None:
+            plan = traits_class._xml_plan
+            proto = traits_class()
+
+            classdict["__slots__"] = tuple(step.name for step in plan)
+            classdict["_traits_class"] = traits_class
+            classdict["_xml_plan"] = plan
+            classdict["_prototype"] = proto
+            classdict["_readers"] = tuple(
+                _RECORD_READERS.get(step.mode, step.read) for step in plan
+            )
+            classdict["_defaults"] = tuple(getattr(proto, step.name) for step in plan)
+
+        cls = super(_MetaXmlRecord, mcls).__new__(mcls, name, bases, classdict)
+
+        if traits_class is not None:
+            _RECORD_CLASSES[traits_class] = cls
+
+        return cls
+
+
+class XmlRecord(object, metaclass=_MetaXmlRecord):
+    """A base class for compact, slot-based records of XML-serializable data.
+
+    Subclasses are associated with a :class:`~wwt_data_formats.LockedXmlTraits`
+    class and have one attribute for each of its XML-serialized traits. Record
+    attributes are plain Python values with no validation or change
+    notification. Nested objects, such as the children of a folder, are
+    themselves records.
+
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for step, default in zip(self._xml_plan, self._defaults):
+            value = kwargs.pop(step.name, default)
+
+            # Don't share mutable defaults between records.
+            if value is default:
+                if isinstance(default, list):
+                    value = []
+                elif isinstance(default, Namespace):
+                    value = Namespace()
+
+            setattr(self, step.name, value)
+
+        if kwargs:
+            raise TypeError(
+                f"unexpected field(s) for {self.__class__.__name__}: {', '.join(kwargs)}"
+            )
+
+    def __repr__(self):
+        s = ", ".join(
+            "{}={!r}".format(step.name, getattr(self, step.name))
+            for step in self._xml_plan
+        )
+        return f"{self.__class__.__name__}({s})"
+
+    @classmethod
+    def _maybe_from_xml(cls, elem):
+        """Possibly create a record from an XML fragment, returning None if the
+        element doesn't represent this kind of record."""
+
+        if not cls._prototype._check_elem_is_this_type(elem):
+            return None
+
+        rec = cls.__new__(cls)
+
+        for step, read, default in zip(cls._xml_plan, cls._readers, cls._defaults):
+            value = read(step, elem)
+
+            if value is None:
+                value = default
+
+            setattr(rec, step.name, value)
+
+        return rec
+
+    @classmethod
+    def from_xml(cls, elem):
+        """Create a record from XML.
+
+        Parameters
+        ----------
+        elem : xml.etree.ElementTree.Element
+          An XML element serializing the object.
+
+        Returns
+        -------
+        An instance of the record class, initialized with data from the XML.
+
+        """
+        with _parse_context():
+            rec = cls._maybe_from_xml(elem)
+
+        if rec is None:
+            raise ValueError(
+                f"expected to get a {cls} instance from <{elem.tag}>, but didn't"
+            )
+        return rec
+
+    @classmethod
+    def from_text(cls, text):
+        """Create a record from XML-formatted text.
+
+        Parameters
+        ----------
+        text : string
+          The XML text.
+
+        Returns
+        -------
+        An instance of the record class, initialized with data from the XML.
+
+        """
+        return cls.from_xml(_parse_xml_text(text))
+
+    @classmethod
+    def from_file(cls, path, encoding="utf-8-sig"):
+        """Create a record from an XML file on local disk.
+
+        Parameters
+        ----------
+        path : string
+            The path of the XML file.
+        encoding : optional string, default "utf-8-sig"
+            The encoding of the file text.
+
+        Returns
+        -------
+        An instance of the record class, initialized with data from the XML.
+
+        """
+        if _is_utf8_codec(encoding):
+            with open(path, "rb") as f:
+                return cls.from_xml(_parse_xml_stream(f))
+
+        with open(path, "rt", encoding=encoding) as f:
+            text = f.read()
+
+        return cls.from_text(text)
+
+    @classmethod
+    def from_traits(cls, obj):
+        """Create a record from an instance of the associated traitlets class.
+
+        Parameters
+        ----------
+        obj : :class:`~wwt_data_formats.LockedXmlTraits`
+            The object to convert.
+
+        Returns
+        -------
+        A new record containing the same data. Nested objects are converted to
+        records as well.
+
+        """
+        rec = cls.__new__(cls)
+
+        for step in cls._xml_plan:
+            setattr(rec, step.name, _copy_from_traits(step, getattr(obj, step.name)))
+
+        return rec
+
+    def to_traits(self):
+        """Convert this record to an instance of the associated traitlets
+        class.
+
+        Returns
+        -------
+        A new instance of the traitlets class, such as
+        :class:`~wwt_data_formats.imageset.ImageSet`, containing the same
+        data. Nested records are converted as well.
+
+        """
+        inst = self._traits_class()
+
+        for step, default in zip(self._xml_plan, self._defaults):
+            value = getattr(self, step.name)
+
+            # Only values that differ from the defaults need to pass through
+            # traitlets.
+            if value is not default:
+                setattr(inst, step.name, _copy_to_traits(step, value))
+
+        return inst
+
+
+class ImageSetRecord(XmlRecord, traits_class=ImageSet):
+    """A compact record of the data of an
+    :class:`~wwt_data_formats.imageset.ImageSet`."""
+
+
+class PlaceRecord(XmlRecord, traits_class=Place):
+    """A compact record of the data of a :class:`~wwt_data_formats.place.Place`."""
+
+    def as_imageset(self):
+        """Return an ImageSetRecord for this place if one is defined.
+
+        This has the same semantics as
+        :meth:`wwt_data_formats.place.Place.as_imageset`.
+
+        """
+        if self.foreground_image_set is not None:
+            return self.foreground_image_set
+        return self.image_set
+
+
+class FolderRecord(XmlRecord, traits_class=Folder):
+    """A compact record of the data of a
+    :class:`~wwt_data_formats.folder.Folder`."""
+
+    def walk(self):
+        """Walk this folder and its descendants.
+
+        This behaves like :meth:`wwt_data_formats.folder.Folder.walk` with
+        ``download=False``: it yields tuples of ``(depth, path, item)``.
+
+        """
+        yield (0, (), self)
+
+        for index, child in enumerate(self.children):
+            if isinstance(child, FolderRecord):
+                for depth, path, subchild in child.walk():
+                    yield (depth + 1, (index,) + path, subchild)
+            else:
+                yield (1, (index,), child)
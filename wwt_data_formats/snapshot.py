@@ -0,0 +1,345 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+"""
+A compact binary snapshot format for WTML data.
+
+Parsing XML is relatively slow, so services that repeatedly load the same
+large collection can save it as a snapshot once and reload the snapshot
+instead. A snapshot records the XML-serialized traits of an object tree, such
+as a :class:`~wwt_data_formats.folder.Folder` and all of its children, and
+reloads into an object tree that serializes to exactly the same XML.
+
+The format is private to this package and is versioned. A snapshot file
+consists of:
+
+- The eight magic bytes ``b"WWTSNAP\\n"`` and a 16-bit format version number.
+- A JSON schema listing each class found in the tree along with the names and
+  storage kinds of its fields.
+- A string table: every distinct string in the tree, stored once.
+- The objects, in depth-first order. Each object is a class index followed by
+  a fixed-size block holding its scalar fields (numbers natively, strings and
+  enumeration values as string-table indices), then its variable-sized
+  fields.
+
+Runtime metadata (``rmeta``) is not saved.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__all__ = """
+read_snapshot
+write_snapshot
+""".split()
+
+import json
+import struct
+
+from traitlets import Bool, Float, Int, Unicode, UseEnum
+
+from . import LockedXmlTraits, XmlSer
+
+SNAPSHOT_MAGIC = b"WWTSNAP\n"
+SNAPSHOT_VERSION = 1
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U32_PAIR = struct.Struct("<II")
+_NO_OBJECT = 0xFFFF
+
+# Storage kinds of fields. The scalar kinds are struct format codes.
+
+_SCALAR_KINDS = (
+    (Bool, "?"),
+    (Float, "d"),
+    (Int, "q"),
+    (Unicode, "s"),
+    (UseEnum, "e"),
+)
+
+_KIND_NAMESPACE = "ns"
+_KIND_OBJECT = "obj"
+_KIND_LIST = "list"
+
+
+def _field_kind(step):
+    if step.mode == XmlSer.NS_TO_ATTR:
+        return _KIND_NAMESPACE
+    if step.mode in (XmlSer.INNER, XmlSer.WRAPPED_INNER):
+        return _KIND_OBJECT
+    if step.mode in (XmlSer.INNER_LIST, XmlSer.WRAPPED_INNER_LIST):
+        return _KIND_LIST
+
+    for trait_type, kind in _SCALAR_KINDS:
+        if isinstance(step.spec, trait_type):
+            return kind
+
+    raise ValueError(
+        f"cannot snapshot trait {step.name!r} of type {step.spec.__class__.__name__}"
+    )
+
+
+def _snapshot_classes():
+    """Get the classes that may appear in a snapshot, keyed by qualified name.
+
+    Class names are read from the snapshot file, so they're only resolved
+    against the XML classes defined by this package, never imported.
+
+    """
+    from . import folder, imageset, layers, place  # noqa: F401
+
+    classes = {}
+    todo = [LockedXmlTraits]
+
+    while todo:
+        klass = todo.pop()
+        todo.extend(klass.__subclasses__())
+
+        if klass.__module__.split(".")[0] == "wwt_data_formats" and getattr(
+            klass, "_xml_plan", None
+        ):
+            classes[f"{klass.__module__}.{klass.__name__}"] = klass
+
+    return classes
+
+
+def _struct_format(kinds):
+    return "<" + "".join("I" if k in "se" else k for k in kinds)
+
+
+class _ClassCodec(object):
+    """Encoding and decoding information for one class in a snapshot."""
+
+    __slots__ = ("cls", "scalars", "complex", "struct")
+
+    def __init__(self, cls, fields):
+        self.cls = cls
+        self.scalars = []
+        self.complex = []
+
+        for name, kind in fields:
+            if kind == _KIND_NAMESPACE:
+                self.complex.append((name, kind, cls.class_traits()[name].klass))
+            elif kind in (_KIND_OBJECT, _KIND_LIST):
+                self.complex.append((name, kind, None))
+            elif kind == "e":
+                self.scalars.append((name, kind, cls.class_traits()[name].enum_class))
+            else:
+                self.scalars.append((name, kind, None))
+
+        self.struct = struct.Struct(_struct_format(k for _, k, _ in self.scalars))
+
+    @classmethod
+    def for_class(cls, klass):
+        return cls(klass, [(step.name, _field_kind(step)) for step in klass._xml_plan])
+
+    @classmethod
+    def from_schema(cls, qualname, fields):
+        klass = _snapshot_classes().get(qualname)
+
+        if klass is None:
+            raise ValueError(f"snapshot contains unknown class {qualname!r}")
+
+        expected = dict((step.name, _field_kind(step)) for step in klass._xml_plan)
+
+        for name, kind in fields:
+            if expected.get(name) != kind:
+                raise ValueError(
+                    f"snapshot field {name!r} of {qualname} is incompatible with "
+                    "the current version of the class"
+                )
+
+        return cls(klass, fields)
+
+    def schema(self):
+        fields = [(name, kind) for name, kind, _ in self.scalars + self.complex]
+        return [f"{self.cls.__module__}.{self.cls.__name__}", fields]
+
+
+class _Encoder(object):
+    def __init__(self):
+        self.codecs = {}
+        self.class_indices = {}
+        self.strings = {}
+        self.body = bytearray()
+
+    def intern(self, s):
+        idx = self.strings.get(s)
+        if idx is None:
+            if "\0" in s:
+                raise ValueError("cannot snapshot a string containing a NUL character")
+            idx = self.strings[s] = len(self.strings)
+        return idx
+
+    def encode(self, obj):
+        body = self.body
+
+        if obj is None:
+            body += _U16.pack(_NO_OBJECT)
+            return
+
+        cls = obj.__class__
+        codec = self.codecs.get(cls)
+
+        if codec is None:
+            codec = self.codecs[cls] = _ClassCodec.for_class(cls)
+            self.class_indices[cls] = len(self.class_indices)
+
+        body += _U16.pack(self.class_indices[cls])
+
+        values = []
+
+        for name, kind, _enum in codec.scalars:
+            value = getattr(obj, name)
+
+            if kind == "s":
+                value = self.intern(value)
+            elif kind == "e":
+                value = self.intern(value.name)
+
+            values.append(value)
+
+        body += codec.struct.pack(*values)
+
+        for name, kind, _klass in codec.complex:
+            value = getattr(obj, name)
+
+            if kind == _KIND_NAMESPACE:
+                items = value.__dict__.items()
+                body += _U32.pack(len(items))
+
+                for k, v in items:
+                    body += _U32_PAIR.pack(self.intern(k), self.intern(str(v)))
+            elif kind == _KIND_OBJECT:
+                self.encode(value)
+            else:
+                body += _U32.pack(len(value))
+
+                for item in value:
+                    self.encode(item)
+
+
+def write_snapshot(obj, stream):
+    """Write a binary snapshot of an object tree.
+
+    Parameters
+    ----------
+    obj : :class:`~wwt_data_formats.LockedXmlTraits`
+        The object to save, such as a :class:`~wwt_data_formats.folder.Folder`.
+    stream : writeable, bytes-based file-like object
+        The destination of the snapshot data.
+
+    """
+    enc = _Encoder()
+    enc.encode(obj)
+
+    schema = json.dumps(
+        {"classes": [c.schema() for c in enc.codecs.values()]},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    strings = "\0".join(enc.strings).encode("utf-8")
+
+    stream.write(SNAPSHOT_MAGIC)
+    stream.write(_U16.pack(SNAPSHOT_VERSION))
+    stream.write(_U32.pack(len(schema)))
+    stream.write(schema)
+    stream.write(_U32.pack(len(enc.strings)))
+    stream.write(_U32.pack(len(strings)))
+    stream.write(strings)
+    stream.write(enc.body)
+
+
+def read_snapshot(stream):
+    """Read a binary snapshot of an object tree.
+
+    Parameters
+    ----------
+    stream : readable, bytes-based file-like object
+        The source of the snapshot data.
+
+    Returns
+    -------
+    The root object of the tree saved with :func:`write_snapshot`.
+
+    """
+    buf = stream.read()
+
+    if buf[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("data are not a wwt_data_formats snapshot")
+
+    pos = len(SNAPSHOT_MAGIC)
+    (version,) = _U16.unpack_from(buf, pos)
+    pos += _U16.size
+
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"unsupported snapshot format version {version} (expected {SNAPSHOT_VERSION})"
+        )
+
+    (n,) = _U32.unpack_from(buf, pos)
+    pos += _U32.size
+    schema = json.loads(buf[pos : pos + n].decode("utf-8"))
+    pos += n
+    codecs = [_ClassCodec.from_schema(q, f) for q, f in schema["classes"]]
+
+    (n_strings,) = _U32.unpack_from(buf, pos)
+    pos += _U32.size
+    (n,) = _U32.unpack_from(buf, pos)
+    pos += _U32.size
+    strings = buf[pos : pos + n].decode("utf-8").split("\0") if n_strings else []
+    pos += n
+
+    def decode(pos):
+        (class_index,) = _U16.unpack_from(buf, pos)
+        pos += _U16.size
+
+        if class_index == _NO_OBJECT:
+            return None, pos
+
+        codec = codecs[class_index]
+        values = codec.struct.unpack_from(buf, pos)
+        pos += codec.struct.size
+
+        # As with unpickling, the values were validated when the snapshot was
+        # created, so we bypass traitlets when installing them.
+        inst = codec.cls()
+        trait_values = inst._trait_values
+
+        for (name, kind, enum), value in zip(codec.scalars, values):
+            if kind == "s":
+                value = strings[value]
+            elif kind == "e":
+                value = enum[strings[value]]
+
+            trait_values[name] = value
+
+        for name, kind, klass in codec.complex:
+            if kind == _KIND_NAMESPACE:
+                (n,) = _U32.unpack_from(buf, pos)
+                pos += _U32.size
+                value = trait_values[name] = klass()
+
+                for _ in range(n):
+                    k, v = _U32_PAIR.unpack_from(buf, pos)
+                    pos += _U32_PAIR.size
+                    setattr(value, strings[k], strings[v])
+            elif kind == _KIND_OBJECT:
+                trait_values[name], pos = decode(pos)
+            else:
+                (n,) = _U32.unpack_from(buf, pos)
+                pos += _U32.size
+                value = trait_values[name] = []
+
+                for _ in range(n):
+                    item, pos = decode(pos)
+                    value.append(item)
+
+        return inst, pos
+
+    obj, pos = decode(pos)
+
+    if pos != len(buf):
+        raise ValueError("unexpected trailing data in snapshot")
+
+    return obj
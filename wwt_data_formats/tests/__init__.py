@@ -4,9 +4,12 @@
 
 __all__ = '''
 assert_xml_trees_equal
+http_server
+serve_folder_tree
 tempdir
 test_path
 work_in_tempdir
+xml_backend
 '''.split()
 
 import os.path
@@ -67,3 +70,110 @@ def work_in_tempdir():
     # Windows can't remove the temp tree unless we chdir out of it.
     os.chdir(prev_dir)
     shutil.rmtree(d)
+
+
+@pytest.fixture(params=['stdlib', 'lxml'])
+def xml_backend(request):
+    from .. import get_xml_backend, set_xml_backend
+
+    if request.param == 'lxml':
+        pytest.importorskip('lxml')
+
+    prev = get_xml_backend()
+    set_xml_backend(request.param)
+    yield request.param
+    set_xml_backend(prev)
+
+
+@pytest.fixture
+def http_server():
+    """Serve a temporary directory over HTTP on localhost.
+
+    Yields a namespace with attributes ``root``, the directory being served;
+    ``url``, the base URL of the server; and ``requests``, a list of the paths
+    requested so far. Tests can also set ``delay``, a number of seconds to
+    wait before answering each request, and ``failures``, a dict mapping paths
+    to a number of times to answer requests for them with a 503 error. The
+    attribute ``max_active`` records the largest number of requests handled
+    at once.
+    """
+    from argparse import Namespace
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+    from threading import Lock, Thread
+    import time
+
+    root = tempfile.mkdtemp()
+    requests = []
+    lock = Lock()
+    active = [0]
+
+    class Handler(SimpleHTTPRequestHandler):
+        def send_head(self):
+            requests.append(self.path)
+
+            with lock:
+                active[0] += 1
+                state.max_active = max(state.max_active, active[0])
+
+            try:
+                time.sleep(state.delay)
+
+                with lock:
+                    n_failures = state.failures.get(self.path, 0)
+                    if n_failures:
+                        state.failures[self.path] = n_failures - 1
+
+                if n_failures:
+                    self.send_error(503)
+                    return None
+
+                return super(Handler, self).send_head()
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('localhost', 0), partial(Handler, directory=root))
+    thread = Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    state = Namespace(
+        root=root,
+        url='http://localhost:{}/'.format(httpd.server_address[1]),
+        requests=requests,
+        delay=0,
+        failures={},
+        max_active=0,
+    )
+    yield state
+
+    httpd.shutdown()
+    httpd.server_close()
+    shutil.rmtree(root)
+
+
+def serve_folder_tree(server):
+    """Write a small tree of linked WTML folders into an :func:`http_server`.
+
+    The root folder links to ``a.wtml`` twice, once directly and once through
+    an inline subfolder, and to ``b.wtml``; ``a.wtml`` links to ``c.wtml``.
+    Returns the URL of the root folder.
+    """
+    def link(name):
+        return '<Folder Name="{0}" Url="{1}{0}.wtml" />'.format(name, server.url)
+
+    docs = {
+        'index': [link('a'), '<Folder Name="Inline">' + link('a') + '</Folder>', link('b')],
+        'a': [link('c'), '<Place Name="pa" />'],
+        'b': ['<Place Name="pb" />'],
+        'c': ['<ImageSet Name="ic" Url="http://example.com/ic.png" />'],
+    }
+
+    for name, children in docs.items():
+        with open(os.path.join(server.root, name + '.wtml'), 'wt', encoding='utf8') as f:
+            f.write('<Folder Name="{}">{}</Folder>'.format(name, ''.join(children)))
+
+    return server.url + 'index.wtml'
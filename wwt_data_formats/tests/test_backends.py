@@ -0,0 +1,83 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import glob
+import pytest
+import sys
+from xml.etree import ElementTree as etree
+
+from . import test_path, xml_backend
+from .. import get_xml_backend, set_xml_backend, stringify_xml_doc, _parse_xml_text
+from .. import folder, imageset, place
+
+
+def _documents():
+    docs = []
+
+    for path in sorted(glob.glob(test_path("*.wtml"))):
+        f = folder.Folder.from_file(path)
+        docs.append(f.to_xml_string())
+        docs.append(f.to_xml_string(indent=False))
+
+        # Reindent and update a tree as it came from the parser
+        with open(path, "rt", encoding="utf-8-sig") as fin:
+            elem = _parse_xml_text(fin.read())
+        f.apply_to_xml(elem)
+        docs.append(stringify_xml_doc(elem))
+
+    imgset = imageset.ImageSet()
+    imgset.name = 'Tab\tand <escapes> & "quotes"\nnewline'
+    imgset.credits = "<b>Credits</b> & more"
+    imgset.description = "Carriage\rreturns\r\nin text"
+
+    # Before Python 3.9, ElementTree writes carriage returns in attributes as
+    # newlines.
+    if sys.version_info >= (3, 9):
+        imgset.alt_url = "carriage\rreturn"
+
+    pl = place.Place(foreground_image_set=imgset)
+    f = folder.Folder(children=[pl, imageset.ImageSet()])
+    docs.append(f.to_xml_string())
+
+    return docs
+
+
+def test_backends_agree(xml_backend):
+    observed = _documents()
+
+    set_xml_backend("stdlib")
+    expected = _documents()
+
+    assert observed == expected
+
+
+def test_element_types(xml_backend):
+    elem = place.Place().to_xml()
+
+    if xml_backend == "lxml":
+        from lxml import etree as lxml_etree
+
+        assert isinstance(elem, lxml_etree._Element)
+    else:
+        assert isinstance(elem, etree.Element)
+
+
+def test_apply_to_foreign_tree(xml_backend):
+    # Trees from the standard library must be usable whatever the backend.
+    elem = etree.fromstring("<Place><Extra /></Place>")
+    pl = place.Place.from_xml(elem)
+    pl.image_set = imageset.ImageSet()
+    pl.apply_to_xml(elem)
+
+    assert isinstance(elem.find("ImageSet"), etree.Element)
+    assert elem.find("Extra") is not None
+
+
+def test_bad_backend():
+    with pytest.raises(ValueError):
+        set_xml_backend("libxml9000")
+
+    assert get_xml_backend() in ("lxml", "stdlib")
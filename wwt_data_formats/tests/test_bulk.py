@@ -0,0 +1,57 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import pickle
+import pytest
+
+from . import test_path
+from .. import bulk, folder, imageset, place, records
+from ..enums import DataSetType
+
+
+def test_pickle():
+    f = folder.Folder.from_file(test_path("test1_rel.wtml"))
+    f.rmeta.note = "hello"
+    f.children[0].image_set = imageset.ImageSet(
+        name="is", data_set_type=DataSetType.SKY
+    )
+    f.children[0].image_set.xmeta.Extra = "x"
+
+    data = pickle.dumps(f, pickle.HIGHEST_PROTOCOL)
+    f2 = pickle.loads(data)
+
+    assert f2.to_xml_string() == f.to_xml_string()
+    assert f2.rmeta.note == "hello"
+    assert f2.children[0].xmeta == f.children[0].xmeta
+    assert f2.children[0].image_set.xmeta.Extra == "x"
+    assert f2.children[0].image_set.data_set_type == DataSetType.SKY
+
+    # The result is still a normal traitlets object.
+    f2.name = "renamed"
+    assert f2.name == "renamed"
+    assert pickle.loads(pickle.dumps(place.Place())).rmeta.__dict__ == {}
+
+    with pytest.raises(AttributeError):
+        f2.nonexistent = 1
+
+    lazy = folder.Folder.from_file(test_path("test1_rel.wtml"), lazy=True)
+    assert pickle.loads(pickle.dumps(lazy)).to_xml_string() == lazy.to_xml_string()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_files(workers):
+    paths = [test_path("test1_rel.wtml"), test_path("report_rel.wtml")] * 3
+    expected = [folder.Folder.from_file(p).to_xml_string() for p in paths]
+
+    results = list(bulk.parse_files(paths, workers=workers))
+    assert [p for p, _ in results] == paths
+    assert [f.to_xml_string() for _, f in results] == expected
+
+    results = list(bulk.parse_files(paths, workers=workers, ordered=False))
+    assert sorted(p for p, _ in results) == sorted(paths)
+
+    results = list(bulk.parse_files(paths, workers=workers, cls=records.FolderRecord))
+    assert all(isinstance(f, records.FolderRecord) for _, f in results)
@@ -0,0 +1,59 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+from xml.etree import ElementTree as etree
+
+from .. import folder, place
+
+
+def test_clone():
+    f = folder.Folder.from_text(
+        """
+<Folder Name="top">
+  <Place Name="p" Xfoo="bar">
+    <ForegroundImageSet><ImageSet Name="fg" /></ForegroundImageSet>
+  </Place>
+  <Folder Name="sub"><Place Name="q" /></Folder>
+</Folder>
+"""
+    )
+    f.rmeta.tags = ["a"]
+    c = f.clone()
+
+    assert type(c) is folder.Folder
+    assert c.to_xml_string() == f.to_xml_string()
+    assert c.content_equals(f)
+    assert c.rmeta.tags == ["a"] and c.rmeta.tags is not f.rmeta.tags
+
+    p, cp = f.children[0], c.children[0]
+    assert cp is not p
+    assert cp.foreground_image_set is not p.foreground_image_set
+    assert cp.xmeta is not p.xmeta and cp.xmeta.foo == "bar"
+
+    cp.xmeta.foo = "baz"
+    cp.foreground_image_set.name = "changed"
+    c.children[1].children.append(place.Place())
+    c.children.pop()
+    assert f.to_xml_string() != c.to_xml_string()
+    assert p.xmeta.foo == "bar"
+    assert p.foreground_image_set.name == "fg"
+    assert len(f.children) == 2 and len(f.children[1].children) == 1
+
+    # Lazy and change-tracked objects clone into plain ones.
+    text = f.to_xml_string()
+    lz = folder.Folder.from_text(text, lazy=True)
+    lz.children[1].name = "renamed"
+    c = lz.clone()
+    assert not c.children.is_loaded(0) and c.children.is_loaded(1)
+    assert c.children[1] is not lz.children[1]
+    assert c.to_xml_string() == lz.to_xml_string()
+
+    elem = etree.fromstring(text)
+    tracked = folder.Folder.from_xml(elem, track_changes=True)
+    c = tracked.clone()
+    c.children[0].name = "other"
+    tracked.apply_to_xml(elem)
+    assert elem[0].get("Name") == "p"
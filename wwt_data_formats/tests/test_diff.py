@@ -0,0 +1,113 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import os.path
+
+from . import tempdir
+from .. import cli, folder
+
+
+DIFF_OLD_XML_STRING = """
+<Folder Name="top">
+  <Place Name="same" RA="1" />
+  <Place Name="moved" RA="2" Xfoo="a">
+    <ForegroundImageSet><ImageSet Name="fg" Url="fg.png" /></ForegroundImageSet>
+  </Place>
+  <Folder Name="sub">
+    <ImageSet Name="old-name" Url="img.toast" />
+    <Place Name="gone" />
+  </Folder>
+  <Folder Name="dropped"><Place Name="inner" /></Folder>
+</Folder>
+"""
+
+
+DIFF_NEW_XML_STRING = """
+<Folder Name="top">
+  <Folder Name="sub">
+    <ImageSet Name="new-name" Url="img.toast" />
+    <Place Name="fresh" />
+  </Folder>
+  <Place Name="moved" RA="3" Xfoo="b">
+    <ForegroundImageSet><ImageSet Name="fg" Url="fg2.png" /></ForegroundImageSet>
+  </Place>
+  <Place Name="same" RA="1" />
+</Folder>
+"""
+
+
+def test_diff(tempdir, capsys):
+    old = folder.Folder.from_text(DIFF_OLD_XML_STRING)
+    new = folder.Folder.from_text(DIFF_NEW_XML_STRING)
+    assert old.diff(old.clone()) == []
+
+    entries = dict(((e.kind, e.path), e) for e in old.diff(new))
+    assert sorted(entries) == [
+        ("added", ("sub", "fresh")),
+        ("modified", ("moved",)),
+        ("modified", ("sub", "new-name")),
+        ("removed", ("dropped",)),
+        ("removed", ("sub", "gone")),
+    ]
+
+    e = entries["modified", ("moved",)]
+    assert e.old is old.children[1] and e.new is new.children[1]
+    assert e.changes == [
+        ("foreground_image_set.url", "fg.png", "fg2.png"),
+        ("ra_hr", 2.0, 3.0),
+        ("xmeta.foo", "a", "b"),
+    ]
+    assert entries["modified", ("sub", "new-name")].changes == [
+        ("name", "old-name", "new-name")
+    ]
+
+    paths = []
+    for name, text in (("old", DIFF_OLD_XML_STRING), ("new", DIFF_NEW_XML_STRING)):
+        paths.append(os.path.join(tempdir, name + ".wtml"))
+        with open(paths[-1], "wt", encoding="utf8") as f:
+            f.write(text)
+
+    cli.entrypoint(["wtml", "diff"] + paths)
+    out = capsys.readouterr().out.splitlines()
+    assert "~ Place moved" in out
+    assert "    ra_hr: 2.0 -> 3.0" in out
+    assert "+ Place sub/fresh" in out
+    assert "- Folder dropped" in out
+    assert out[-1] == "1 added, 2 removed, 2 modified"
+
+    # Nested objects are described by their type and name.
+    for path, text in zip(
+        paths,
+        (
+            '<Folder><Place Name="p" /></Folder>',
+            '<Folder><Place Name="p"><ForegroundImageSet><ImageSet Name="fg" />'
+            "</ForegroundImageSet></Place></Folder>",
+        ),
+    ):
+        with open(path, "wt", encoding="utf8") as f:
+            f.write(text)
+
+    cli.entrypoint(["wtml", "diff"] + paths)
+    out = capsys.readouterr().out.splitlines()
+    assert out == [
+        "~ Place p",
+        "    foreground_image_set: None -> ImageSet 'fg'",
+        "0 added, 0 removed, 1 modified",
+    ]
+
+    # Siblings with the same name are paired by content first.
+    old = folder.Folder.from_text(
+        '<Folder><Place Name="a" RA="1" /><Place Name="a" RA="2" /></Folder>'
+    )
+    new = folder.Folder.from_text(
+        '<Folder><Place Name="a" RA="2" /><Place Name="a" RA="1" /></Folder>'
+    )
+    assert old.diff(new) == []
+
+    new.children[1].ra_hr = 3.0
+    entries = old.diff(new)
+    assert [e.kind for e in entries] == ["modified"]
+    assert entries[0].old is old.children[0] and entries[0].new is new.children[1]
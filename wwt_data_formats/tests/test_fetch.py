@@ -0,0 +1,254 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import os.path
+import pytest
+
+from . import http_server, serve_folder_tree, tempdir
+from .. import folder
+
+
+def _read_tree_files(root):
+    files = {}
+
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for fn in filenames:
+            if fn != "index.wtml":
+                continue
+
+            path = os.path.join(dirpath, fn)
+
+            with open(path, "rt", encoding="utf8") as f:
+                files[os.path.relpath(path, root)] = f.read()
+
+    return files
+
+
+def test_fetch_folder_tree(http_server, tempdir):
+    url = serve_folder_tree(http_server)
+    fetched = []
+    folder.fetch_folder_tree(url, tempdir, on_fetch=fetched.append)
+
+    # The second link to a.wtml, in the inline folder, is skipped.
+    assert fetched == [url] + [http_server.url + n + ".wtml" for n in "acb"]
+    assert sorted(_read_tree_files(tempdir)) == [
+        os.path.join("000_a", "000_c", "index.wtml"),
+        os.path.join("000_a", "index.wtml"),
+        os.path.join("002_b", "index.wtml"),
+        "index.wtml",
+    ]
+
+    names = [item.name for _, item in folder.walk_cached_folder_tree(tempdir)]
+    assert names == ["index", "a", "c", "ic", "pa", "Inline", "b", "pb"]
+
+
+def test_fetch_folder_tree_async(http_server, tempdir):
+    pytest.importorskip("aiohttp")
+    import asyncio
+    from .. import open_async_session
+
+    url = serve_folder_tree(http_server)
+    sync_dir = os.path.join(tempdir, "sync")
+    async_dir = os.path.join(tempdir, "async")
+    os.mkdir(sync_dir)
+    os.mkdir(async_dir)
+
+    folder.fetch_folder_tree(url, sync_dir)
+    del http_server.requests[:]
+    asyncio.run(folder.fetch_folder_tree_async(url, async_dir, max_concurrency=2))
+    assert _read_tree_files(async_dir) == _read_tree_files(sync_dir)
+    assert sorted(http_server.requests) == [
+        "/a.wtml",
+        "/b.wtml",
+        "/c.wtml",
+        "/index.wtml",
+    ]
+
+    async def fetch_all():
+        async with open_async_session(limit_per_host=1) as session:
+            return await asyncio.gather(
+                *(
+                    folder.Folder.from_url_async(
+                        http_server.url + n + ".wtml", session=session
+                    )
+                    for n in "abc"
+                )
+            )
+
+    assert [f.name for f in asyncio.run(fetch_all())] == ["a", "b", "c"]
+
+    # Unloaded items are reserialized verbatim, so compare the content.
+    f = asyncio.run(folder.Folder.from_url_async(url, lazy=True))
+    assert f.content_equals(folder.Folder.from_url(url))
+
+
+def test_fetch_folder_tree_threaded(http_server, tempdir):
+    from .. import open_session
+
+    url = serve_folder_tree(http_server)
+    sync_dir = os.path.join(tempdir, "sync")
+    threaded_dir = os.path.join(tempdir, "threaded")
+    os.mkdir(sync_dir)
+    os.mkdir(threaded_dir)
+
+    folder.fetch_folder_tree(url, sync_dir)
+    del http_server.requests[:]
+
+    # Transient failures are retried, and requests to the one host are capped.
+    http_server.delay = 0.05
+    http_server.failures["/b.wtml"] = 1
+    fetched = []
+
+    with open_session(backoff=0.01) as session:
+        folder.fetch_folder_tree(
+            url,
+            threaded_dir,
+            on_fetch=fetched.append,
+            max_workers=4,
+            session=session,
+            limit_per_host=2,
+        )
+
+    assert _read_tree_files(threaded_dir) == _read_tree_files(sync_dir)
+    assert sorted(fetched) == sorted(set(fetched))
+    assert sorted(http_server.requests) == [
+        "/a.wtml",
+        "/b.wtml",
+        "/b.wtml",
+        "/c.wtml",
+        "/index.wtml",
+    ]
+    assert http_server.max_active == 2
+
+    # Closing the loader cancels the downloads that haven't started.
+    import threading
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def block(session, url):
+        started.set()
+        release.wait()
+        return url
+
+    loader = folder._ThreadedLoader(1)
+    first = loader.call(url, block)
+    rest = [loader.call(url, block) for _ in range(3)]
+    started.wait()
+    threading.Timer(0.05, release.set).start()
+    loader.close()
+    assert first.result() == url
+    assert all(f.cancelled() for f in rest)
+
+
+def test_fetch_folder_tree_incremental(http_server, tempdir):
+    import time
+    from .. import open_session
+
+    url = serve_folder_tree(http_server)
+    sync_dir = os.path.join(tempdir, "sync")
+    inc_dir = os.path.join(tempdir, "inc")
+    os.mkdir(sync_dir)
+    os.mkdir(inc_dir)
+    folder.fetch_folder_tree(url, sync_dir)
+
+    def fetch(**kwargs):
+        del http_server.requests[:]
+        return folder.fetch_folder_tree(url, inc_dir, incremental=True, **kwargs)
+
+    def mtimes():
+        return dict(
+            (p, os.stat(os.path.join(inc_dir, p)).st_mtime_ns)
+            for p in _read_tree_files(inc_dir)
+        )
+
+    assert fetch() == {"fetched": 4, "unchanged": 0, "resumed": 0, "failed": 0}
+    assert _read_tree_files(inc_dir) == _read_tree_files(sync_dir)
+    assert os.path.exists(os.path.join(inc_dir, "fetch-manifest.json"))
+    first = mtimes()
+
+    # Unchanged folders are revalidated but not rewritten.
+    assert fetch(max_workers=2)["unchanged"] == 4
+    assert mtimes() == first
+
+    b_path = os.path.join(http_server.root, "b.wtml")
+    with open(b_path, "wt", encoding="utf8") as f:
+        f.write('<Folder Name="b"><Place Name="new" /></Folder>')
+    later = time.time() + 10
+    os.utime(b_path, (later, later))
+
+    assert fetch() == {"fetched": 1, "unchanged": 3, "resumed": 0, "failed": 0}
+    b_file = os.path.join("002_b", "index.wtml")
+    assert "new" in _read_tree_files(inc_dir)[b_file]
+    assert [p for p, t in mtimes().items() if t != first[p]] == [b_file]
+
+    # Failures keep the saved copies.
+    http_server.failures["/c.wtml"] = 1
+    with open_session(retries=0) as session:
+        counts = fetch(session=session)
+    assert (counts["failed"], counts["unchanged"]) == (1, 3)
+    assert len(_read_tree_files(inc_dir)) == 4
+
+    # An interrupted fetch is resumed.
+    resume_dir = os.path.join(tempdir, "resume")
+    os.mkdir(resume_dir)
+
+    def interrupt(fetched_url):
+        if fetched_url.endswith("c.wtml"):
+            raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        folder.fetch_folder_tree(url, resume_dir, on_fetch=interrupt, incremental=True)
+
+    del http_server.requests[:]
+    counts = folder.fetch_folder_tree(url, resume_dir, incremental=True)
+    assert counts["resumed"] >= 2
+    assert counts["resumed"] + counts["fetched"] == 4
+    assert "/index.wtml" not in http_server.requests
+    assert "/c.wtml" in http_server.requests
+    assert _read_tree_files(resume_dir) == _read_tree_files(inc_dir)
+
+
+def test_walk_prefetch(http_server):
+    url = serve_folder_tree(http_server)
+
+    def walk(**kwargs):
+        root = folder.Folder.from_url(url)
+        return [(d, p, i) for d, p, i in root.walk(download=True, **kwargs)]
+
+    plain = walk()
+    assert len(http_server.requests) == 6
+    del http_server.requests[:]
+
+    http_server.delay = 0.05
+    prefetched = walk(prefetch=4)
+    assert [(d, p, i.name) for d, p, i in prefetched] == [
+        (d, p, i.name) for d, p, i in plain
+    ]
+    assert [i.to_xml_string() for _, _, i in prefetched] == [
+        i.to_xml_string() for _, _, i in plain
+    ]
+
+    # Each linked folder is downloaded only once, concurrently, and repeated
+    # links get their own copies.
+    assert sorted(http_server.requests) == [
+        "/a.wtml",
+        "/b.wtml",
+        "/c.wtml",
+        "/index.wtml",
+    ]
+    assert http_server.max_active > 1
+    a1, a2 = [i for _, _, i in prefetched if i.name == "a"]
+    assert a1 is not a2
+    assert a1.to_xml_string() == a2.to_xml_string()
+
+    # Walks with a single prefetch thread run to completion too, and walks
+    # can be stopped early. Either way the downloader shuts down cleanly.
+    assert [i.name for _, _, i in walk(prefetch=1)] == [i.name for _, _, i in plain]
+
+    walker = folder.Folder.from_url(url).walk(download=True, prefetch=2)
+    next(walker)
+    walker.close()
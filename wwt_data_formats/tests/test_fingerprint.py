@@ -0,0 +1,65 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+from argparse import Namespace
+
+from .. import folder, imageset
+
+
+XML_STRING = """
+<Folder Browseable="True" Group="Explorer" Searchable="True" Type="Sky">
+    <Folder Url="http://example.com/child1.wtml" />
+    <Place Name="Somewhere" DataSetType="Sky" RA="1.5" Dec="-20" ZoomLevel="4" />
+</Folder>
+"""
+
+
+def test_fingerprint():
+    f1 = folder.Folder.from_text(XML_STRING)
+    f2 = folder.Folder.from_text(XML_STRING, lazy=True)
+    fp = f1.fingerprint()
+    assert len(fp) == 32
+    assert f2.fingerprint() == fp
+    assert f1.content_equals(f2)
+    assert f1.content_hash() == f2.content_hash()
+    assert f1 != f2
+    assert not f1.content_equals(f1.to_xml_string())
+
+    # Modifications anywhere in the tree invalidate the cached fingerprint,
+    # and undoing them restores it.
+    f1.children[1].name = "Changed"
+    assert f1.fingerprint() != fp
+    f1.children[1].name = f2.children[1].name
+    assert f1.fingerprint() == fp
+
+    f1.children.append(folder.Folder())
+    assert f1.fingerprint() != fp
+    f1.children.pop()
+    assert f1.fingerprint() == fp
+
+    f1.children[1].xmeta.Extra = "1"
+    assert f1.fingerprint() != fp
+    del f1.children[1].xmeta.Extra
+    assert f1.fingerprint() == fp
+
+    # So do modifications of containers that replaced equal ones, which
+    # traitlets doesn't report.
+    f1.children = list(f1.children)
+    f1.children.append(folder.Folder())
+    assert f1.fingerprint() != fp
+    assert not f1.content_equals(f2)
+    f1.children.pop()
+    assert f1.content_equals(f2)
+
+    f1.children[1].xmeta = Namespace()
+    f1.children[1].xmeta.Extra = "1"
+    assert f1.fingerprint() != fp
+
+    # Explicitly-set default values and runtime metadata don't matter.
+    f3 = folder.Folder(name="x", browseable=True)
+    f3.rmeta.note = "hello"
+    assert f3.content_equals(folder.Folder(name="x"))
+    assert not f3.content_equals(imageset.ImageSet(name="x"))
@@ -9,7 +9,13 @@ import os.path
 import pytest
 from xml.etree import ElementTree as etree
 
-from . import assert_xml_trees_equal, tempdir, test_path, work_in_tempdir
+from . import (
+    assert_xml_trees_equal,
+    tempdir,
+    test_path,
+    work_in_tempdir,
+    xml_backend,
+)
 from .. import cli, folder, imageset, place
 
 
@@ -63,6 +69,9 @@ def fake_request_session_send(request, **kwargs):
             f"unexpected URL to fake requests.Session.send(): {request.url}"
         )
 
+    rv.content = rv.text.encode("utf-8")
+    rv.status_code = 200
+    rv.headers = {}
     return rv
 
 
@@ -160,6 +169,9 @@ def test_fetch_tree(fake_requests, tempdir):
     for item in folder.walk_cached_folder_tree(tempdir):
         pass
 
+    items = list(folder.walk_cached_folder_tree(tempdir, records=True))
+    assert [treepath for treepath, _ in items] == [(), (0,), (0, 0), (1,)]
+
 
 def test_basic_url_mutation():
     f = folder.Folder()
@@ -221,3 +233,228 @@ def test_wtml_rewrite_urls(work_in_tempdir):
 
     f = folder.Folder.from_file("index.wtml")
     assert f.url == "https://example.com/updir/somewhere.wtml"
+
+
+def test_iter_children():
+    f = folder.Folder.from_file(test_path("test1_rel.wtml"))
+    expected = [c.to_xml_string() for c in f.children]
+
+    observed = [
+        c.to_xml_string()
+        for c in folder.Folder.iter_children_from_file(test_path("test1_rel.wtml"))
+    ]
+    assert observed == expected
+
+    from io import BytesIO
+
+    stream = BytesIO(b"\xef\xbb\xbf" + ROOT_XML_STRING.encode("utf-8"))
+    children = list(folder.Folder.iter_children_from_stream(stream))
+    assert len(children) == 2
+    assert isinstance(children[0], folder.Folder)
+    assert children[0].url == "http://example.com/child1.wtml"
+    assert isinstance(children[1], place.Place)
+
+    with pytest.raises(ValueError):
+        list(folder.Folder.iter_children_from_stream(BytesIO(b"<Place />")))
+
+
+def test_tree_cli_offline(fake_requests, work_in_tempdir):
+    cli.entrypoint(["tree", "fetch", "http://example.com/root.wtml"])
+    cli.entrypoint(["tree", "summarize"])
+    cli.entrypoint(["tree", "print-image-urls"])
+    cli.entrypoint(["tree", "print-dem-urls"])
+
+    # Incremental fetches, which keep a manifest, are opt-in.
+    assert not os.path.exists("fetch-manifest.json")
+    cli.entrypoint(["tree", "fetch", "--incremental", "http://example.com/root.wtml"])
+    assert os.path.exists("fetch-manifest.json")
+
+
+def test_lazy_children(xml_backend):
+    eager = folder.Folder.from_text(ROOT_XML_STRING)
+    f = folder.Folder.from_text(ROOT_XML_STRING, lazy=True)
+
+    assert len(f.children) == len(eager.children)
+    assert not any(f.children.is_loaded(i) for i in range(len(f.children)))
+
+    # Only the accessed child is deserialized.
+    c = f.children[1]
+    assert f.children.is_loaded(1)
+    assert not f.children.is_loaded(0)
+    assert c.to_xml_string() == eager.children[1].to_xml_string()
+    assert f.children[1] is c
+
+    # Untouched children are reserialized verbatim.
+    observed = f.to_xml()
+    assert_xml_trees_equal(etree.fromstring(ROOT_XML_STRING), observed)
+    assert observed[0].attrib == {"Url": "http://example.com/child1.wtml"}
+
+    # Once loaded, children are reserialized normally.
+    f.children[0]
+    assert f.to_xml_string() == eager.to_xml_string()
+
+    # Mutations work as usual.
+    c.name = "Modified"
+    eager.children[1].name = "Modified"
+    f.children.append(place.Place())
+    eager.children.append(place.Place())
+    assert f.to_xml_string() == eager.to_xml_string()
+
+    # The same goes for applying to the tree we came from.
+    elem = etree.fromstring(eager.to_xml_string())
+    f2 = folder.Folder.from_xml(elem, lazy=True)
+    f2.children[2].name = "Also modified"
+    eager.children[2].name = "Also modified"
+    f2.apply_to_xml(elem)
+    assert_xml_trees_equal(eager.to_xml(), elem)
+
+    assert [(d, p) for d, p, _ in f.walk()] == [(d, p) for d, p, _ in eager.walk()]
+
+    with pytest.raises(IndexError):
+        f.children[100]
+
+    # The list idioms used with eager folders work too. Extending in place
+    # keeps the untouched children lazy.
+    lz = folder.Folder.from_text(ROOT_XML_STRING, lazy=True)
+    lz.children += [place.Place(name="Added")]
+    assert len(lz.children) == 3
+    assert not lz.children.is_loaded(0)
+    assert lz.children[2].name == "Added"
+
+    combined = lz.children + [place.Place()]
+    assert isinstance(combined, list) and len(combined) == 4
+    assert len([place.Place()] + lz.children) == 4
+
+    other = folder.Folder()
+    other.children = lz.children
+    assert type(other.children) is list
+    assert other.children[2] is lz.children[2]
+
+
+def test_trusted():
+    from traitlets import observe
+
+    class ObservedFolder(folder.Folder):
+        seen = []
+
+        @observe("name")
+        def _on_name(self, change):
+            self.seen.append(change["new"])
+
+    text = open(test_path("test1_rel.wtml"), encoding="utf-8-sig").read()
+
+    # By default, deserialized values go through the usual traitlets
+    # machinery.
+    strict = ObservedFolder.from_text(text)
+    assert ObservedFolder.seen == [strict.name]
+
+    ObservedFolder.seen.clear()
+    fast = ObservedFolder.from_text(text, trusted=True)
+    assert ObservedFolder.seen == []
+
+    assert fast.to_xml_string() == strict.to_xml_string()
+    assert fast.children[0].xmeta == strict.children[0].xmeta
+
+    # Lazily loaded items are treated like the rest of their document.
+    lazy = folder.Folder.from_text(text, lazy=True, trusted=True)
+    assert lazy.children._trusted
+    assert lazy.children[0].to_xml_string() == strict.children[0].to_xml_string()
+    assert not folder.Folder.from_text(text, lazy=True).children._trusted
+
+    # Values installed on the fast path behave normally afterwards.
+    changes = []
+    fast.observe(changes.append, names=["name"])
+    fast.name = "New"
+    assert changes[0]["old"] == strict.name
+
+
+def test_string_table(xml_backend):
+    f = folder.Folder.from_text(
+        """
+<Folder>
+  <ImageSet Name="a" FileType=".png" Xfoo="shared"><Credits>Some credits</Credits></ImageSet>
+  <ImageSet Name="b" FileType=".png" Xfoo="shared"><Credits>Some credits</Credits></ImageSet>
+</Folder>
+"""
+    )
+    a, b = f.children
+    assert a.file_type is b.file_type
+    assert a.credits is b.credits
+    assert a.xmeta.foo is b.xmeta.foo
+
+    # Lazily loaded items are deduplicated one at a time, and the table of
+    # strings isn't kept around.
+    lazy = folder.Folder.from_text(
+        '<Folder><Place Name="shared name" Xfoo="shared"><ForegroundImageSet>'
+        '<ImageSet Name="shared name" Xfoo="shared" /></ForegroundImageSet>'
+        "</Place></Folder>",
+        lazy=True,
+    )
+    p = lazy.children[0]
+    assert p.name is p.foreground_image_set.name
+    assert p.xmeta.foo is p.foreground_image_set.xmeta.foo
+
+    from .. import _parse_state
+
+    assert _parse_state.strings is None
+
+    from ..records import FolderRecord
+
+    a, b = FolderRecord.from_text(f.to_xml_string()).children
+    assert a.credits is b.credits
+
+
+def test_from_bytes(xml_backend, tempdir):
+    # Some WWT files have a BOM and declare an encoding that they don't use.
+    data = (
+        b'\xef\xbb\xbf<?xml version="1.0" encoding="utf-16"?>\n'
+        b'<Folder Name="Caf\xc3\xa9"><Place Name="\xe2\x98\x85" /></Folder>'
+    )
+    expected = folder.Folder.from_text(data.decode("utf-8-sig"))
+    assert expected.name == "Café"
+
+    path = os.path.join(tempdir, "bom.wtml")
+    with open(path, "wb") as f:
+        f.write(data)
+
+    for f in (
+        folder.Folder.from_bytes(data),
+        folder.Folder.from_bytes(data[3:]),
+        folder.Folder.from_stream(open(path, "rb")),
+        folder.Folder.from_file(path),
+        folder.Folder.from_file(path, encoding="utf8"),
+    ):
+        assert f.to_xml_string() == expected.to_xml_string()
+
+    assert folder.Folder.from_bytes(data, lazy=True).children[0].name == "★"
+
+
+def test_extend_children():
+    from traitlets import TraitError
+
+    f = folder.Folder()
+    changes = []
+    f.observe(changes.append, names=["children"])
+
+    f.extend_children([place.Place(), folder.Folder()])
+    f.extend_children(iter([]))
+    assert len(f.children) == 2
+    assert len(changes) == 1
+
+    with pytest.raises(TraitError):
+        f.extend_children([place.Place(), "not a child"])
+    assert len(f.children) == 2
+
+    with f.building_children() as children:
+        children.append(imageset.ImageSet())
+        children.extend([place.Place(), place.Place()])
+        assert len(f.children) == 2
+
+    assert len(f.children) == 5
+    assert len(changes) == 2
+
+    # Cached serializations notice the change.
+    f.enable_xml_cache()
+    assert f.to_xml_string().count("<Place") == 3
+    f.extend_children([place.Place()])
+    assert f.to_xml_string().count("<Place") == 4
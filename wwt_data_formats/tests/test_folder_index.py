@@ -0,0 +1,100 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from .. import folder, imageset, place
+
+
+def test_folder_index():
+    def check(index, root):
+        walked = list(root.walk())
+        assert len(index) == len(walked)
+
+        for _depth, path, item in walked:
+            assert index.item_at(path) is item
+            assert index.path_of(item) == path
+
+    pl = place.Place(name="p")
+    iset = imageset.ImageSet(
+        name="i", url="http://x/i", alt_url="http://x/alt", dem_url="http://x/dem"
+    )
+    sub = folder.Folder(name="sub", url="http://x/sub.wtml")
+    sub.children = [iset, place.Place(name="p")]
+    root = folder.Folder(name="root")
+    root.children = [pl, sub]
+
+    index = folder.FolderIndex(root)
+    check(index, root)
+    assert index.find("name", "p") == [pl, sub.children[1]]
+    assert index.find("url", "http://x/sub.wtml") == [sub]
+    assert index.find("alt_url", "http://x/alt") == [iset]
+    assert index.find("dem_url", "http://x/dem") == [iset]
+    assert index.find("name", "missing") == []
+    assert index.parent_of(iset) is sub
+    assert index.parent_of(root) is None
+    assert index.ancestors(iset) == [sub, root]
+    assert index.ancestors(root) == []
+
+    with pytest.raises(ValueError):
+        index.find("ra_hr", 1)
+    with pytest.raises(KeyError):
+        index.path_of(place.Place())
+
+    # Additions and removals through the API are picked up.
+    extra = folder.Folder(name="extra")
+    extra.children = [place.Place(name="q")]
+    sub.extend_children([extra])
+    check(index, root)
+    assert index.ancestors(extra.children[0]) == [extra, sub, root]
+
+    rest = [c for c in root.children if c is not pl]
+    root.children = [place.Place(name="new")] + rest
+    check(index, root)
+    assert pl not in index
+    assert index.find("name", "p") == [sub.children[1]]
+    assert index.path_of(extra) == (1, 2)
+
+    sub.children = []
+    check(index, root)
+    assert index.find("name", "q") == []
+    assert extra not in index
+
+    # Items can be moved between folders, in either order.
+    a = folder.Folder(name="a", children=[place.Place(name="moving")])
+    b = folder.Folder(name="b")
+    root.extend_children([a, b])
+    moving = a.children[0]
+    b.children = [moving]
+    a.children = []
+    check(index, root)
+    assert index.parent_of(moving) is b
+    assert index.find("name", "moving") == [moving]
+
+    a.children = [moving]
+    b.children = []
+    check(index, root)
+    assert index.ancestors(moving) == [a, root]
+
+    b.children = [a]
+    root.children = [c for c in root.children if c is not a]
+    check(index, root)
+    assert index.ancestors(moving) == [a, b, root]
+
+    # Other changes need a refresh.
+    root.children.append(iset)
+    root.children[0].name = "renamed"
+    index.refresh(root).refresh(root.children[0])
+    check(index, root)
+    assert index.find("name", "new") == []
+    assert index.find("name", "renamed") == [root.children[0]]
+
+    n_indexed = len(index)
+    index.close()
+    root.children = []
+    assert len(index) == n_indexed
+    index.refresh()
+    check(index, root)
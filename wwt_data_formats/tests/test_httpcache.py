@@ -0,0 +1,111 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+from mock import Mock
+import os.path
+import time
+
+from . import http_server, serve_folder_tree, tempdir
+from ..folder import Folder
+from ..httpcache import HttpCache
+
+
+def test_last_modified(http_server, tempdir):
+    url = serve_folder_tree(http_server)
+    cache = HttpCache(tempdir)
+
+    f1 = Folder.from_url(url, cache=cache)
+    f2 = Folder.from_url(url, cache=cache)
+    assert f2 is not f1
+    assert f2.to_xml_string() == f1.to_xml_string()
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "entries": 1,
+        "size": cache.stats()["size"],
+    }
+
+    # The cache persists across instances, and modifications are noticed.
+    path = os.path.join(http_server.root, "index.wtml")
+    with open(path, "wt", encoding="utf8") as f:
+        f.write('<Folder Name="modified" />')
+    later = time.time() + 10
+    os.utime(path, (later, later))
+
+    cache = HttpCache(tempdir)
+    assert Folder.from_url(url, cache=cache).name == "modified"
+    assert Folder.from_url(url, cache=cache).name == "modified"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_walk(http_server, tempdir):
+    url = serve_folder_tree(http_server)
+    cache = HttpCache(tempdir)
+
+    def walk():
+        root = Folder.from_url(url, cache=cache)
+        return [item.name for _, _, item in root.walk(download=True, cache=cache)]
+
+    # The second link to a.wtml and its child c.wtml are already cached.
+    names = walk()
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert walk() == names
+    assert (cache.hits, cache.misses) == (8, 4)
+
+
+def _fake_response(status_code, text="", headers={}):
+    resp = Mock()
+    resp.status_code = status_code
+    resp.text = text
+    resp.content = text.encode("utf-8")
+    resp.headers = headers
+    return resp
+
+
+def test_etag_and_eviction(tempdir):
+    session = Mock()
+    cache = HttpCache(tempdir)
+
+    session.get.return_value = _fake_response(
+        200, '<Folder Name="one" />', {"ETag": '"v1"'}
+    )
+    f = Folder.from_url("http://example.com/1", session=session, cache=cache)
+    assert f.name == "one"
+    assert session.get.call_args[1]["headers"] == {}
+
+    session.get.return_value = _fake_response(304)
+    f = Folder.from_url(
+        "http://example.com/1", session=session, cache=cache, headers={"X": "y"}
+    )
+    assert f.name == "one"
+    assert session.get.call_args[1]["headers"] == {"X": "y", "If-None-Match": '"v1"'}
+
+    # Documents without validators aren't cached.
+    session.get.return_value = _fake_response(200, '<Folder Name="two" />')
+    Folder.from_url("http://example.com/2", session=session, cache=cache)
+    assert cache.stats()["entries"] == 1
+
+    # Least-recently-used entries are evicted to stay within the size bound.
+    cache.max_size = cache.stats()["size"] * 2 + 10
+
+    for n in ("2", "3", "1", "4"):
+        session.get.return_value = _fake_response(
+            200, f'<Folder Name="{n}" />', {"ETag": '"v2"'}
+        )
+        Folder.from_url("http://example.com/" + n, session=session, cache=cache)
+
+    assert cache.evictions == 3
+    assert HttpCache(tempdir).stats()["entries"] == 2
+
+    session.get.return_value = _fake_response(304)
+
+    for n in ("1", "4"):
+        f = Folder.from_url("http://example.com/" + n, session=session, cache=cache)
+        assert f.name == n
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
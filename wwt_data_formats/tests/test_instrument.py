@@ -0,0 +1,123 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os.path
+import pytest
+import sys
+
+from . import http_server, serve_folder_tree, tempdir, test_path, xml_backend
+from .. import folder, layers, plate
+from ..instrument import Instrumentation
+
+
+def _tallies(stats):
+    return dict(
+        ((op["operation"], op["class"], op["mode"]), op)
+        for op in stats.as_dict()["operations"]
+    )
+
+
+def test_xml(xml_backend):
+    text = '<Folder><Place Name="a" /><Folder Name="b"><Place Name="c" /></Folder></Folder>'
+    events = []
+
+    with Instrumentation(hooks=[lambda *args: events.append(args[:3])]) as stats:
+        f = folder.Folder.from_text(text)
+        f.to_xml_string()
+        folder.Folder.from_text(text, lazy=True)
+
+        with pytest.raises(RuntimeError):
+            Instrumentation().activate()
+
+    folder.Folder.from_text(text)
+
+    t = _tallies(stats)
+    assert t["parse", "Folder", "eager"]["count"] == 2
+    assert t["parse", "Place", "eager"]["count"] == 2
+    assert t["parse", "Folder", "lazy"]["count"] == 1
+    assert t["serialize", "Folder", "full"]["count"] == 2
+    assert t["serialize", "Place", "full"]["count"] == 2
+    assert t["indent_xml", "Folder", xml_backend]["count"] == 1
+
+    # Parent times include their children's.
+    outer = t["parse", "Folder", "eager"]
+    assert outer["time"] >= outer["self_time"] >= 0
+    assert len(events) == sum(op["count"] for op in t.values())
+
+    d = json.loads(stats.to_json())
+    assert d == json.loads(json.dumps(stats.as_dict()))
+    assert d["bytes_read"] == d["bytes_written"] == 0
+
+    stats.reset()
+    assert stats.as_dict()["operations"] == []
+
+
+def test_threads():
+    text = '<Folder><Place Name="a" /><Folder Name="b"><Place Name="c" /></Folder></Folder>'
+
+    def work(_):
+        for _ in range(50):
+            folder.Folder.from_text(text)
+
+    # Switch threads often, so that their operations interleave.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    try:
+        with Instrumentation() as stats:
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(work, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    # Operations in other threads aren't mistaken for nested ones.
+    t = _tallies(stats)
+    assert t["parse", "Folder", "eager"]["count"] == 800
+    assert t["parse", "Place", "eager"]["count"] == 800
+
+    for op in t.values():
+        assert op["time"] >= op["self_time"] >= 0
+
+
+def test_readers(tempdir):
+    path = os.path.join(tempdir, "test.plate")
+
+    with plate.V1PlateWriter(open(path, "wb"), 1) as pw:
+        pw.append_bytes(0, 0, 0, b"000")
+        pw.append_bytes(1, 1, 1, b"111")
+
+    with Instrumentation() as stats:
+        with plate.V1PlateReader(open(path, "rb")) as pr:
+            pr.read_tile(0, 0, 0)
+            pr.read_tile(1, 1, 1)
+
+        layers.LayerContainerReader.from_file(test_path("imagesetlayer.wwtl")).close()
+
+    t = _tallies(stats)
+    assert t["open", "V1PlateReader", ""]["bytes_read"] == 8
+    assert t["read", "V1PlateReader", ""]["count"] == 2
+    assert t["read", "V1PlateReader", ""]["bytes_read"] == 22
+    assert t["open", "LayerContainerReader", ""]["count"] == 1
+    assert t["open", "FileCabinetReader", ""]["count"] == 1
+    assert t["read", "FileCabinetReader", ""]["bytes_read"] > 0
+    assert t["parse", "LayerContainerXml", "eager"]["count"] == 1
+
+
+def test_network(http_server, tempdir):
+    url = serve_folder_tree(http_server)
+
+    with Instrumentation() as stats:
+        folder.Folder.from_url(url)
+        folder.fetch_folder_tree(url, tempdir)
+
+    t = _tallies(stats)
+    assert t["from_url", "Folder", "download"]["count"] == 1
+    assert t["from_url", "Folder", "download"]["bytes_read"] > 0
+    fetch = t["fetch_folder_tree", "Folder", ""]
+    assert fetch["count"] == 1
+    assert fetch["bytes_read"] == fetch["bytes_written"] > 0
@@ -209,3 +209,18 @@ def test_update_constellation_semantics():
     assert pl.ra_hr == 0
     assert pl.dec_deg == 0
     assert pl.constellation == Constellation.UNSPECIFIED
+
+
+def test_xml_plan():
+    pl = place.Place()
+    steps = place.Place._xml_plan
+
+    assert [s.name for s in steps] == list(pl.traits(xml=lambda a: a is not None))
+
+    by_name = dict((s.name, s) for s in steps)
+    assert by_name["ra_hr"].key == "RA"
+    assert by_name["ra_hr"].sky_type_filter is True
+    assert by_name["latitude"].sky_type_filter is False
+    assert by_name["distance"].stringify(0.0) == ""
+    assert by_name["magnitude"].stringify(0.0) == "0"
+    assert by_name["magnitude"].stringify(1.5) == "1.5"
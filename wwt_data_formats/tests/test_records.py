@@ -0,0 +1,62 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from . import test_path
+from .. import folder, imageset, place, records
+from ..enums import DataSetType
+
+
+def test_roundtrip():
+    path = test_path("test1_rel.wtml")
+    f = folder.Folder.from_file(path)
+    rec = records.FolderRecord.from_file(path)
+
+    assert rec.name == f.name
+    assert isinstance(rec.children[0], records.PlaceRecord)
+    assert rec.to_traits().to_xml_string() == f.to_xml_string()
+
+    rec2 = records.FolderRecord.from_traits(f)
+    assert rec2.to_traits().to_xml_string() == f.to_xml_string()
+    assert rec2.children[0].xmeta == f.children[0].xmeta
+    assert rec2.children[0].xmeta is not f.children[0].xmeta
+
+
+def test_walk():
+    pl = place.Place(data_set_type=DataSetType.SKY)
+    pl.foreground_image_set = imageset.ImageSet(url="fg.png")
+    f = folder.Folder(children=[folder.Folder(children=[pl]), imageset.ImageSet()])
+
+    rec = records.FolderRecord.from_text(f.to_xml_string())
+    items = [(depth, path, type(item)) for depth, path, item in rec.walk()]
+    assert items == [
+        (0, (), records.FolderRecord),
+        (1, (0,), records.FolderRecord),
+        (2, (0, 0), records.PlaceRecord),
+        (1, (1,), records.ImageSetRecord),
+    ]
+
+    prec = rec.children[0].children[0]
+    assert prec.as_imageset().url == "fg.png"
+    assert prec.data_set_type == DataSetType.SKY
+
+
+def test_construction():
+    r1 = records.ImageSetRecord(name="a")
+    r2 = records.ImageSetRecord()
+    assert r1.name == "a"
+    assert r2.name == ""
+    assert r1.xmeta is not r2.xmeta
+
+    with pytest.raises(TypeError):
+        records.ImageSetRecord(nonexistent=1)
+
+    with pytest.raises(AttributeError):
+        r1.nonexistent = 1
+
+    with pytest.raises(ValueError):
+        records.PlaceRecord.from_text("<ImageSet />")
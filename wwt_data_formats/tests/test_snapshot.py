@@ -0,0 +1,71 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import os.path
+import pytest
+
+from . import tempdir, test_path
+from .. import folder, imageset, place
+
+
+def test_snapshot(tempdir):
+    f = folder.Folder.from_file(test_path("test1_rel.wtml"))
+    sub = folder.Folder(name="Ünïcode\ttext", msr_community_id=-12)
+    pl = place.Place(name="", ra_hr=1.0 / 3, dec_deg=-1e-300)
+    pl.foreground_image_set = imageset.ImageSet(description="Long\ntext")
+    pl.xmeta.Extra = 17
+    sub.children = [pl, imageset.ImageSet(), folder.Folder()]
+    f.children.append(sub)
+
+    path = os.path.join(tempdir, "snap.bin")
+    f.save_snapshot(path)
+    f2 = folder.Folder.load_snapshot(path)
+
+    assert f2.to_xml_string() == f.to_xml_string()
+    assert f2.children[1].children[0].ra_hr == 1.0 / 3
+    assert f2.children[1].children[0].xmeta.Extra == "17"
+    assert f2.children[1].children[0].background_image_set is None
+    f2.children[1].name = "OK"
+
+    with open(path, "r+b") as stream:
+        stream.seek(8)
+        stream.write(b"\xff")
+
+    with pytest.raises(ValueError):
+        folder.Folder.load_snapshot(path)
+
+    with pytest.raises(ValueError):
+        folder.Folder.load_snapshot(test_path("test1_rel.wtml"))
+
+    from ..snapshot import write_snapshot
+
+    with open(path, "wb") as stream:
+        write_snapshot(place.Place(), stream)
+
+    with pytest.raises(ValueError):
+        folder.Folder.load_snapshot(path)
+
+    # Class names in the schema are never imported.
+    from ..snapshot import _ClassCodec
+
+    for qualname in ("os.system", "wwt_data_formats.folder.FolderIndex", "Folder"):
+        with pytest.raises(ValueError):
+            _ClassCodec.from_schema(qualname, [])
+
+    f.save_snapshot(path)
+
+    with open(path, "rb") as stream:
+        data = stream.read()
+
+    # Pad with JSON whitespace to keep the schema length unchanged.
+    qualname = b'"wwt_data_formats.folder.Folder"'
+    crafted = b'"subprocess.Popen"'.ljust(len(qualname))
+
+    with open(path, "wb") as stream:
+        stream.write(data.replace(qualname, crafted))
+
+    with pytest.raises(ValueError):
+        folder.Folder.load_snapshot(path)
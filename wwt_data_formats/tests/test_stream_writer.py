@@ -0,0 +1,45 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from . import test_path, xml_backend
+from .. import folder, imageset, place
+
+
+def test_stream_writer(xml_backend):
+    from io import BytesIO
+
+    src = folder.Folder.from_file(test_path("test1_rel.wtml"))
+    sub = folder.Folder(name="Sub")
+    sub.children = [imageset.ImageSet(), place.Place()]
+    children = src.children + [sub, place.Place()]
+
+    for kids in ([], children):
+        for indent in (True, False):
+            f = folder.Folder(name="A & B", type="SKY")
+            f.children = list(kids)
+            expected = f.to_xml_string(indent=indent)
+
+            stream = BytesIO()
+            with folder.FolderStreamWriter(
+                stream, f, indent=indent, dest_wants_bytes=True
+            ) as w:
+                for c in kids:
+                    w.add(c)
+
+            assert stream.getvalue().decode("utf-8") == expected
+
+    stream = BytesIO()
+    w = folder.FolderStreamWriter(stream, {"name": "X"}, dest_wants_bytes=True)
+    w.add(place.Place()).close()
+    w.close()
+    f = folder.Folder.from_text(stream.getvalue().decode("utf-8"))
+    assert f.name == "X"
+    assert len(f.children) == 1
+
+    with pytest.raises(ValueError):
+        w.add(place.Place())
@@ -0,0 +1,98 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+from argparse import Namespace
+
+from . import xml_backend
+from .. import folder, imageset, place
+
+
+def test_track_changes(xml_backend):
+    from .. import _parse_xml_text
+
+    f = folder.Folder()
+    f.children = [place.Place(name=f"p{i}") for i in range(4)]
+    f.children[2].foreground_image_set = imageset.ImageSet(name="fg")
+    sub = folder.Folder(name="sub", children=[imageset.ImageSet(name="deep")])
+    f.children.append(sub)
+    text = f.to_xml_string()
+
+    elem = _parse_xml_text(text)
+    f = folder.Folder.from_xml(elem, track_changes=True)
+
+    # Mark all of the elements so that we can tell which ones get rewritten.
+    def sabotage():
+        for e in elem.iter():
+            if e.get("Name") is not None:
+                e.set("Name", "stale")
+
+    sabotage()
+    f.apply_to_xml(elem)
+    assert all(e.get("Name") in (None, "stale") for e in elem.iter())
+
+    f.children[1].name = "renamed"
+    f.children[2].foreground_image_set.name = "fg2"
+    f.children[3].xmeta.Extra = "1"
+    f.children[4].children[0].name = "deep2"
+    f.apply_to_xml(elem)
+
+    assert elem[0].get("Name") == "stale"
+    assert elem[1].get("Name") == "renamed"
+    assert elem[2].get("Name") == "stale"
+    assert elem[2].find("ForegroundImageSet")[0].get("Name") == "fg2"
+    assert elem[3].get("XExtra") == "1"
+    assert elem[4].get("Name") == "stale"
+    assert elem[4][0].get("Name") == "deep2"
+
+    # Removed values are removed from the XML.
+    f.children[2].foreground_image_set = None
+    del f.children[3].xmeta.Extra
+    f.children[1].name = ""
+    f.apply_to_xml(elem)
+    assert elem[2].find("ForegroundImageSet") is None
+    assert elem[3].get("XExtra") is None
+    assert elem[1].get("Name") is None
+    f.children[1].name = "renamed"
+    f.apply_to_xml(elem)
+
+    # Once applied, changes aren't reapplied.
+    sabotage()
+    f.apply_to_xml(elem)
+    assert elem[1].get("Name") == "stale"
+
+    # In-place modifications of lists are caught, and new items are tracked
+    # after they're applied.
+    f.children[0] = place.Place(name="new")
+    f.apply_to_xml(elem)
+    assert elem[0].get("Name") == "new"
+    f.children[0].name = "newer"
+    f.apply_to_xml(elem)
+    assert elem[0].get("Name") == "newer"
+
+    # Assigning an equal container doesn't notify traitlets, but the new
+    # container is tracked all the same.
+    f.children[3].xmeta = Namespace()
+    f.children[3].xmeta.Foo = "1"
+    f.children = list(f.children)
+    f.children[0] = place.Place(name="again")
+    f.apply_to_xml(elem)
+    assert elem[3].get("XFoo") == "1"
+    assert elem[0].get("Name") == "again"
+    f.children[0].name = "newer"
+    f.apply_to_xml(elem)
+
+    # Serializing to a fresh tree is unaffected.
+    assert f.to_xml_string() != text
+    assert folder.Folder.from_text(f.to_xml_string()).children[0].name == "newer"
+
+    # Lazily-loaded children are tracked too.
+    elem = _parse_xml_text(text)
+    f = folder.Folder.from_xml(elem, lazy=True, track_changes=True)
+    sabotage()
+    f.children[4].children[0].name = "deep3"
+    f.apply_to_xml(elem)
+    assert elem[4][0].get("Name") == "deep3"
+    assert elem[4].get("Name") == "stale"
@@ -0,0 +1,104 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+import os.path
+import time
+
+from . import http_server, serve_folder_tree, tempdir, work_in_tempdir
+from .. import cli
+from ..folder import fetch_folder_tree, walk_cached_folder_tree
+from ..treeindex import DEFAULT_INDEX_NAME, TreeIndex
+
+
+def _expected(root):
+    return [
+        (treepath, type(item).__name__[:-6], item.name)
+        for treepath, item in walk_cached_folder_tree(root, records=True)
+    ]
+
+
+def _observed(index):
+    return [(treepath, e.kind, e.name) for treepath, e in index.walk()]
+
+
+def _add_place(root):
+    """Add a place with an imageset to the root folder of a cached tree."""
+
+    path = os.path.join(root, "index.wtml")
+
+    with open(path, "rt", encoding="utf8") as f:
+        text = f.read()
+
+    place = (
+        '<Place Name="new"><ForegroundImageSet><ImageSet Name="fg" '
+        'Url="http://example.com/fg.png" DemUrl="http://example.com/dem" />'
+        "</ForegroundImageSet></Place>"
+    )
+
+    with open(path, "wt", encoding="utf8") as f:
+        f.write(text.replace("</Folder>", place + "</Folder>"))
+
+    # Make sure that the change is noticed on filesystems with coarse
+    # timestamps.
+    later = time.time() + 10
+    os.utime(path, (later, later))
+
+
+def test_update(http_server, tempdir):
+    url = serve_folder_tree(http_server)
+    fetch_folder_tree(url, tempdir)
+
+    with TreeIndex(tempdir) as index:
+        assert _observed(index) == []
+        assert index.update() == {"parsed": 4, "unchanged": 0, "removed": 0}
+        assert _observed(index) == _expected(tempdir)
+
+        entries = dict((e.name, e) for _, e in index.walk())
+        assert entries["ic"].kind == "ImageSet"
+        assert entries["ic"].url == "http://example.com/ic.png"
+        assert entries["c"].file == "000_a/000_c/index.wtml"
+
+    assert os.path.exists(os.path.join(tempdir, DEFAULT_INDEX_NAME))
+
+    # Only changed files are reparsed.
+    _add_place(tempdir)
+
+    with TreeIndex(tempdir) as index:
+        assert index.update() == {"parsed": 1, "unchanged": 3, "removed": 0}
+        assert _observed(index) == _expected(tempdir)
+
+        new = [e for _, e in index.walk() if e.name == "new"][0]
+        assert new.kind == "Place"
+        assert new.url is None
+        assert new.imageset_name == "fg"
+        assert new.imageset_dem_url == "http://example.com/dem"
+
+        # Links to folders that weren't downloaded are walked as-is.
+        os.unlink(os.path.join(tempdir, "002_b", "index.wtml"))
+        assert index.update() == {"parsed": 0, "unchanged": 3, "removed": 1}
+        assert _observed(index) == _expected(tempdir)
+        assert index.update(full=True) == {"parsed": 3, "unchanged": 0, "removed": 0}
+        assert _observed(index) == _expected(tempdir)
+
+
+def test_cli(http_server, work_in_tempdir, capsys):
+    url = serve_folder_tree(http_server)
+    fetch_folder_tree(url, work_in_tempdir)
+    _add_place(work_in_tempdir)
+
+    def run_all():
+        outputs = []
+
+        for command in ("summarize", "print-image-urls", "print-dem-urls"):
+            cli.entrypoint(["tree", command])
+            outputs.append(capsys.readouterr().out)
+
+        return outputs
+
+    expected = run_all()
+    cli.entrypoint(["tree", "index"])
+    assert capsys.readouterr().out == "4 indexed, 0 unchanged, 0 removed\n"
+    assert run_all() == expected
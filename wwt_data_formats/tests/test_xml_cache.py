@@ -0,0 +1,92 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+from __future__ import absolute_import, division, print_function
+
+from argparse import Namespace
+
+from . import test_path, xml_backend
+from .. import folder, imageset, place
+
+
+def test_xml_cache(xml_backend):
+    f = folder.Folder.from_file(test_path("test1_rel.wtml"))
+    sub = folder.Folder(name="sub", children=[imageset.ImageSet(name="deep")])
+    pl = place.Place(name="pl", description="text")
+    pl.foreground_image_set = imageset.ImageSet(name="fg")
+    f.children += [sub, pl, folder.Folder()]
+    f.enable_xml_cache()
+
+    def check():
+        cached = [f.to_xml_string(indent=i) for i in (True, False)]
+        f.disable_xml_cache()
+        try:
+            assert cached == [f.to_xml_string(indent=i) for i in (True, False)]
+        finally:
+            f.enable_xml_cache()
+            assert f.to_xml_string() == cached[0]
+
+    check()
+
+    # Unmodified objects aren't reserialized.
+    sub.children[0].name = "deep2"
+    assert f.children[0]._xml_cache.entries
+    assert not sub._xml_cache.entries
+    assert not f._xml_cache.entries
+    check()
+
+    pl.foreground_image_set.name = "fg2"
+    check()
+    pl.xmeta.Extra = "1"
+    check()
+    f.children.append(place.Place(name="new"))
+    check()
+    f.children[-1].name = "newer"
+    check()
+    f.children[1] = imageset.ImageSet(name="replaced")
+    check()
+    f.children[1].name = "replaced2"
+    check()
+    f.name = "root"
+    check()
+
+    # Assigning equal containers doesn't notify traitlets.
+    f.children = list(f.children)
+    f.children.append(place.Place(name="after"))
+    check()
+    pl.xmeta = Namespace(Extra="1")
+    pl.xmeta.Foo = "1"
+    check()
+
+    from io import BytesIO
+
+    stream = BytesIO()
+    f.write_xml(stream, dest_wants_bytes=True)
+    assert stream.getvalue().decode("utf-8") == f.to_xml_string()
+
+    lazy = folder.Folder.from_file(test_path("test1_rel.wtml"), lazy=True)
+    lazy.children.append(sub)
+    expected = lazy.to_xml_string()
+    lazy.enable_xml_cache()
+    assert lazy.to_xml_string() == expected
+    assert not lazy.children.is_loaded(0)
+    sub.name = "changed"
+    assert lazy.to_xml_string() == expected.replace('Name="sub"', 'Name="changed"')
+
+    # Items loaded after serialization are linked into the cache, as are
+    # those of clones.
+    text = '<Folder><Place Name="a" /><Folder><Place Name="b" /></Folder></Folder>'
+
+    for lazy in (
+        folder.Folder.from_text(text, lazy=True),
+        folder.Folder.from_text(text, lazy=True).clone(),
+    ):
+        lazy.enable_xml_cache()
+        lazy.to_xml_string()
+        lazy.children[0].name = "NEW"
+        lazy.children[1].children[0].name = "NESTED"
+        cached = lazy.to_xml_string()
+        assert 'Name="NEW"' in cached
+        assert 'Name="NESTED"' in cached
+        assert cached == lazy.disable_xml_cache().to_xml_string()
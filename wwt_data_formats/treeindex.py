@@ -0,0 +1,354 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2022 the .NET Foundation
+# Licensed under the MIT License.
+
+"""
+A persistent SQLite index of a folder tree downloaded with
+:func:`~wwt_data_formats.folder.fetch_folder_tree`.
+
+Walking a cached tree with
+:func:`~wwt_data_formats.folder.walk_cached_folder_tree` parses every one of
+its WTML files. A :class:`TreeIndex` records every folder, place, and imageset
+of the tree in a SQLite database, so that later walks are simple queries.
+When the cached tree is refetched, the index can be brought up to date by
+reparsing only the files that have changed::
+
+    from wwt_data_formats.treeindex import TreeIndex
+
+    with TreeIndex("tree") as index:
+        index.update()
+
+        for treepath, entry in index.walk():
+            print(treepath, entry.kind, entry.name)
+
+The database is an ordinary SQLite file, which can also be queried directly.
+The ``items`` table has one row per item, with these columns:
+
+``treepath``
+    The tree path of the item, packed as big-endian 32-bit integers, so that
+    sorting by it gives the walk order.
+``depth``
+    The length of the tree path.
+``file``
+    The path of the ``index.wtml`` file containing the item, relative to the
+    root of the tree.
+``kind``
+    ``Folder``, ``Place``, or ``ImageSet``.
+``name``, ``url``, ``alt_url``, ``dem_url``
+    The attributes of the item. Those that it does not have are NULL.
+``imageset_name``, ``imageset_url``, ``imageset_alt_url``, ``imageset_dem_url``
+    For places, the attributes of the imageset returned by
+    :meth:`~wwt_data_formats.records.PlaceRecord.as_imageset`.
+``link``
+    For linked folders, the directory where the linked file would be saved.
+``hidden``
+    Whether the item is omitted from walks. Linked folders are hidden when
+    the folder that they link to is walked in their place, or when the URL
+    has already been walked.
+
+The ``files`` table has one row per file, with the columns ``path``,
+``mtime_ns``, ``size``, and ``treepath``, the tree path of its root folder.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__all__ = """
+TreeIndex
+""".split()
+
+from collections import namedtuple
+import os
+import posixpath
+import sqlite3
+import struct
+
+DEFAULT_INDEX_NAME = "tree-index.sqlite"
+
+# Bump this when the schema changes. Databases with other versions are
+# rebuilt from scratch.
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    treepath BLOB NOT NULL
+);
+CREATE TABLE items (
+    treepath BLOB NOT NULL,
+    depth INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT,
+    url TEXT,
+    alt_url TEXT,
+    dem_url TEXT,
+    imageset_name TEXT,
+    imageset_url TEXT,
+    imageset_alt_url TEXT,
+    imageset_dem_url TEXT,
+    link TEXT,
+    hidden INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX items_treepath ON items (treepath);
+CREATE INDEX items_file ON items (file);
+"""
+
+_ENTRY_COLUMNS = (
+    "kind name url alt_url dem_url imageset_name imageset_url imageset_alt_url "
+    "imageset_dem_url file"
+)
+
+IndexEntry = namedtuple("IndexEntry", _ENTRY_COLUMNS)
+
+_ROOT_FILE = "index.wtml"
+
+
+def _pack_treepath(treepath):
+    return struct.pack(f">{len(treepath)}I", *treepath)
+
+
+def _unpack_treepath(packed):
+    return struct.unpack(f">{len(packed) // 4}I", packed)
+
+
+class TreeIndex(object):
+    """A SQLite index of a folder tree downloaded with
+    :func:`~wwt_data_formats.folder.fetch_folder_tree`.
+
+    Parameters
+    ----------
+    root_cache_path : string
+        The path of the root of the cached tree.
+    path : optional string
+        The path of the database file. It is created if it does not exist. By
+        default, it is ``tree-index.sqlite`` in *root_cache_path*.
+
+    Notes
+    -----
+    The index is empty until :meth:`update` is called. Each :meth:`update`
+    checks the size and modification time of every file in the tree, and only
+    reparses the ones that have changed.
+
+    Instances of this class are context managers that close the database when
+    the context is exited.
+
+    """
+
+    def __init__(self, root_cache_path, path=None):
+        if path is None:
+            path = os.path.join(root_cache_path, DEFAULT_INDEX_NAME)
+
+        self.root_cache_path = root_cache_path
+        self.path = path
+        self._conn = sqlite3.connect(path)
+
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+
+        if version != _SCHEMA_VERSION:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS files")
+                self._conn.execute("DROP TABLE IF EXISTS items")
+
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the database.
+
+        Returns
+        -------
+        None
+
+        """
+        self._conn.close()
+
+    def _file_path(self, rel_path):
+        return os.path.join(self.root_cache_path, *rel_path.split("/"))
+
+    def _parse_file(self, rel_path, base):
+        """Insert the rows for the items of a file."""
+
+        from .folder import _sanitize_name
+        from .records import FolderRecord, PlaceRecord
+
+        rows = []
+
+        def add(item, treepath, item_dir, is_root):
+            is_folder = isinstance(item, FolderRecord)
+            link = None
+
+            if is_folder:
+                kind = "Folder"
+
+                if not is_root and not len(item.children) and item.url:
+                    link = item_dir
+            elif isinstance(item, PlaceRecord):
+                kind = "Place"
+            else:
+                kind = "ImageSet"
+
+            imgset = item.as_imageset() if kind == "Place" else None
+
+            if imgset is None:
+                imgset_info = (None, None, None, None)
+            else:
+                imgset_info = (imgset.name, imgset.url, imgset.alt_url, imgset.dem_url)
+
+            rows.append(
+                (
+                    base + _pack_treepath(treepath),
+                    len(base) // 4 + len(treepath),
+                    rel_path,
+                    kind,
+                    item.name,
+                    getattr(item, "url", None),
+                    getattr(item, "alt_url", None),
+                    getattr(item, "dem_url", None),
+                )
+                + imgset_info
+                + (link,)
+            )
+
+            if is_folder and link is None:
+                for index, child in enumerate(item.children):
+                    child_dir = None
+
+                    if isinstance(child, FolderRecord):
+                        child_dir = posixpath.join(
+                            item_dir, f"{index:03d}_{_sanitize_name(child.name)}"
+                        )
+
+                    add(child, treepath + (index,), child_dir, False)
+
+        root = FolderRecord.from_file(self._file_path(rel_path))
+        add(root, (), posixpath.dirname(rel_path), True)
+        self._conn.executemany(
+            "INSERT INTO items (treepath, depth, file, kind, name, url, alt_url, "
+            "dem_url, imageset_name, imageset_url, imageset_alt_url, "
+            "imageset_dem_url, link) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def update(self, full=False):
+        """Bring the index up to date with the cached tree.
+
+        Parameters
+        ----------
+        full : optional bool, default False
+            If true, discard the existing index and parse every file.
+
+        Returns
+        -------
+        A dictionary with the integer keys ``parsed``, the number of files
+        that were parsed because they were new or had changed; ``unchanged``,
+        the number of files that were up to date; and ``removed``, the number
+        of files that are no longer part of the tree.
+
+        Notes
+        -----
+        The tree is traversed in the same way as
+        :func:`~wwt_data_formats.folder.walk_cached_folder_tree`, following
+        the links recorded in the index for files that haven't changed. The
+        update is done in a single transaction.
+
+        """
+        conn = self._conn
+        counts = {"parsed": 0, "unchanged": 0, "removed": 0}
+
+        with conn:
+            if full:
+                conn.execute("DELETE FROM items")
+                conn.execute("DELETE FROM files")
+
+            known = dict(
+                (path, (mtime_ns, size, treepath))
+                for path, mtime_ns, size, treepath in conn.execute(
+                    "SELECT path, mtime_ns, size, treepath FROM files"
+                )
+            )
+            visited = set()
+            seen_urls = set()
+
+            def visit(rel_path, base):
+                visited.add(rel_path)
+                st = os.stat(self._file_path(rel_path))
+                prev = known.get(rel_path)
+
+                # The directory of a file encodes its tree path, so a file only
+                # moves if the layout of the tree has changed.
+                if prev == (st.st_mtime_ns, st.st_size, base):
+                    counts["unchanged"] += 1
+                else:
+                    if prev is not None:
+                        conn.execute("DELETE FROM items WHERE file = ?", (rel_path,))
+
+                    self._parse_file(rel_path, base)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                        (rel_path, st.st_mtime_ns, st.st_size, base),
+                    )
+                    counts["parsed"] += 1
+
+                links = conn.execute(
+                    "SELECT rowid, treepath, url, link, hidden FROM items "
+                    "WHERE file = ? AND link IS NOT NULL ORDER BY treepath",
+                    (rel_path,),
+                ).fetchall()
+
+                for rowid, treepath, url, link, hidden in links:
+                    hide = 1
+
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        child_path = posixpath.join(link, _ROOT_FILE)
+
+                        if os.path.exists(self._file_path(child_path)):
+                            visit(child_path, treepath)
+                        else:
+                            # This folder couldn't be downloaded.
+                            hide = 0
+
+                    if hide != hidden:
+                        conn.execute(
+                            "UPDATE items SET hidden = ? WHERE rowid = ?", (hide, rowid)
+                        )
+
+            visit(_ROOT_FILE, b"")
+
+            for rel_path in known:
+                if rel_path not in visited:
+                    conn.execute("DELETE FROM items WHERE file = ?", (rel_path,))
+                    conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+                    counts["removed"] += 1
+
+        return counts
+
+    def walk(self):
+        """Walk the indexed tree.
+
+        Returns
+        -------
+        A generator of tuples of ``(treepath, entry)``, in the same order as
+        :func:`~wwt_data_formats.folder.walk_cached_folder_tree`. Each
+        ``treepath`` is a tuple of child indices, and each ``entry`` is a
+        named tuple with the fields ``kind``, ``name``, ``url``, ``alt_url``,
+        ``dem_url``, ``imageset_name``, ``imageset_url``,
+        ``imageset_alt_url``, ``imageset_dem_url``, and ``file``, with the
+        same meanings as the columns of the database.
+
+        """
+        columns = ", ".join(_ENTRY_COLUMNS.split())
+
+        for row in self._conn.execute(
+            f"SELECT treepath, {columns} FROM items WHERE NOT hidden "
+            "ORDER BY treepath"
+        ):
+            yield (_unpack_treepath(row[0]), IndexEntry._make(row[1:]))